@@ -8,9 +8,17 @@ import math
 import time
 import random
 import ssl
+import hashlib
+import hmac
+import base64
+import queue
+import atexit
+import functools
+import weakref
 from io import BytesIO
+from collections import OrderedDict
 from uuid import uuid4
-from urllib.parse import quote
+from urllib.parse import quote, unquote, urlsplit
 from datetime import datetime
 try:
     # Python 3.9+ zoneinfo for proper EST-aware date math
@@ -19,29 +27,35 @@ except Exception:
     ZoneInfo = None
 import difflib
 import zipfile
-from datetime import date, timedelta
+from datetime import date, timedelta, timezone
 from typing import List, Dict, Any, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 # Backwards-compatible aliases used elsewhere in the codebase / tests
-httpx = requests
 rq = requests
 _req = requests
 import pg8000
 
 from flask import Flask, jsonify, request, Response, stream_with_context, send_file, make_response
 from flask_cors import CORS
-import tempfile
 import threading
 from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.http import http_date
 import concurrent.futures
+import multiprocessing
+from concurrent.futures.process import BrokenProcessPool
 
 from google.cloud import storage
 import firebase_admin
 from firebase_admin import credentials, auth as firebase_auth
 
-from pdfminer.high_level import extract_text
-from pypdf import PdfReader
+try:
+    import pdf_extract
+    import photo_derivs
+except ImportError:  # imported as backend.app (tests, tooling)
+    from backend import pdf_extract, photo_derivs
 
 # ------------------------------------------------------------------------------
 # App + CORS
@@ -55,7 +69,7 @@ raw_origins = os.getenv(
 for sep in ("|", " "):
     raw_origins = raw_origins.replace(sep, ",")
 ALLOWED = [o.strip() for o in raw_origins.split(",") if o.strip()]
-CORS(app, resources={r"/*": {"origins": ALLOWED}})
+CORS(app, resources={r"/*": {"origins": ALLOWED}}, expose_headers=["X-Next-Cursor"])
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -87,6 +101,104 @@ except Exception as e:
 HOST_TOKEN = os.getenv("HOST_API_TOKEN")
 MIGRATION_END_DATE = datetime(2026, 2, 1)  # Remove legacy token support after Jan 31
 
+# Verified Firebase tokens are cached (keyed by a hash of the token, never the token itself)
+# so dashboards that fire dozens of calls per page don't re-verify and re-upsert each time.
+AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", "300"))            # seconds; also bounded by token exp
+AUTH_CACHE_MAX = int(os.getenv("AUTH_CACHE_MAX", "2048"))
+LAST_LOGIN_INTERVAL = int(os.getenv("LAST_LOGIN_INTERVAL", "900"))   # min seconds between last_login writes
+
+class AuthCache:
+    """
+    Small thread-safe TTL + LRU cache of {token_hash: (expires_at, decoded_claims, user, version)}.
+    Entries never outlive the Firebase token's own `exp`. `version` is the shared "users"
+    data_version seen when the entry was stored; a hit under a different version is a miss,
+    so role/is_active changes made by any instance (or straight in SQL) land within
+    DATA_VERSION_TTL seconds instead of AUTH_CACHE_TTL.
+    """
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, key, version=None):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            stale = entry is not None and version is not None and entry[3] != version
+            if entry is None or entry[0] <= now or stale:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def put(self, key, decoded, user, version=None):
+        expires_at = time.time() + self.ttl
+        exp = decoded.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= time.time():
+            return
+        with self._lock:
+            self._entries[key] = (expires_at, decoded, user, version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id):
+        """Drop this process's cached tokens for a user; other instances catch up via the version."""
+        if user_id is None:
+            return
+        with self._lock:
+            for k in [k for k, v in self._entries.items() if v[2].get("id") == user_id]:
+                del self._entries[k]
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+_auth_cache = AuthCache(AUTH_CACHE_TTL, AUTH_CACHE_MAX)
+
+def _auth_version():
+    """Current shared "users" data_version, or None if it can't be read (cache falls back to TTL only)."""
+    versions = _data_versions.get(("users",))
+    return versions[0][0] if versions else None
+
+# user_id -> time.time() of the last last_login write by this process, oldest first.
+# Bounded like the auth cache: entries past LAST_LOGIN_INTERVAL are useless and swept, and
+# at most AUTH_CACHE_MAX users are remembered (forgetting one only costs an extra write).
+_last_login_touch = OrderedDict()
+_last_login_lock = threading.Lock()
+
+def _record_login_touch(user_id, now):
+    """Record a last_login write; caller holds _last_login_lock."""
+    _last_login_touch[user_id] = now
+    _last_login_touch.move_to_end(user_id)
+    while _last_login_touch:
+        oldest_id, oldest = next(iter(_last_login_touch.items()))
+        if len(_last_login_touch) <= AUTH_CACHE_MAX and now - oldest < LAST_LOGIN_INTERVAL:
+            break
+        del _last_login_touch[oldest_id]
+
+def _login_touch_due(user_id) -> bool:
+    """True (and records the touch) if last_login hasn't been written for user_id in LAST_LOGIN_INTERVAL."""
+    now = time.time()
+    with _last_login_lock:
+        last = _last_login_touch.get(user_id)
+        if last is not None and now - last < LAST_LOGIN_INTERVAL:
+            return False
+        _record_login_touch(user_id, now)
+        return True
+
 def get_authenticated_user():
     """
     Returns dict with user info or None if unauthorized.
@@ -101,6 +213,15 @@ def get_authenticated_user():
     auth_header = request.headers.get("Authorization", "")
     if auth_header.startswith("Bearer "):
         token = auth_header[7:]
+        cache_key = AuthCache.key_for(token)
+        auth_version = _auth_version()
+        cached = _auth_cache.get(cache_key, auth_version)
+        if cached:
+            user = cached[1]
+            if not user.get('is_active'):
+                return None
+            return dict(user)
+
         try:
             decoded = firebase_auth.verify_id_token(token)
             firebase_uid = decoded['uid']
@@ -121,19 +242,23 @@ def get_authenticated_user():
             if not user:
                 logger.error(f"ensure_user_exists returned None for {email}")
                 return None
+
+            session_started = user.pop('_session_start', False)
+            _auth_cache.put(cache_key, decoded, user, auth_version)
                 
             if not user.get('is_active'):
                 logger.warning(f"User inactive: {email}")
                 return None
             
-            # Log activity
-            log_user_activity(
-                user_id=user['id'],
-                action='auth_success',
-                resource_type='session'
-            )
+            # Log activity only when this is a new session (last_login was actually written)
+            if session_started:
+                log_user_activity(
+                    user_id=user['id'],
+                    action='auth_success',
+                    resource_type='session'
+                )
             
-            return user
+            return dict(user)
             
         except Exception as e:
             logger.warning(f"Firebase auth failed: {e}")
@@ -182,9 +307,11 @@ def ensure_user_exists(firebase_uid, email, display_name=None, photo_url=None):
     """
     Get or create user in database. Updates last_login and profile info.
     On creation, tries to split full_name into first/last name.
+    last_login is written at most once per LAST_LOGIN_INTERVAL per user; in between,
+    an unchanged profile costs a single SELECT and no commit.
     
     Returns:
-        dict: User record or None if error
+        dict: User record or None if error. `_session_start` is True when last_login was written.
     """
     conn = None
     try:
@@ -202,8 +329,29 @@ def ensure_user_exists(firebase_uid, email, display_name=None, photo_url=None):
         row = cur.fetchone()
         
         if row:
-            # Update existing user - preserve their chosen display_name, update full_name if missing
             user_id = row[0]
+            profile_unchanged = (
+                row[1] == firebase_uid
+                and row[2] == email
+                and (row[6] is not None or not display_name)
+                and (photo_url is None or row[7] == photo_url)
+            )
+            if profile_unchanged and not _login_touch_due(user_id):
+                return {
+                    "id": row[0],
+                    "firebase_uid": row[1],
+                    "email": row[2],
+                    "first_name": row[3],
+                    "last_name": row[4],
+                    "display_name": row[5],
+                    "full_name": row[6],
+                    "role": row[8],
+                    "is_active": row[9],
+                    "host_id": row[10],
+                    "_session_start": False,
+                }
+
+            # Update existing user - preserve their chosen display_name, update full_name if missing
             cur.execute("""
                 UPDATE users 
                 SET firebase_uid = %s,
@@ -218,6 +366,8 @@ def ensure_user_exists(firebase_uid, email, display_name=None, photo_url=None):
             
             updated = cur.fetchone()
             conn.commit()
+            with _last_login_lock:
+                _record_login_touch(user_id, time.time())
             
             return {
                 "id": updated[0],
@@ -229,7 +379,8 @@ def ensure_user_exists(firebase_uid, email, display_name=None, photo_url=None):
                 "full_name": updated[6],
                 "role": updated[7],
                 "is_active": updated[8],
-                "host_id": updated[9]
+                "host_id": updated[9],
+                "_session_start": True,
             }
         else:
             # Create new user - try to split name into first/last
@@ -250,6 +401,8 @@ def ensure_user_exists(firebase_uid, email, display_name=None, photo_url=None):
             
             new_user = cur.fetchone()
             conn.commit()
+            with _last_login_lock:
+                _record_login_touch(new_user[0], time.time())
             
             logger.info(f"Created new user: {email} with role 'host'")
             
@@ -263,7 +416,8 @@ def ensure_user_exists(firebase_uid, email, display_name=None, photo_url=None):
                 "full_name": new_user[6],
                 "role": new_user[7],
                 "is_active": new_user[8],
-                "host_id": new_user[9]
+                "host_id": new_user[9],
+                "_session_start": True,
             }
             
     except Exception as e:
@@ -279,31 +433,531 @@ def ensure_user_exists(firebase_uid, email, display_name=None, photo_url=None):
             except:
                 pass
 
+ACTIVITY_LOG_QUEUE_MAX = int(os.getenv("ACTIVITY_LOG_QUEUE_MAX", "10000"))
+ACTIVITY_LOG_BATCH = int(os.getenv("ACTIVITY_LOG_BATCH", "200"))
+ACTIVITY_LOG_FLUSH_MS = int(os.getenv("ACTIVITY_LOG_FLUSH_MS", "1000"))
+
+class ActivityLogWriter:
+    """
+    Background writer for user_activity_log.
+    Requests enqueue rows (no DB work on the request thread); a daemon thread drains
+    the bounded queue and writes one multi-row INSERT every `batch_size` rows or
+    `flush_ms` milliseconds, whichever comes first. If the batch INSERT fails, the rows
+    are retried one by one under savepoints so only the offending rows (e.g. a user
+    deleted in the meantime) are dropped. Rows are dropped (and counted) when the queue
+    is full or the database is unreachable, so auditing can never stall a request.
+    """
+    _COLS = "(user_id, action, resource_type, resource_id, ip_address, user_agent, created_at)"
+
+    def __init__(self, max_queue, batch_size, flush_ms):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0.05, flush_ms / 1000.0)
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "enqueued": 0, "written": 0, "dropped_full": 0, "dropped_error": 0,
+            "flushes": 0, "last_flush_ms": None, "max_flush_ms": None,
+        }
+
+    def _bump(self, key, n=1):
+        with self._stats_lock:
+            self._stats[key] += n
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="activity-log-writer", daemon=True)
+                self._thread.start()
+
+    def enqueue(self, row):
+        if self._stopping.is_set():
+            self._bump("dropped_full")
+            return
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+            self._bump("enqueued")
+        except queue.Full:
+            self._bump("dropped_full")
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._drain_once(block=True)
+        # Final drain on shutdown
+        while not self._queue.empty():
+            self._drain_once(block=False)
+
+    def _drain_once(self, block):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if block and timeout > 0:
+                    batch.append(self._queue.get(timeout=timeout))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._flush(batch)
+
+    def _flush(self, batch):
+        t0 = time.monotonic()
+        conn = None
+        try:
+            conn = getconn()
+            cur = conn.cursor()
+            placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, %s)"] * len(batch))
+            params = [v for row in batch for v in row]
+            cur.execute(f"INSERT INTO user_activity_log {self._COLS} VALUES {placeholders}", params)
+            conn.commit()
+            self._bump("written", len(batch))
+        except Exception as e:
+            if conn is None:
+                logger.warning(f"Failed to write {len(batch)} activity rows: {e}")
+                self._bump("dropped_error", len(batch))
+            else:
+                logger.warning(f"Batch write of {len(batch)} activity rows failed, retrying row by row: {e}")
+                self._flush_rows(conn, batch)
+        finally:
+            if conn:
+                conn.close()
+            elapsed_ms = round((time.monotonic() - t0) * 1000, 2)
+            with self._stats_lock:
+                self._stats["flushes"] += 1
+                self._stats["last_flush_ms"] = elapsed_ms
+                prev = self._stats["max_flush_ms"]
+                self._stats["max_flush_ms"] = elapsed_ms if prev is None else max(prev, elapsed_ms)
+
+    def _flush_rows(self, conn, batch):
+        """Write `batch` one row per savepoint, dropping only the rows that fail."""
+        written = 0
+        try:
+            conn.rollback()
+            cur = conn.cursor()
+            for row in batch:
+                cur.execute("SAVEPOINT activity_row;")
+                try:
+                    cur.execute(f"INSERT INTO user_activity_log {self._COLS} VALUES (%s, %s, %s, %s, %s, %s, %s)", row)
+                    written += 1
+                except Exception as e:
+                    cur.execute("ROLLBACK TO SAVEPOINT activity_row;")
+                    logger.warning(f"Dropped activity row {row[:4]}: {e}")
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"Failed to write {len(batch)} activity rows: {e}")
+            written = 0
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+        self._bump("written", written)
+        self._bump("dropped_error", len(batch) - written)
+
+    def stop(self, timeout=5.0):
+        """Flush whatever is queued and stop the writer thread (called at interpreter exit)."""
+        self._stopping.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def stats(self):
+        with self._stats_lock:
+            out = dict(self._stats)
+        out["queue_depth"] = self._queue.qsize()
+        out["queue_max"] = self._queue.maxsize
+        return out
+
+_activity_writer = ActivityLogWriter(ACTIVITY_LOG_QUEUE_MAX, ACTIVITY_LOG_BATCH, ACTIVITY_LOG_FLUSH_MS)
+atexit.register(_activity_writer.stop)
+
 def log_user_activity(user_id, action, resource_type=None, resource_id=None):
     """
     Log user activity for audit trail (non-blocking).
+    Request details are captured here; the INSERT happens on the background writer.
     """
     if not user_id:
         return
     
     try:
-        conn = getconn()
-        cur = conn.cursor()
-        
         ip_address = request.headers.get('X-Forwarded-For', request.remote_addr)
         user_agent = request.headers.get('User-Agent', '')[:500]  # Truncate
-        
-        cur.execute("""
-            INSERT INTO user_activity_log (user_id, action, resource_type, resource_id, ip_address, user_agent)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """, (user_id, action, resource_type, resource_id, ip_address, user_agent))
-        
-        conn.commit()
-        cur.close()
-        conn.close()
+        _activity_writer.enqueue(
+            # Aware, so Postgres converts it to the session time zone exactly like the
+            # column's now() default did before writes were batched.
+            (user_id, action, resource_type, resource_id, ip_address, user_agent, datetime.now(timezone.utc))
+        )
     except Exception as e:
         logger.warning(f"Failed to log activity: {e}")
 
+# ------------------------------------------------------------------------------
+# Background jobs (Postgres-backed queue)
+# ------------------------------------------------------------------------------
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "2"))
+JOB_LOCK_TIMEOUT = int(os.getenv("JOB_LOCK_TIMEOUT", "600"))
+JOB_RETRY_BASE = float(os.getenv("JOB_RETRY_BASE", "15"))
+JOB_RETRY_MAX = float(os.getenv("JOB_RETRY_MAX", "900"))
+
+class JobFailed(Exception):
+    """Raised by a job handler; retryable=False marks the job failed without further attempts."""
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+class JobQueue:
+    """
+    Durable job queue on the `jobs` table.
+    Producers INSERT rows (optionally inside their own transaction); worker threads claim
+    one row at a time with SELECT ... FOR UPDATE SKIP LOCKED, so several workers (or
+    instances) never pick the same job. Failed jobs are retried with exponential backoff
+    until max_attempts. While a job runs its worker refreshes `locked_at` every
+    lock_timeout/3 seconds; jobs whose worker died stop being refreshed and are requeued
+    once the lock expires. A worker only records an outcome while it still holds the
+    claim (same locked_by and attempt), so a run that was reaped and re-claimed elsewhere
+    can't be overwritten by the stale worker finishing late.
+
+    Idempotency: at most one *queued* job exists per idempotency_key (partial unique
+    index), and a job is not claimed while another job with the same key is running,
+    so e.g. re-uploading a PDF twice yields one parse, never two concurrent ones.
+    """
+    _COLS = "id, kind, payload, idempotency_key, status, attempts, max_attempts, run_after, last_error, result, locked_by, created_at, started_at, finished_at"
+
+    def __init__(self, workers, poll_seconds, lock_timeout, retry_base, retry_max):
+        self.workers = max(0, workers)
+        self.poll_seconds = max(0.1, poll_seconds)
+        self.lock_timeout = max(30, lock_timeout)
+        self.retry_base = max(1.0, retry_base)
+        self.retry_max = max(self.retry_base, retry_max)
+        self._handlers = {}
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._last_reap = 0.0
+        self._instance = uuid4().hex[:8]
+        self._stats_lock = threading.Lock()
+        self._stats = {"claimed": 0, "succeeded": 0, "retried": 0, "failed": 0, "reaped": 0,
+                       "heartbeats": 0, "lost_claims": 0}
+
+    def register(self, kind, handler):
+        """handler(payload_dict) -> JSON-serializable result; raise JobFailed/Exception on failure."""
+        self._handlers[kind] = handler
+
+    def _bump(self, key, n=1):
+        with self._stats_lock:
+            self._stats[key] += n
+
+    def ensure_started(self):
+        if self.workers <= 0 or not all([PGHOST, PGDATABASE, PGUSER, PGPASSWORD]):
+            return
+        if len(self._threads) == self.workers and all(t.is_alive() for t in self._threads):
+            return
+        with self._start_lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            while len(self._threads) < self.workers:
+                # pids repeat across containers; the suffix keeps locked_by unique per process
+                name = f"job-worker-{os.getpid()}-{self._instance}-{len(self._threads)}"
+                t = threading.Thread(target=self._run, args=(name,), name=name, daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def enqueue(self, kind, payload, idempotency_key=None, max_attempts=3, cur=None):
+        """
+        Queue a job and return its id. If a queued job with the same idempotency_key
+        already exists, returns that job's id instead of inserting a duplicate.
+        When `cur` is given the INSERT joins the caller's transaction (caller commits).
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"unknown job kind: {kind}")
+        own_conn = None
+        if cur is None:
+            own_conn = getconn()
+            cur = own_conn.cursor()
+        try:
+            cur.execute("""
+                INSERT INTO jobs (kind, payload, idempotency_key, max_attempts)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (idempotency_key) WHERE status = 'queued' DO NOTHING
+                RETURNING id;
+            """, (kind, json.dumps(payload or {}), idempotency_key, max_attempts))
+            row = cur.fetchone()
+            if row is None:
+                cur.execute(
+                    "SELECT id FROM jobs WHERE idempotency_key=%s AND status='queued' ORDER BY id DESC LIMIT 1;",
+                    (idempotency_key,),
+                )
+                row = cur.fetchone()
+            if own_conn is not None:
+                own_conn.commit()
+        except Exception:
+            if own_conn is not None:
+                own_conn.rollback()
+            raise
+        finally:
+            if own_conn is not None:
+                own_conn.close()
+        self.ensure_started()
+        self._wake.set()
+        return row[0] if row else None
+
+    def enqueue_many(self, kind, items, max_attempts=3, cur=None):
+        """
+        Bulk enqueue [(payload, idempotency_key), ...] in one statement.
+        Returns (new_job_ids, skipped) where skipped counts keys that were already queued.
+        When `cur` is given the INSERT joins the caller's transaction (caller commits and
+        then calls notify()).
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"unknown job kind: {kind}")
+        if not items:
+            return [], 0
+        payloads = [json.dumps(p or {}) for p, _ in items]
+        keys = [k for _, k in items]
+        own_conn = None
+        if cur is None:
+            own_conn = getconn()
+            cur = own_conn.cursor()
+        try:
+            cur.execute("""
+                INSERT INTO jobs (kind, payload, idempotency_key, max_attempts)
+                SELECT %s, t.p::jsonb, t.k, %s
+                FROM unnest(%s::text[], %s::text[]) AS t(p, k)
+                ON CONFLICT (idempotency_key) WHERE status = 'queued' DO NOTHING
+                RETURNING id;
+            """, (kind, max_attempts, payloads, keys))
+            ids = [r[0] for r in cur.fetchall()]
+            if own_conn is not None:
+                own_conn.commit()
+        except Exception:
+            if own_conn is not None:
+                own_conn.rollback()
+            raise
+        finally:
+            if own_conn is not None:
+                own_conn.close()
+        if own_conn is not None:
+            self.ensure_started()
+            self._wake.set()
+        return ids, len(items) - len(ids)
+
+    def notify(self):
+        """Wake idle workers now (e.g. after committing a transaction that enqueued jobs)."""
+        self.ensure_started()
+        self._wake.set()
+
+    def _claim(self, worker_name):
+        conn = getconn()
+        try:
+            cur = conn.cursor()
+            cur.execute("""
+                UPDATE jobs
+                SET status='running', attempts=attempts+1, locked_at=now(), locked_by=%s,
+                    started_at=COALESCE(started_at, now()), updated_at=now()
+                WHERE id = (
+                    SELECT j.id FROM jobs j
+                    WHERE j.status='queued' AND j.run_after <= now()
+                      AND (j.idempotency_key IS NULL OR NOT EXISTS (
+                            SELECT 1 FROM jobs r
+                            WHERE r.idempotency_key=j.idempotency_key AND r.status='running'))
+                    ORDER BY j.run_after, j.id
+                    FOR UPDATE SKIP LOCKED
+                    LIMIT 1
+                )
+                RETURNING id, kind, payload, attempts, max_attempts;
+            """, (worker_name,))
+            row = cur.fetchone()
+            conn.commit()
+            return row
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _backoff(self, attempts):
+        delay = min(self.retry_max, self.retry_base * (2 ** max(0, attempts - 1)))
+        return delay * random.uniform(0.8, 1.2)
+
+    def _heartbeat(self, job_id, worker_name, attempts, stop):
+        """Keep `locked_at` fresh for a running job until `stop` is set."""
+        interval = self.lock_timeout / 3
+        while not stop.wait(interval):
+            try:
+                conn = getconn()
+                try:
+                    cur = conn.cursor()
+                    cur.execute("""
+                        UPDATE jobs SET locked_at=now(), updated_at=now()
+                        WHERE id=%s AND locked_by=%s AND attempts=%s AND status='running';
+                    """, (job_id, worker_name, attempts))
+                    held = cur.rowcount
+                    conn.commit()
+                finally:
+                    conn.close()
+                self._bump("heartbeats")
+                if not held:
+                    logger.warning(f"Job {job_id}: claim lost while running; stopping heartbeat")
+                    return
+            except Exception as e:
+                logger.warning(f"Job {job_id}: heartbeat failed: {e}")
+
+    def _finish(self, job_id, worker_name, attempts, result=None, error=None, retry_in=None):
+        # Every outcome is guarded by the claim: if the job was reaped and re-claimed
+        # (attempts moved on) or already finished, this worker's result is dropped.
+        claim = (job_id, worker_name, attempts)
+        conn = getconn()
+        try:
+            cur = conn.cursor()
+            if error is None:
+                cur.execute("""
+                    UPDATE jobs SET status='done', result=%s, last_error=NULL, locked_at=NULL,
+                           finished_at=now(), updated_at=now()
+                    WHERE id=%s AND locked_by=%s AND attempts=%s AND status='running';
+                """, (json.dumps(result), *claim))
+            elif retry_in is not None:
+                # A newer queued job with the same key will redo this work; don't collide with it.
+                cur.execute("""
+                    UPDATE jobs SET
+                      status = CASE WHEN idempotency_key IS NOT NULL AND EXISTS (
+                                   SELECT 1 FROM jobs q WHERE q.idempotency_key=jobs.idempotency_key AND q.status='queued')
+                               THEN 'superseded' ELSE 'queued' END,
+                      run_after = now() + make_interval(secs => %s),
+                      last_error=%s, locked_at=NULL, locked_by=NULL, updated_at=now()
+                    WHERE id=%s AND locked_by=%s AND attempts=%s AND status='running';
+                """, (float(retry_in), error[:2000], *claim))
+            else:
+                cur.execute("""
+                    UPDATE jobs SET status='failed', last_error=%s, locked_at=NULL,
+                           finished_at=now(), updated_at=now()
+                    WHERE id=%s AND locked_by=%s AND attempts=%s AND status='running';
+                """, (error[:2000], *claim))
+            recorded = cur.rowcount
+            conn.commit()
+            if not recorded:
+                logger.warning(f"Job {job_id}: claim by {worker_name} (attempt {attempts}) was lost; outcome dropped")
+                self._bump("lost_claims")
+            return bool(recorded)
+        except Exception:
+            conn.rollback()
+            logger.exception(f"Failed to record outcome of job {job_id}")
+        finally:
+            conn.close()
+
+    def _run_one(self, worker_name):
+        row = self._claim(worker_name)
+        if not row:
+            return False
+        job_id, kind, payload, attempts, max_attempts = row
+        if isinstance(payload, str):
+            payload = json.loads(payload)
+        self._bump("claimed")
+        handler = self._handlers.get(kind)
+        claim = (job_id, worker_name, attempts)
+        stop = threading.Event()
+        beat = threading.Thread(target=self._heartbeat, args=(*claim, stop),
+                                name=f"{worker_name}-heartbeat", daemon=True)
+        beat.start()
+        failure = None
+        try:
+            if handler is None:
+                raise JobFailed(f"no handler registered for kind '{kind}'", retryable=False)
+            result = handler(payload or {})
+        except Exception as e:
+            failure = e
+        finally:
+            # Stop heartbeating before recording the outcome so the two never interleave.
+            stop.set()
+            beat.join()
+
+        if failure is None:
+            if self._finish(*claim, result=result):
+                self._bump("succeeded")
+            return True
+        retryable = getattr(failure, "retryable", True)
+        msg = f"{type(failure).__name__}: {failure}"
+        if retryable and attempts < max_attempts:
+            delay = self._backoff(attempts)
+            logger.warning(f"Job {job_id} ({kind}) attempt {attempts}/{max_attempts} failed, retrying in {delay:.0f}s: {msg}")
+            if self._finish(*claim, error=msg, retry_in=delay):
+                self._bump("retried")
+        else:
+            logger.error(f"Job {job_id} ({kind}) failed after {attempts} attempt(s): {msg}")
+            if self._finish(*claim, error=msg):
+                self._bump("failed")
+        return True
+
+    def reap_stale(self):
+        """Requeue (or fail) running jobs whose heartbeat (locked_at) is older than the lock timeout."""
+        conn = getconn()
+        try:
+            cur = conn.cursor()
+            cur.execute("""
+                UPDATE jobs j SET
+                  status = CASE
+                    WHEN j.attempts >= j.max_attempts THEN 'failed'
+                    WHEN j.idempotency_key IS NOT NULL AND EXISTS (
+                         SELECT 1 FROM jobs q WHERE q.idempotency_key=j.idempotency_key AND q.status='queued')
+                      THEN 'superseded'
+                    ELSE 'queued' END,
+                  last_error = 'lock expired (worker lost)',
+                  locked_at=NULL, locked_by=NULL, updated_at=now(),
+                  finished_at = CASE WHEN j.attempts >= j.max_attempts THEN now() ELSE NULL END
+                WHERE j.status='running' AND j.locked_at < now() - make_interval(secs => %s)
+                RETURNING j.id;
+            """, (self.lock_timeout,))
+            n = len(cur.fetchall())
+            conn.commit()
+            if n:
+                logger.warning(f"Requeued {n} stale job(s)")
+                self._bump("reaped", n)
+            return n
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _run(self, worker_name):
+        while not self._stopping.is_set():
+            try:
+                now = time.monotonic()
+                if now - self._last_reap > max(30.0, self.lock_timeout / 4):
+                    self._last_reap = now
+                    self.reap_stale()
+                if self._run_one(worker_name):
+                    continue
+            except Exception as e:
+                logger.warning(f"{worker_name}: job loop error: {e}")
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+
+    def stop(self, timeout=5.0):
+        self._stopping.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout)
+
+    def stats(self):
+        with self._stats_lock:
+            out = dict(self._stats)
+        out["workers"] = sum(1 for t in self._threads if t.is_alive())
+        return out
+
+_job_queue = JobQueue(JOB_WORKERS, JOB_POLL_SECONDS, JOB_LOCK_TIMEOUT, JOB_RETRY_BASE, JOB_RETRY_MAX)
+atexit.register(_job_queue.stop)
+
+@app.before_request
+def _start_job_workers():
+    # Workers start lazily (first request in each process) so jobs left queued by a
+    # previous instance are picked up without waiting for a new enqueue.
+    _job_queue.ensure_started()
+
 @app.before_request
 def _gate():
     """Check authentication for protected endpoints."""
@@ -330,6 +984,7 @@ def _gate():
     # Protected endpoints - require authentication
     protected_patterns = [
         '/generate-upload-url',
+        '/uploads',
         '/create-event',
         '/events/',  # Any POST/PUT/DELETE on events
         '/admin/',
@@ -346,6 +1001,448 @@ def _gate():
     
     return None
 
+# ------------------------------------------------------------------------------
+# Public response cache (data versions + ETag)
+# ------------------------------------------------------------------------------
+# Every write to a versioned table bumps its row in `data_version` (statement-level
+# triggers created by /migrate, so job workers, bulk imports and manual SQL all count).
+# Public GET handlers wrapped in @public_cached derive a strong ETag from the request
+# and the versions of the tables they read:
+#   - If-None-Match match      -> 304, no handler call
+#   - body cached for that tag -> served from memory, no handler call
+# Versions are re-read at most every DATA_VERSION_TTL seconds per process, so an
+# unchanged page costs no DB query in between; this process's own writes invalidate
+# immediately (after_request hook below).
+DATA_VERSION_TTL = float(os.getenv("DATA_VERSION_TTL", "5"))
+PUBLIC_CACHE_MAX_AGE = int(os.getenv("PUBLIC_CACHE_MAX_AGE", "60"))
+PUBLIC_CACHE_SWR = int(os.getenv("PUBLIC_CACHE_SWR", "600"))
+PUBLIC_CACHE_ENTRIES = int(os.getenv("PUBLIC_CACHE_ENTRIES", "512"))
+PUBLIC_CACHE_MAX_BODY = 512 * 1024
+PUBLIC_CACHE_KEEP_HEADERS = ("X-Next-Cursor",)  # handler-set headers stored with the body
+# Response shapes can change between deploys: Cloud Run's revision name keeps ETags apart.
+PUBLIC_CACHE_SALT = os.getenv("K_REVISION", "")
+VERSIONED_TABLES = (
+    "events", "event_participation", "event_summaries", "event_photos", "venues", "hosts",
+    "tournament_teams", "tournament_team_scores", "tournament_weeks", "tournament_standings",
+)
+
+class DataVersions:
+    """Process-local snapshot of {table: (version, updated_at)} from data_version, refreshed every `ttl` seconds."""
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._versions = {}
+        self._loaded_at = None
+        self.loads = 0
+        self.errors = 0
+
+    def _load(self):
+        conn = getconn()
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT scope, version, updated_at FROM data_version;")
+            versions = {r[0]: (r[1], r[2]) for r in cur.fetchall()}
+        finally:
+            conn.close()
+        with self._lock:
+            self._versions = versions
+            self._loaded_at = time.monotonic()
+            self.loads += 1
+
+    def get(self, scopes):
+        """((version, updated_at), ...) for `scopes`, or None if versions can't be read at all."""
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.ttl:
+            # One thread refreshes; the others keep using the previous snapshot meanwhile.
+            if self._load_lock.acquire(blocking=loaded_at is None):
+                try:
+                    current = self._loaded_at
+                    if current is None or time.monotonic() - current > self.ttl:
+                        self._load()
+                except Exception as e:
+                    self.errors += 1
+                    logger.warning(f"data_version read failed: {e}")
+                finally:
+                    self._load_lock.release()
+        with self._lock:
+            if self._loaded_at is None:
+                return None
+            return tuple(self._versions.get(s, (0, None)) for s in scopes)
+
+    def invalidate(self):
+        with self._lock:
+            if self._loaded_at is not None:
+                self._loaded_at -= self.ttl + 1
+
+    def stats(self):
+        with self._lock:
+            return {"loads": self.loads, "errors": self.errors, "scopes": len(self._versions)}
+
+class ResponseCache:
+    """Thread-safe LRU of {etag: (status, mimetype, body, headers)} for @public_cached responses."""
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, tag):
+        with self._lock:
+            entry = self._entries.get(tag)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(tag)
+            self.hits += 1
+            return entry
+
+    def put(self, tag, entry):
+        with self._lock:
+            self._entries[tag] = entry
+            self._entries.move_to_end(tag)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def note_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": sum(len(e[2]) for e in self._entries.values()),
+                "hits": self.hits, "misses": self.misses, "not_modified": self.not_modified,
+            }
+
+_data_versions = DataVersions(DATA_VERSION_TTL)
+_response_cache = ResponseCache(PUBLIC_CACHE_ENTRIES)
+
+class RefCache:
+    """
+    Read-through cache for small reference tables (hosts, venues, tournament teams).
+    An entry is reused while every table it was built from still has the data_version it
+    was loaded at, and for at most `max_age` seconds. Other workers/instances converge
+    within DATA_VERSION_TTL; writers here call invalidate() after commit for immediate effect.
+    """
+    def __init__(self, max_age):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._entries = {}  # name -> (scopes, versions, loaded_at, value)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name, scopes, loader):
+        versions = _data_versions.get(scopes)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(name)
+            if (entry is not None and versions is not None and entry[1] == versions
+                    and now - entry[2] < self.max_age):
+                self.hits += 1
+                return entry[3]
+            self.misses += 1
+        value = loader()
+        if versions is not None:
+            with self._lock:
+                self._entries[name] = (tuple(scopes), versions, now, value)
+        return value
+
+    def invalidate(self, *scopes):
+        """Drop entries built from any of `scopes` (all entries if none given)."""
+        with self._lock:
+            for name in [n for n, e in self._entries.items() if not scopes or set(scopes) & set(e[0])]:
+                del self._entries[name]
+        _data_versions.invalidate()
+
+    def stats(self):
+        with self._lock:
+            return {"entries": sorted(self._entries), "hits": self.hits, "misses": self.misses}
+
+REF_CACHE_MAX_AGE = float(os.getenv("REF_CACHE_MAX_AGE", "300"))
+_ref_cache = RefCache(REF_CACHE_MAX_AGE)
+
+def _load_rows(sql):
+    conn = getconn()
+    try:
+        cur = conn.cursor()
+        cur.execute(sql)
+        return [tuple(r) for r in cur.fetchall()]
+    finally:
+        conn.close()
+
+def ref_hosts():
+    """[(id, name, phone, email)] ordered by name."""
+    return _ref_cache.get("hosts", ("hosts",), lambda: _load_rows(
+        "SELECT id, name, phone, email FROM hosts ORDER BY name;"
+    ))
+
+def ref_venues():
+    """[(id, name, default_day, default_time, access_key, is_active, default_host_id, show_type, notes, slug)] ordered by name."""
+    return _ref_cache.get("venues", ("venues",), lambda: _load_rows(
+        "SELECT id, name, default_day, default_time, access_key, is_active, default_host_id, show_type, notes, slug "
+        "FROM venues ORDER BY name;"
+    ))
+
+def ref_tournament_teams():
+    """[(id, name, home_venue_id, home_venue_name, captain_name, captain_email, captain_phone, player_count)] ordered by name."""
+    return _ref_cache.get("tournament_teams", ("tournament_teams", "venues"), lambda: _load_rows("""
+        SELECT tt.id, tt.name, tt.home_venue_id, v.name AS home_venue_name,
+               tt.captain_name, tt.captain_email, tt.captain_phone, tt.player_count
+        FROM tournament_teams tt
+        LEFT JOIN venues v ON tt.home_venue_id = v.id
+        ORDER BY tt.name;
+    """))
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+def venue_slug(name):
+    """URL slug used by the /pub venue pages ("The Tap Room #2" -> "the-tap-room-2")."""
+    return _SLUG_RE.sub("-", (name or "").lower()).strip("-")
+
+def assign_venue_slug(cur, venue_id, name):
+    """
+    Store venues.slug for a created/renamed venue (caller commits). A slug already taken
+    by another venue gets the id appended, then a counter ("tap-room-7", "tap-room-7-2", ...)
+    until it is free, since a venue named e.g. "Tap Room 7" may already own the suffixed form.
+    """
+    base = venue_slug(name) or f"venue-{venue_id}"
+    slug, n = base, 1
+    while True:
+        cur.execute("SELECT 1 FROM venues WHERE slug=%s AND id<>%s;", (slug, venue_id))
+        if not cur.fetchone():
+            break
+        slug = f"{base}-{venue_id}" if n == 1 else f"{base}-{venue_id}-{n}"
+        n += 1
+    cur.execute("UPDATE venues SET slug=%s WHERE id=%s AND slug IS DISTINCT FROM %s;", (slug, venue_id, slug))
+    return slug
+
+def access_key_matches(supplied, stored):
+    """Constant-time access-key comparison (no early exit on the first differing byte)."""
+    if not supplied or not stored:
+        return False
+    return hmac.compare_digest(str(supplied).encode("utf-8"), str(stored).encode("utf-8"))
+
+@app.after_request
+def _invalidate_data_versions(response):
+    if request.method in ("POST", "PUT", "PATCH", "DELETE") and response.status_code < 400:
+        _data_versions.invalidate()
+    return response
+
+def public_cached(*scopes, max_age=None, stale_while_revalidate=None):
+    """
+    Cache a public GET handler by the versions of the tables in `scopes` (see above).
+    Only 200 responses are stored; anything else passes through uncached.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            age = PUBLIC_CACHE_MAX_AGE if max_age is None else max_age
+            swr = PUBLIC_CACHE_SWR if stale_while_revalidate is None else stale_while_revalidate
+            versions = _data_versions.get(scopes)
+            if versions is None:
+                return fn(*args, **kwargs)
+            query = "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+            material = f"{fn.__name__}|{request.path}?{query}|{PUBLIC_CACHE_SALT}|" + ",".join(
+                f"{s}:{v[0]}" for s, v in zip(scopes, versions)
+            )
+            tag = hashlib.sha256(material.encode("utf-8")).hexdigest()[:32]
+            modified = [v[1] for v in versions if v[1] is not None]
+            headers = {
+                "ETag": f'"{tag}"',
+                "Cache-Control": f"public, max-age={age}, stale-while-revalidate={swr}",
+            }
+            if modified:
+                headers["Last-Modified"] = http_date(max(modified))
+
+            if request.if_none_match.contains_weak(tag):
+                _response_cache.note_not_modified()
+                return Response(status=304, headers=headers)
+            cached = _response_cache.get(tag)
+            if cached is not None:
+                status, mimetype, body, kept = cached
+                return Response(body, status=status, mimetype=mimetype, headers=dict(kept, **headers))
+
+            resp = make_response(fn(*args, **kwargs))
+            if resp.status_code != 200 or resp.is_streamed:
+                return resp
+            body = resp.get_data()
+            if len(body) <= PUBLIC_CACHE_MAX_BODY:
+                kept = {h: resp.headers[h] for h in PUBLIC_CACHE_KEEP_HEADERS if h in resp.headers}
+                _response_cache.put(tag, (resp.status_code, resp.mimetype, body, kept))
+            resp.headers.update(headers)
+            return resp
+        return wrapper
+    return decorator
+
+# ------------------------------------------------------------------------------
+# Outbound HTTP (shared pooled sessions)
+# ------------------------------------------------------------------------------
+OUTBOUND_POOL_MAXSIZE = int(os.getenv("OUTBOUND_POOL_MAXSIZE", "16"))
+OUTBOUND_HOST_CONCURRENCY = int(os.getenv("OUTBOUND_HOST_CONCURRENCY", "8"))
+OUTBOUND_RETRY_BACKOFF = float(os.getenv("OUTBOUND_RETRY_BACKOFF", "0.5"))
+_LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+def http_retry_policy(attempts=3):
+    """urllib3 Retry for idempotent requests: connect/read errors and 429/5xx, exponential backoff, honours Retry-After."""
+    return Retry(
+        total=max(0, attempts - 1),
+        backoff_factor=OUTBOUND_RETRY_BACKOFF,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+class OutboundHTTP:
+    """
+    One keep-alive connection pool per host, shared by every request thread (replaces
+    module-level requests.get/head, which opened a fresh TCP+TLS connection per call).
+    - Retries: a urllib3 Retry policy per attempt count (sessions are cached per policy).
+    - Concurrency: at most `host_concurrency` in-flight requests per host; for stream=True
+      the slot is held until the response is closed.
+    - Stats: per-host pool reuse (requests vs new connections) and latency histograms.
+    Exposes get/head/post/request with the requests API, so it also stands in as `httpx`.
+    """
+    def __init__(self, pool_maxsize, host_concurrency):
+        self.pool_maxsize = max(1, pool_maxsize)
+        self.host_concurrency = max(1, host_concurrency)
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._host_slots = {}
+        self._host_stats = {}
+
+    def _session(self, attempts):
+        sess = self._sessions.get(attempts)
+        if sess is not None:
+            return sess
+        with self._lock:
+            sess = self._sessions.get(attempts)
+            if sess is None:
+                sess = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=32, pool_maxsize=self.pool_maxsize,
+                    max_retries=http_retry_policy(attempts),
+                )
+                sess.mount("https://", adapter)
+                sess.mount("http://", adapter)
+                self._sessions[attempts] = sess
+            return sess
+
+    def _slot(self, host):
+        sem = self._host_slots.get(host)
+        if sem is None:
+            with self._lock:
+                sem = self._host_slots.setdefault(host, threading.BoundedSemaphore(self.host_concurrency))
+        return sem
+
+    def _record(self, host, elapsed_ms, ok):
+        with self._lock:
+            st = self._host_stats.get(host)
+            if st is None:
+                st = self._host_stats[host] = {
+                    "requests": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0,
+                    "buckets": [0] * (len(_LATENCY_BUCKETS_MS) + 1),
+                }
+            st["requests"] += 1
+            st["errors"] += 0 if ok else 1
+            st["total_ms"] += elapsed_ms
+            st["max_ms"] = max(st["max_ms"], elapsed_ms)
+            i = 0
+            while i < len(_LATENCY_BUCKETS_MS) and elapsed_ms > _LATENCY_BUCKETS_MS[i]:
+                i += 1
+            st["buckets"][i] += 1
+
+    def request(self, method, url, attempts=1, **kwargs):
+        """
+        requests-compatible call. attempts=1 (default) means no automatic retry;
+        GET/HEAD with attempts>1 retry on connection errors and 429/5xx.
+        """
+        kwargs.setdefault("timeout", 30)
+        host = urlsplit(url).netloc.lower()
+        sem = self._slot(host)
+        timeout = kwargs["timeout"]
+        wait_s = (timeout[0] if isinstance(timeout, tuple) else timeout) or 30
+        if not sem.acquire(timeout=wait_s):
+            self._record(host, 0.0, ok=False)
+            raise requests.exceptions.ConnectTimeout(f"outbound concurrency limit reached for {host}")
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                sem.release()
+
+        t0 = time.monotonic()
+        try:
+            r = self._session(attempts).request(method, url, **kwargs)
+        except Exception:
+            release()
+            self._record(host, (time.monotonic() - t0) * 1000, ok=False)
+            raise
+        self._record(host, (time.monotonic() - t0) * 1000, ok=r.status_code < 500)
+        if kwargs.get("stream"):
+            orig_close = r.close
+            def close():
+                try:
+                    orig_close()
+                finally:
+                    release()
+            r.close = close
+        else:
+            release()
+        return r
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def stats(self):
+        pools = {}
+        with self._lock:
+            sessions = list(self._sessions.values())
+            host_stats = {h: dict(st, buckets=list(st["buckets"])) for h, st in self._host_stats.items()}
+        for sess in sessions:
+            pm = sess.get_adapter("https://").poolmanager
+            for key in list(pm.pools.keys()):
+                pool = pm.pools.get(key)
+                if pool is None:
+                    continue
+                host = key.key_host if key.key_port in (None, 80, 443) else f"{key.key_host}:{key.key_port}"
+                agg = pools.setdefault(host, {"requests": 0, "new_connections": 0})
+                agg["requests"] += pool.num_requests
+                agg["new_connections"] += pool.num_connections
+        out = {}
+        for host in sorted(set(pools) | set(host_stats)):
+            st = host_stats.get(host, {})
+            p = pools.get(host, {"requests": 0, "new_connections": 0})
+            n = st.get("requests", 0)
+            labels = [f"le_{b}ms" for b in _LATENCY_BUCKETS_MS] + ["gt_10000ms"]
+            out[host] = {
+                "requests": n,
+                "errors": st.get("errors", 0),
+                "avg_ms": round(st["total_ms"] / n, 1) if n else None,
+                "max_ms": round(st.get("max_ms", 0.0), 1),
+                "latency_histogram": dict(zip(labels, st.get("buckets", []))),
+                "pool_requests": p["requests"],
+                "pool_new_connections": p["new_connections"],
+                "pool_hit_rate": round(1 - p["new_connections"] / p["requests"], 3) if p["requests"] else None,
+            }
+        return {"pool_maxsize": self.pool_maxsize, "host_concurrency": self.host_concurrency, "hosts": out}
+
+http_client = OutboundHTTP(OUTBOUND_POOL_MAXSIZE, OUTBOUND_HOST_CONCURRENCY)
+# Call sites use `httpx.get/head(...)`; tests swap this name for a fake.
+httpx = http_client
+
 # ------------------------------------------------------------------------------
 # Runtime SA diagnostics helper
 # ------------------------------------------------------------------------------
@@ -357,8 +1454,8 @@ METADATA_HEADERS = {"Metadata-Flavor": "Google"}
 
 def get_runtime_sa_email() -> str | None:
     try:
-        # Use the requests library (not Flask's request proxy)
-        r = requests.get(METADATA_EMAIL_URL, headers=METADATA_HEADERS, timeout=2)
+        # Outbound client (not Flask's request proxy)
+        r = http_client.get(METADATA_EMAIL_URL, headers=METADATA_HEADERS, timeout=2)
         if r.ok:
             email = (r.text or "").strip()
             if "@" in email and email.endswith(".iam.gserviceaccount.com"):
@@ -376,20 +1473,226 @@ def get_runtime_sa_email() -> str | None:
     return None
 
 # ------------------------------------------------------------------------------
-# DB conn
+# DB conn (process-wide pool)
 # ------------------------------------------------------------------------------
-def getconn():
-    if not all([PGHOST, PGDATABASE, PGUSER, PGPASSWORD]):
-        raise RuntimeError("DB env vars missing: PGHOST, PGDATABASE, PGUSER, PGPASSWORD")
-    ctx = ssl.create_default_context()
+# gunicorn runs 1 worker x 8 threads; the pool is shared by those threads.
+PG_POOL_MAX = int(os.getenv("PG_POOL_MAX", "10"))
+PG_POOL_TIMEOUT = float(os.getenv("PG_POOL_TIMEOUT", "10"))            # seconds to wait for a free conn
+PG_POOL_MAX_AGE = float(os.getenv("PG_POOL_MAX_AGE", "1800"))          # recycle conns older than this
+PG_POOL_HEALTHCHECK_IDLE = float(os.getenv("PG_POOL_HEALTHCHECK_IDLE", "30"))  # ping conns idle longer than this
+
+_pg_ssl_context = None
+
+def _pg_connect():
+    global _pg_ssl_context
+    if _pg_ssl_context is None:
+        _pg_ssl_context = ssl.create_default_context()
     return pg8000.connect(
         host=PGHOST,
         database=PGDATABASE,
         user=PGUSER,
         password=PGPASSWORD,
         port=PGPORT,
-        ssl_context=ctx,
+        ssl_context=_pg_ssl_context,
     )
+
+class PooledConnection:
+    """
+    Thin wrapper around a pg8000 connection checked out of PgPool.
+    close() hands the connection back to the pool instead of closing the socket,
+    so existing `conn = getconn() ... conn.close()` call sites work unchanged.
+    A wrapper garbage-collected without close() gives its slot back (the connection
+    itself is discarded, since its transaction state is unknown).
+    """
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._broken = False
+        self._finalizer = weakref.finalize(self, pool._reclaim, raw, created_at)
+        self._finalizer.atexit = False
+
+    def cursor(self):
+        return self._raw.cursor()
+
+    def commit(self):
+        try:
+            self._raw.commit()
+        except Exception:
+            self._broken = True
+            raise
+
+    def rollback(self):
+        try:
+            self._raw.rollback()
+        except Exception:
+            self._broken = True
+            raise
+
+    def close(self):
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._finalizer.detach()
+            self._pool._release(raw, self._created_at, self._broken)
+
+    def __getattr__(self, name):
+        if self._raw is None:
+            raise pg8000.InterfaceError("connection already returned to pool")
+        return getattr(self._raw, name)
+
+class PgPool:
+    """
+    Thread-safe bounded pool of pg8000 connections.
+      - at most `max_size` connections open (idle + checked out)
+      - idle connections are pinged before reuse if idle > healthcheck_idle
+      - connections older than max_age are closed instead of reused
+    """
+    def __init__(self, connect, max_size, timeout, max_age, healthcheck_idle):
+        self._connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_age = max_age
+        self.healthcheck_idle = healthcheck_idle
+        self._cond = threading.Condition()
+        self._idle = []          # [(raw, created_at, last_used)] — LIFO keeps hot conns hot
+        self._in_use = 0
+        self._pid = os.getpid()
+        self._stats = {
+            "created": 0, "reused": 0, "recycled_age": 0, "failed_healthcheck": 0,
+            "discarded_broken": 0, "waits": 0, "timeouts": 0, "reclaimed_leaked": 0,
+        }
+
+    def _close_raw(self, raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def _reset_after_fork(self):
+        # A forked child must not share sockets with the parent.
+        self._idle = []
+        self._in_use = 0
+        self._pid = os.getpid()
+
+    def _checkout(self, deadline):
+        """
+        Reserve a slot. Returns (raw, created_at, needs_ping) for an idle connection, or
+        (None, None, False) when the caller should open a new one.
+        """
+        with self._cond:
+            if self._pid != os.getpid():
+                self._reset_after_fork()
+            while True:
+                while self._idle:
+                    raw, created_at, last_used = self._idle.pop()
+                    now = time.monotonic()
+                    if now - created_at > self.max_age:
+                        self._stats["recycled_age"] += 1
+                        self._close_raw(raw)
+                        continue
+                    self._in_use += 1
+                    return raw, created_at, now - last_used > self.healthcheck_idle
+                if self._in_use < self.max_size:
+                    self._in_use += 1
+                    return None, None, False
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise RuntimeError(f"DB pool exhausted ({self.max_size} connections in use)")
+                self._stats["waits"] += 1
+                self._cond.wait(remaining)
+
+    def getconn(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            raw, created_at, needs_ping = self._checkout(deadline)
+            if raw is None:
+                break
+            # The ping is a network round trip: never hold the lock across it.
+            if needs_ping and not self._ping(raw):
+                self._close_raw(raw)
+                with self._cond:
+                    self._stats["failed_healthcheck"] += 1
+                    self._in_use = max(0, self._in_use - 1)
+                    self._cond.notify()
+                continue
+            with self._cond:
+                self._stats["reused"] += 1
+            return PooledConnection(self, raw, created_at)
+
+        # Open the new connection outside the lock: the TLS handshake is the slow part.
+        try:
+            raw = self._connect()
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats["created"] += 1
+        return PooledConnection(self, raw, time.monotonic())
+
+    def _ping(self, raw):
+        try:
+            cur = raw.cursor()
+            cur.execute("SELECT 1;")
+            cur.fetchone()
+            raw.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _release(self, raw, created_at, broken):
+        # Never hand out a connection with an open transaction.
+        if not broken:
+            try:
+                raw.rollback()
+            except Exception:
+                broken = True
+        with self._cond:
+            if self._pid != os.getpid():
+                self._close_raw(raw)
+                return
+            self._in_use = max(0, self._in_use - 1)
+            if broken:
+                self._stats["discarded_broken"] += 1
+                self._close_raw(raw)
+            elif time.monotonic() - created_at > self.max_age:
+                self._stats["recycled_age"] += 1
+                self._close_raw(raw)
+            else:
+                self._idle.append((raw, created_at, time.monotonic()))
+            self._cond.notify()
+
+    def _reclaim(self, raw, created_at):
+        # weakref.finalize callback for a PooledConnection dropped without close().
+        with self._cond:
+            self._stats["reclaimed_leaked"] += 1
+        logger.warning("DB connection was never closed; reclaiming its pool slot")
+        self._release(raw, created_at, True)
+
+    def stats(self):
+        with self._cond:
+            out = dict(self._stats)
+            out.update({
+                "max_size": self.max_size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+            })
+            return out
+
+_db_pool = PgPool(
+    _pg_connect,
+    max_size=PG_POOL_MAX,
+    timeout=PG_POOL_TIMEOUT,
+    max_age=PG_POOL_MAX_AGE,
+    healthcheck_idle=PG_POOL_HEALTHCHECK_IDLE,
+)
+
+def getconn():
+    if not all([PGHOST, PGDATABASE, PGUSER, PGPASSWORD]):
+        raise RuntimeError("DB env vars missing: PGHOST, PGDATABASE, PGUSER, PGPASSWORD")
+    return _db_pool.getconn()
 # ------------------------------------------------------------------------------
 # Date Helper
 # ------------------------------------------------------------------------------
@@ -440,14 +1743,14 @@ def safe_key(file_name: str) -> str:
     datedir = datetime.utcnow().strftime("%Y/%m/%d")
     return f"uploads/{datedir}/{prefix}-{stem}{ext}"
 
-def validate_upload(kind, uploaded_file):
-    ctype = (uploaded_file.mimetype or "").lower()
-    name = (uploaded_file.filename or "").strip()
-    pos = uploaded_file.stream.tell()
-    uploaded_file.stream.seek(0, os.SEEK_END)
-    size = uploaded_file.stream.tell()
-    uploaded_file.stream.seek(pos)
+def upload_kind(file_name, content_type):
+    ctype = (content_type or "").lower()
+    return "pdf" if ctype.startswith("application/pdf") or (file_name or "").lower().endswith(".pdf") else "image"
 
+def check_upload_meta(kind, ctype, name, size):
+    """Type/size rules shared by the proxied upload and direct (signed) upload sessions."""
+    ctype = (ctype or "").lower()
+    name = (name or "").strip()
     if kind == "pdf":
         if not ctype.startswith("application/pdf") and not name.lower().endswith(".pdf"):
             raise ValueError("File must be a PDF (application/pdf)")
@@ -468,19 +1771,85 @@ def validate_upload(kind, uploaded_file):
         raise ValueError("Image exceeds 12 MB limit")
     return ctype, size
 
+def validate_upload(kind, uploaded_file):
+    pos = uploaded_file.stream.tell()
+    uploaded_file.stream.seek(0, os.SEEK_END)
+    size = uploaded_file.stream.tell()
+    uploaded_file.stream.seek(pos)
+    return check_upload_meta(kind, uploaded_file.mimetype, uploaded_file.filename, size)
+
 def fetch_with_retry(url, attempts=3, timeout=60):
-    last = None
-    for i in range(attempts):
-        try:
-            r = requests.get(url, timeout=timeout)
-            if r.status_code in (429, 500, 502, 503, 504):
-                raise RuntimeError(f"retryable status {r.status_code}")
-            r.raise_for_status()
-            return r
-        except Exception as e:
-            last = e
-            time.sleep((0.4 + random.random()) * (2 ** i))
-    raise last
+    # Retries/backoff for connection errors and 429/5xx come from http_retry_policy().
+    r = httpx.get(url, attempts=attempts, timeout=timeout)
+    r.raise_for_status()
+    return r
+
+# --- Direct reads of our own bucket ---
+# URLs under https://storage.googleapis.com/{GCS_BUCKET}/ are our objects: read them with
+# storage_client (authenticated, pooled connections, ranged chunks pinned to the object's
+# generation) instead of anonymous public HTTP. Any other host stays on plain HTTP.
+GCS_READ_CHUNK_BYTES = 1024 * 1024
+_GCS_URL_PATTERNS = [
+    re.compile(r"^https?://storage\.(?:googleapis|cloud\.google)\.com/(?P<bucket>[^/?#]+)/(?P<key>[^?#]+)"),
+    re.compile(r"^https?://(?P<bucket>[^/?#]+)\.storage\.googleapis\.com/(?P<key>[^?#]+)"),
+    re.compile(r"^gs://(?P<bucket>[^/?#]+)/(?P<key>[^?#]+)"),
+]
+
+def gcs_object_for_url(url):
+    """(bucket, key) when `url` points at an object in GCS_BUCKET, else None."""
+    if not url or not GCS_BUCKET:
+        return None
+    for pat in _GCS_URL_PATTERNS:
+        m = pat.match(url.strip())
+        if m and m.group("bucket") == GCS_BUCKET:
+            return m.group("bucket"), unquote(m.group("key"))
+    return None
+
+def gcs_url_generation(url):
+    """The ?generation= an object URL is pinned to (verified direct uploads), else None."""
+    m = re.search(r"[?&]generation=(\d+)", url or "")
+    return int(m.group(1)) if m else None
+
+def gcs_get_blob(url):
+    """
+    Blob (with generation/size/etag loaded) for one of our URLs; None if not ours or missing.
+    A URL pinned with ?generation= only ever resolves to that generation.
+    """
+    ref = gcs_object_for_url(url)
+    if not ref:
+        return None
+    return storage_client.bucket(ref[0]).get_blob(ref[1], generation=gcs_url_generation(url))
+
+def iter_gcs_blob(blob, chunk_size=GCS_READ_CHUNK_BYTES, max_bytes=None):
+    """
+    Yield the object's bytes in ranged chunks. Every range request carries
+    if_generation_match, so an object replaced mid-read fails instead of mixing versions.
+    """
+    if max_bytes is not None and (blob.size or 0) > max_bytes:
+        raise ValueError(f"object exceeds {max_bytes} bytes")
+    total = 0
+    with blob.open("rb", chunk_size=chunk_size, if_generation_match=blob.generation) as f:
+        while True:
+            part = f.read(chunk_size)
+            if not part:
+                break
+            total += len(part)
+            if max_bytes is not None and total > max_bytes:
+                raise ValueError(f"object exceeds {max_bytes} bytes")
+            yield part
+
+def read_gcs_url(url, max_bytes=None):
+    """Bytes of one of our objects via the storage client, or None if `url` isn't ours."""
+    blob = gcs_get_blob(url)
+    if blob is None:
+        if gcs_object_for_url(url):
+            raise FileNotFoundError(f"GCS object not found: {url}")
+        return None
+    if max_bytes is not None and (blob.size or 0) > max_bytes:
+        raise ValueError(f"object exceeds {max_bytes} bytes")
+    if (blob.size or 0) <= GCS_READ_CHUNK_BYTES:
+        return blob.download_as_bytes(if_generation_match=blob.generation)
+    return b"".join(iter_gcs_blob(blob, max_bytes=max_bytes))
 
 # Adjectives and AI recap (unchanged)
 AI_ADJECTIVES = [
@@ -582,6 +1951,9 @@ def handle_413(_e):
 # ------------------------------------------------------------------------------
 # PDF parsing helpers 
 # ------------------------------------------------------------------------------
+# Bump whenever parse_raw_text() output can change for the same text; keys pdf_parse_cache.
+PARSER_VERSION = "2026.10.2"
+
 HEADER_KEYWORDS = [
     "WEEK ENDING", "TOTAL", "VENUE", "TEAM NAME", "POINTS", "PLAYERS",
     "FALL", "LEADER BOARD", "TOURNAMENT", "GSP", "EVENT DETAILS",
@@ -589,93 +1961,378 @@ HEADER_KEYWORDS = [
     "RANK", "SCORE", "PAGE 1" # Added "PAGE 1" to filter out footer
 ]
 
+# likely_noise_line() is called for every extracted line, so its patterns are compiled once
+# here. The "strict" column headers only ever matched the whole line, which is exactly
+# what _HEADER_EXACT checks; every other keyword is a plain substring test, folded into
+# one alternation. tests/test_noise_classifier.py checks this against the old loop.
+_STRICT_HEADER_KEYWORDS = frozenset(["RANK", "SCORE", "KEYPAD", "TIME (S)", "POINTS", "PLAYERS"])
+_HEADER_EXACT = frozenset(HEADER_KEYWORDS)
+_HEADER_SUBSTR_RE = re.compile(
+    "|".join(re.escape(kw) for kw in HEADER_KEYWORDS if kw not in _STRICT_HEADER_KEYWORDS)
+)
+_TEAM_SIGNATURE_RE = re.compile(r"\(\s*[\d\sA-Za-z]+\s*\)")
+_RANK_ONLY_RE = re.compile(r"\d{1,2}")
+_NOISE_SHAPE_RE = re.compile(r"[\W_]+|[A-Z]")
+
 def likely_noise_line(line: str) -> bool:
     s = line.strip()
     if not s:
         return True
     
-    # NEW: If the line contains a team signature like "(3)" or "(5 TV)", 
-    # never treat it as noise.
-    if re.search(r"\(\s*[\d\sA-Za-z]+\s*\)", s):
+    # If the line contains a team signature like "(3)" or "(5 TV)", never treat it as noise.
+    if _TEAM_SIGNATURE_RE.search(s):
         return False
 
     # Standalone rank numbers should NOT be considered noise.
-    if re.fullmatch(r"\d{1,2}", s):
+    if _RANK_ONLY_RE.fullmatch(s):
         return False
 
     upper = s.upper()
     
-    # Header keywords often appear as standalone lines or labels.
-    # We should only skip if they match the whole word/line to avoid
-    # filtering out teams like "Multiple Scoregasms".
-    for kw in HEADER_KEYWORDS:
-        # Check if the keyword is the entire line or a distinct part of it.
-        # But for some like "QUIZZES", it might be part of "Game Show Palooza Quizzes".
-        if kw == upper:
-            return True
-        if kw in ["RANK", "SCORE", "KEYPAD", "TIME (S)", "POINTS", "PLAYERS"]:
-            # Stricter check for these common column headers
-            if re.fullmatch(r"\b" + re.escape(kw) + r"\b", upper):
-                return True
-        elif kw in upper:
-            # For others, partial match is okay (e.g. "PRINT DATE")
-            return True
-
-    # If the line only contains non-alphanumeric chars or single digit/letter
-    if re.fullmatch(r"[\W_]+", s) or re.fullmatch(r"^\d$", s) or re.fullmatch(r"^[A-Z]$", s):
+    # Header keywords: column headers ("RANK", "SCORE", ...) only as the whole line so teams
+    # like "Multiple Scoregasms" survive; the rest (e.g. "PRINT DATE") anywhere in the line.
+    if upper in _HEADER_EXACT or _HEADER_SUBSTR_RE.search(upper):
         return True
-    # Filter standalone 2-digit numbers (common parsing artifact)
-    if re.fullmatch(r"^\d{2}$", s):
+
+    # If the line only contains non-alphanumeric chars or a single capital letter
+    if _NOISE_SHAPE_RE.fullmatch(s):
         return True
     # Aggressively filter lines that look like column headers
     if "KEYPAD" in upper and "TIME" in upper:
         return True
     return False
 
-def extract_players_and_flags(flag_text: str):
-    if not flag_text:
-        return None, False, False
-    t = re.sub(r"\s+", "", str(flag_text).upper())
-    m = re.match(r"(\d+)([A-Z]*)", t)
-    if not m:
-        # If no number is found, it might still have flags like 'T' or 'V'
-        return None, ("T" in t) or ("V" in t), "V" in t
-    n = int(m.group(1))
-    flags = m.group(2) or ""
-    has_v = "V" in flags
-    has_t = ("T" in flags) or has_v
-    return n, has_t, has_v
+def extract_players_and_flags(flag_text: str):
+    if not flag_text:
+        return None, False, False
+    t = re.sub(r"\s+", "", str(flag_text).upper())
+    m = re.match(r"(\d+)([A-Z]*)", t)
+    if not m:
+        # If no number is found, it might still have flags like 'T' or 'V'
+        return None, ("T" in t) or ("V" in t), "V" in t
+    n = int(m.group(1))
+    flags = m.group(2) or ""
+    has_v = "V" in flags
+    has_t = ("T" in flags) or has_v
+    return n, has_t, has_v
+
+def to_direct_download(url: str) -> str:
+    if not url:
+        return url
+    if "drive.google.com" not in url:
+        return url
+    m = re.search(r"/file/d/([^/]+)/", url)
+    if m:
+        fid = m.group(1)
+        return f"https://drive.google.com/uc?export=download&id={fid}"
+    m2 = re.search(r"[?&]id=([^&]+)", url)
+    if m2:
+        fid = m2.group(1)
+        return f"https://drive.google.com/uc?export=download&id={fid}"
+    return url
+
+def fetch_pdf_bytes(pdf_url: str) -> bytes:
+    if gcs_object_for_url(pdf_url):
+        try:
+            return read_gcs_url(pdf_url, max_bytes=MAX_PDF_BYTES)
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            logger.warning(f"GCS read failed for {pdf_url}, falling back to HTTP: {e}")
+    r = fetch_with_retry(to_direct_download(pdf_url), attempts=3, timeout=60)
+    return r.content
+
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", "2"))
+PDF_EXTRACT_TIMEOUT = float(os.getenv("PDF_EXTRACT_TIMEOUT", "45"))
+PDF_EXTRACT_MEM_MB = int(os.getenv("PDF_EXTRACT_MEM_MB", "512"))
+
+class PdfExtractor:
+    """
+    Runs pdf_extract.extract() in a small pool of spawned worker processes so pdfminer's
+    CPU-bound parsing never holds this process's GIL (and the request threads with it).
+    Each document gets a wall-clock timeout (measured from when a worker picks it up) and
+    an address-space cap (PDF_EXTRACT_MEM_MB above the worker's baseline). A timed-out
+    document's pool is killed and recreated; documents that were in flight on that pool
+    are retried once. Failures come back as meta["status"] in timeout/crashed/failed.
+    With workers=0 extraction runs in-process (no isolation).
+    """
+    def __init__(self, workers, timeout, mem_limit_mb):
+        self.workers = max(0, workers)
+        self.timeout = max(1.0, timeout)
+        self.mem_limit_mb = mem_limit_mb
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(1, self.workers))
+        self._pool = None
+        self._pool_pid = None
+        self._generation = 0
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "extracted": 0, "pypdf_fallbacks": 0, "failed": 0, "timeouts": 0,
+            "crashes": 0, "retries": 0, "pool_restarts": 0,
+        }
+
+    def _bump(self, key, n=1):
+        with self._stats_lock:
+            self._stats[key] += n
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                self._pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=pdf_extract.init_worker,
+                    initargs=(self.mem_limit_mb,),
+                )
+                self._pool_pid = os.getpid()
+                self._generation += 1
+                if self._generation > 1:
+                    self._bump("pool_restarts")
+            return self._pool, self._generation
+
+    def _discard_pool(self, generation, kill):
+        with self._lock:
+            if self._pool is None or generation != self._generation:
+                return  # already replaced by another thread
+            pool, self._pool = self._pool, None
+        if kill:
+            # ProcessPoolExecutor has no public way to stop a running task; kill its workers.
+            for proc in list((getattr(pool, "_processes", None) or {}).values()):
+                try:
+                    proc.kill()
+                except Exception:
+                    pass
+        try:
+            pool.shutdown(wait=False, cancel_futures=True)
+        except Exception:
+            pass
+
+    def _record(self, meta):
+        if meta.get("status") == "ok":
+            self._bump("extracted")
+            if meta.get("engine") == "pypdf":
+                self._bump("pypdf_fallbacks")
+        else:
+            self._bump("failed")
+            logger.warning("PDF text extraction %s: %s", meta.get("status"),
+                           meta.get("error") or meta.get("pypdf_error"))
+
+    def extract(self, pdf_bytes: bytes):
+        """Return (text, meta). Never raises for a bad document."""
+        if self.workers <= 0:
+            res = pdf_extract.extract(pdf_bytes)
+            res["meta"]["isolation"] = "in_process"
+            self._record(res["meta"])
+            return res["text"], res["meta"]
+
+        for attempt in (1, 2):
+            with self._slots:
+                pool, generation = self._get_pool()
+                t0 = time.monotonic()
+                try:
+                    fut = pool.submit(pdf_extract.extract, pdf_bytes)
+                    res = fut.result(timeout=self.timeout)
+                    meta = res["meta"]
+                    meta["isolation"] = "process"
+                    if attempt > 1:
+                        meta["attempt"] = attempt
+                    self._record(meta)
+                    return res["text"], meta
+                except concurrent.futures.TimeoutError:
+                    self._discard_pool(generation, kill=True)
+                    self._bump("timeouts")
+                    meta = {
+                        "engine": None, "status": "timeout", "bytes": len(pdf_bytes or b""),
+                        "error": f"extraction exceeded {self.timeout:g}s; worker killed",
+                        "elapsed_ms": round((time.monotonic() - t0) * 1000, 1),
+                    }
+                    self._record(meta)
+                    return "", meta
+                except BrokenProcessPool as e:
+                    # Either this document crashed its worker (segfault, OOM-kill) or another
+                    # document's timeout killed the pool under it. Retry once on a fresh pool.
+                    self._discard_pool(generation, kill=False)
+                    if attempt == 1:
+                        self._bump("retries")
+                        continue
+                    self._bump("crashes")
+                    meta = {
+                        "engine": None, "status": "crashed", "bytes": len(pdf_bytes or b""),
+                        "error": f"extraction worker died: {e or type(e).__name__}",
+                        "elapsed_ms": round((time.monotonic() - t0) * 1000, 1),
+                    }
+                    self._record(meta)
+                    return "", meta
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None and self._pool_pid == os.getpid():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        with self._stats_lock:
+            out = dict(self._stats)
+        out["workers"] = self.workers
+        out["timeout_s"] = self.timeout
+        out["mem_limit_mb"] = self.mem_limit_mb
+        return out
+
+_pdf_extractor = PdfExtractor(PDF_EXTRACT_WORKERS, PDF_EXTRACT_TIMEOUT, PDF_EXTRACT_MEM_MB)
+atexit.register(_pdf_extractor.shutdown)
+
+def extract_pdf_text(pdf_bytes: bytes):
+    """(text, meta) via the extraction worker pool; meta is stored in event_parse_log.extract_meta."""
+    return _pdf_extractor.extract(pdf_bytes)
+
+def safe_extract_text(pdf_bytes: bytes) -> str:
+    return extract_pdf_text(pdf_bytes)[0]
+
+# --- Content-addressed cache of extracted text / parse results ---
+# pdf_text_cache: sha256(pdf bytes) -> gzipped text (+ the source URL's validator so an
+#   unchanged URL can be served from cache after a HEAD, without downloading the PDF).
+# pdf_parse_cache: (sha256, PARSER_VERSION) -> parse_raw_text() output.
+# Cache failures are logged and ignored; callers always get a result.
+
+def _pdf_source_validator(pdf_url: str):
+    """
+    Cheap change detector for a PDF URL (HEAD request): GCS generation, strong ETag, or
+    Last-Modified+Content-Length. None when the server gives nothing usable (e.g. Drive).
+    """
+    if gcs_object_for_url(pdf_url):
+        try:
+            blob = gcs_get_blob(pdf_url)
+            return f"gen:{blob.generation}" if blob is not None else None
+        except Exception as e:
+            logger.debug(f"GCS metadata for PDF validator failed ({pdf_url}): {e}")
+            return None
+    try:
+        r = httpx.head(to_direct_download(pdf_url), allow_redirects=True, timeout=10)
+        if r.status_code != 200:
+            return None
+        h = r.headers
+        if h.get("x-goog-generation"):
+            return f"gen:{h.get('x-goog-generation')}"
+        etag = h.get("ETag")
+        if etag and not etag.startswith("W/"):
+            return f"etag:{etag}"
+        if h.get("Last-Modified") and h.get("Content-Length"):
+            return f"lm:{h.get('Last-Modified')}|{h.get('Content-Length')}"
+    except Exception as e:
+        logger.debug(f"HEAD for PDF validator failed ({pdf_url}): {e}")
+    return None
+
+def _text_cache_lookup(where_sql, params):
+    conn = getconn()
+    try:
+        cur = conn.cursor()
+        cur.execute(f"""
+            UPDATE pdf_text_cache SET last_used_at = now()
+            WHERE sha256 = (SELECT sha256 FROM pdf_text_cache WHERE {where_sql} ORDER BY last_used_at DESC LIMIT 1)
+            RETURNING sha256, raw_text_gz, extract_meta;
+        """, params)
+        row = cur.fetchone()
+        conn.commit()
+        if not row:
+            return None
+        meta = row[2] if not isinstance(row[2], str) else json.loads(row[2])
+        return row[0], gzip.decompress(row[1]).decode("utf-8"), meta or {}
+    finally:
+        conn.close()
+
+def _text_cache_store(sha, pdf_url, validator, raw_text, extract_meta, size):
+    conn = getconn()
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            INSERT INTO pdf_text_cache (sha256, source_url, validator, raw_text_gz, extract_meta, byte_size)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON CONFLICT (sha256) DO UPDATE SET
+              source_url = EXCLUDED.source_url,
+              validator = COALESCE(EXCLUDED.validator, pdf_text_cache.validator),
+              last_used_at = now();
+        """, (sha, pdf_url, validator, gzip.compress(raw_text.encode("utf-8")), json.dumps(extract_meta), size))
+        conn.commit()
+    finally:
+        conn.close()
+
+def load_pdf_text(pdf_url: str):
+    """
+    Return (raw_text, extract_meta, cache_info) for a PDF URL, using pdf_text_cache:
+      1. URL + validator match  -> no download, no extraction ("hit_validator")
+      2. sha256 of bytes match  -> download only ("hit_sha256")
+      3. otherwise download + extract; successful extractions are stored ("miss")
+    cache_info = {"sha256", "text_cache", "parse_key"}; parse_key is the sha256 only when
+    the text is a good extraction (safe to key pdf_parse_cache on), else None.
+    """
+    info = {"sha256": None, "text_cache": "miss", "parse_key": None}
+    validator = _pdf_source_validator(pdf_url)
+    if validator:
+        try:
+            hit = _text_cache_lookup("source_url = %s AND validator = %s", (pdf_url, validator))
+            if hit:
+                info.update(sha256=hit[0], parse_key=hit[0], text_cache="hit_validator")
+                return hit[1], hit[2], info
+        except Exception as e:
+            logger.warning(f"pdf_text_cache lookup failed: {e}")
+            info["text_cache"] = "error"
 
-def to_direct_download(url: str) -> str:
-    if not url:
-        return url
-    if "drive.google.com" not in url:
-        return url
-    m = re.search(r"/file/d/([^/]+)/", url)
-    if m:
-        fid = m.group(1)
-        return f"https://drive.google.com/uc?export=download&id={fid}"
-    m2 = re.search(r"[?&]id=([^&]+)", url)
-    if m2:
-        fid = m2.group(1)
-        return f"https://drive.google.com/uc?export=download&id={fid}"
-    return url
+    pdf_bytes = fetch_pdf_bytes(pdf_url)
+    sha = hashlib.sha256(pdf_bytes).hexdigest()
+    info["sha256"] = sha
+    try:
+        hit = _text_cache_lookup("sha256 = %s", (sha,))
+        if hit:
+            info.update(text_cache="hit_sha256", parse_key=sha)
+            if validator:
+                _text_cache_store(sha, pdf_url, validator, hit[1], hit[2], len(pdf_bytes))
+            return hit[1], hit[2], info
+    except Exception as e:
+        logger.warning(f"pdf_text_cache lookup failed: {e}")
+        info["text_cache"] = "error"
 
-def fetch_pdf_bytes(pdf_url: str) -> bytes:
-    r = fetch_with_retry(to_direct_download(pdf_url), attempts=3, timeout=60)
-    return r.content
+    raw_text, extract_meta = extract_pdf_text(pdf_bytes)
+    if extract_meta.get("status") == "ok":  # never cache timeouts/crashes
+        info["parse_key"] = sha
+        try:
+            _text_cache_store(sha, pdf_url, validator, raw_text, extract_meta, len(pdf_bytes))
+        except Exception as e:
+            logger.warning(f"pdf_text_cache store failed: {e}")
+    return raw_text, extract_meta, info
 
-def safe_extract_text(pdf_bytes: bytes) -> str:
+def parse_text_cached(sha: Optional[str], raw_text: str):
+    """parse_raw_text() memoized in pdf_parse_cache by (sha256, PARSER_VERSION). Returns (parsed, hit)."""
+    if not sha:
+        return parse_raw_text(raw_text), False
     try:
-        return extract_text(BytesIO(pdf_bytes)) or ""
+        conn = getconn()
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT parsed_json FROM pdf_parse_cache WHERE sha256=%s AND parser_version=%s;",
+                        (sha, PARSER_VERSION))
+            row = cur.fetchone()
+        finally:
+            conn.close()
+        if row:
+            return (json.loads(row[0]) if isinstance(row[0], str) else row[0]), True
     except Exception as e:
-        logger.warning("pdfminer failed; falling back to pypdf: %s", e)
+        logger.warning(f"pdf_parse_cache lookup failed: {e}")
+
+    parsed = parse_raw_text(raw_text)
+    try:
+        conn = getconn()
         try:
-            reader = PdfReader(BytesIO(pdf_bytes))
-            return "\n".join([p.extract_text() or "" for p in reader.pages])
-        except Exception as e2:
-            logger.error("pypdf also failed: %s", e2)
-            return ""
+            cur = conn.cursor()
+            cur.execute("""
+                INSERT INTO pdf_parse_cache (sha256, parser_version, parsed_json)
+                VALUES (%s, %s, %s) ON CONFLICT (sha256, parser_version) DO NOTHING;
+            """, (sha, PARSER_VERSION, json.dumps(parsed)))
+            conn.commit()
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.warning(f"pdf_parse_cache store failed: {e}")
+    return parsed, False
 
 def extract_players_and_flags(flag_text: str):
     """
@@ -822,6 +2479,9 @@ def _parse_split_format(lines: list[str]):
             if "WHAMMY" in name.upper() and not name.upper().startswith("TEAM "):
                 continue
 
+            if name.isdigit():
+                continue  # a split-up score ("1967" -> rank 19, name "67"), not a team
+
             if not any(t["name"].lower() == name.lower() for t in potential_teams):
                 potential_teams.append({
                     "name": name,
@@ -830,9 +2490,15 @@ def _parse_split_format(lines: list[str]):
                     "isVisiting": False,
                     "score": None,
                     "position": int(rank_str) if rank_str else None,
-                    "_raw_line_idx": i
+                    "_raw_line_idx": i,
+                    "_loose": True,
                 })
 
+    # Bare-name lines are only a last resort: when any "Name (flags)" rows exist, the
+    # bare lines are headers/titles ("QuizXpress Analyzer", "Team"), not teams.
+    if any(not t.get("_loose") for t in potential_teams):
+        potential_teams = [t for t in potential_teams if not t.get("_loose")]
+
     deduped_teams = []
     seen_names = set()
     for t in sorted(potential_teams, key=lambda x: (x.get('position') if x.get('position') is not None else float('inf'), x.get('_raw_line_idx', float('inf')))):
@@ -897,21 +2563,16 @@ def _parse_split_format(lines: list[str]):
                     items[j]["score"] = nums[j]
     except Exception as e:
         logger.warning(f"Error during split format score alignment: {e}")
-        pass
 
-def parse_raw_text(raw: str):
+    return items
+
+def _parse_legacy_format(lines: list[str]):
     """
-    Unified parser for PDF text. 
+    General-purpose parser (the original parse_raw_text).
     1. Extracts teams from lines (Rank Name (Flags) [optional junk] Score).
     2. Fallback for column-scrambled text.
-    3. Final sort by Rank.
+    3. Sort by Rank.
     """
-    if not raw:
-        return {"teams": [], "teamCount": 0, "playerCount": 0}
-
-    text = raw.replace("\r\n", "\n").replace("\r", "\n")
-    lines = text.split("\n")
-
     # This regex is designed to be extremely robust for "Rank Name (Flags) ... Score"
     # It looks for:
     # - Optional Rank at the start
@@ -1044,16 +2705,96 @@ def parse_raw_text(raw: str):
     except Exception as e:
         logger.warning(f"Alignment error: {e}")
 
-    # Final Renumbering & Position Clean-up
-    # Ensure positions are exactly 1...N based on the rank/discovery sort
+    return items
+
+def _finalize_teams(items: list[dict]):
+    """
+    Common post-processing for every engine: drop repeated names (first wins), order by
+    position then discovery, renumber positions 1..N and strip private "_" keys.
+    """
+    seen_names = set()
+    ordered = []
+    for idx, t in enumerate(items):
+        nm_key = (t.get("name") or "").lower()
+        if nm_key in seen_names:
+            continue
+        seen_names.add(nm_key)
+        ordered.append((t.get("position") or 999, idx, t))
+    ordered.sort(key=lambda x: (x[0], x[1]))
+
+    teams = []
     final_players = 0
-    for idx, t in enumerate(items, start=1):
-        # We trust the sort we did above
-        t["position"] = idx
+    for pos, (_, _, t) in enumerate(ordered, start=1):
+        t = {k: v for k, v in t.items() if not k.startswith("_")}
+        t["position"] = pos
         final_players += (t.get("playerCount") or 0)
-        if "_seq" in t: del t["_seq"]
+        teams.append(t)
+    return {"teams": teams, "teamCount": len(teams), "playerCount": final_players}
+
+# --- Parser engine registry ---
+# Engines take the document's lines and return raw team dicts (finalized by
+# _finalize_teams). detect_parser_engine() picks one from cheap fingerprints of the first
+# lines; "legacy" is the catch-all and the fallback when an engine finds no teams.
+PARSER_ENGINES = {
+    "quizxpress_tabular": _parse_tabular_format,
+    "split_columns": _parse_split_format,
+    "legacy": _parse_legacy_format,
+}
+PARSER_DETECT_LINES = 60
+
+_QX_TABULAR_ROW_RE = re.compile(r"^\d{1,3}\s+.+?\s+\d+\s+\d+\.\d+\s+-?\d+\s*$")
+_QX_FLAGGED_NAME_RE = re.compile(r"^(?:\d{1,3}\s+)?[^(]+\(\s*[\d\sTVtv]*\s*\)\s*$")
+
+def detect_parser_engine(lines: list[str]) -> str:
+    """
+    QuizXpress Analyzer exports carry "Keypad" and "Time (s)" column headers near the top.
+    If their rows survived extraction on one line (rank name (flags) keypad time score) the
+    tabular engine handles them directly; if names and scores came out as separate column
+    blocks, the split engine aligns them. Anything else goes to the legacy heuristics.
+    """
+    head = []
+    for ln in lines:
+        s = ln.strip()
+        if s:
+            head.append(s)
+            if len(head) >= PARSER_DETECT_LINES:
+                break
+    upper = "\n".join(head).upper()
+    if "KEYPAD" not in upper or "TIME" not in upper:
+        return "legacy"
+    tabular_rows = sum(1 for s in head if _QX_TABULAR_ROW_RE.match(s))
+    if tabular_rows >= 2:
+        return "quizxpress_tabular"
+    flagged_names = sum(1 for s in head if _QX_FLAGGED_NAME_RE.match(s))
+    if flagged_names >= 2:
+        return "split_columns"
+    return "legacy"
+
+def parse_raw_text(raw: str, engine: Optional[str] = None):
+    """
+    Parse extracted PDF text into teams using the detected (or given) parser engine.
+    Returns {"teams", "teamCount", "playerCount", "engine"}.
+    """
+    if not raw:
+        return {"teams": [], "teamCount": 0, "playerCount": 0, "engine": None}
 
-    return {"teams": items, "teamCount": len(items), "playerCount": final_players}
+    text = raw.replace("\r\n", "\n").replace("\r", "\n")
+    lines = text.split("\n")
+
+    name = engine if engine in PARSER_ENGINES else detect_parser_engine(lines)
+    items = []
+    try:
+        items = PARSER_ENGINES[name](lines) or []
+    except Exception as e:
+        logger.warning(f"Parser engine {name} failed: {e}")
+    if not items and name != "legacy":
+        logger.info(f"Parser engine {name} found no teams; falling back to legacy")
+        name = "legacy"
+        items = _parse_legacy_format(lines)
+
+    result = _finalize_teams(items)
+    result["engine"] = name
+    return result
 
 # ------------------------------------------------------------------------------
 # Diagnostics
@@ -1089,8 +2830,13 @@ def version():
 
         # uploads
         "POST /generate-upload-url",
+        "POST /uploads",
+        "POST /uploads/<id>/complete",
         "POST /events/<id>/add-photo",
         "POST /events/<id>/add-photo-url",
+        "POST /admin/photos/derivatives/backfill",
+        "GET /admin/event-summaries/check?after_id=&limit=",
+        "POST /admin/event-summaries/backfill",
 
         # events core
         "GET /events",
@@ -1121,6 +2867,10 @@ def version():
         "POST /admin/migrate-pdf",
         "POST /admin/parse-all",
         "POST /admin/parse-sweep",
+        "POST /admin/migrate-all-drive-pdfs",
+        "GET /admin/jobs?status=&kind=&limit=",
+        "GET /admin/jobs/<id>",
+        "POST /admin/jobs/<id>/retry",
 
         # admin data CRUD
         "GET /admin/hosts",
@@ -1146,6 +2896,7 @@ def version():
         "GET /admin/search/hosts?q=&limit=",
         "GET /admin/search/venues?q=&limit=",
         "GET /admin/search/teams?q=&limit=",
+        "GET /names/resolve?type=venues|hosts|teams&q=&limit=",
 
         # bulk uploads
         "POST /admin/bulk-upload-tournament-teams",
@@ -1157,7 +2908,9 @@ def version():
         "PUT /admin/tournament/scores",
         "GET /admin/tournament/scores",
         "PUT /admin/tournament/scores/<venue_id>/<week_ending>/validate",
+        "POST /admin/tournament/standings/rebuild",
         "GET /pub/tournament/scores",
+        "GET /pub/tournament-standings?venue_id=",
         "GET /pub/tournament/venues",
         "GET /pub/tournament/venue/<slug>/<date>",
 
@@ -1252,9 +3005,8 @@ def diag_parse_pdf_test():
     if not pdf_url:
         return jsonify({"error": "pdf_url required"}), 400
     try:
-        pdf_bytes = fetch_pdf_bytes(pdf_url)
-        raw = safe_extract_text(pdf_bytes)
-        parsed = parse_raw_text(raw)
+        raw, _meta, cache_info = load_pdf_text(pdf_url)
+        parsed, _hit = parse_text_cached(cache_info["parse_key"], raw)
         return jsonify({"status": "ok", "parsed": parsed, "raw_preview": raw[:1000]})
     except Exception as e:
         logger.exception("diag_parse_pdf_test failed")
@@ -1288,8 +3040,7 @@ def diag_parse_preview():
                 return jsonify({"error": "event has no pdf_url"}), 400
             pdf_url = row[0]
 
-        pdf_bytes = fetch_pdf_bytes(pdf_url)
-        raw = safe_extract_text(pdf_bytes)
+        raw, extract_meta, cache_info = load_pdf_text(pdf_url)
 
         text_norm = raw.replace("\r\n", "\n").replace("\r", "\n")
         lines = text_norm.split("\n")
@@ -1305,9 +3056,10 @@ def diag_parse_preview():
             keep = not _noise(s)
             line_sample.append({"i": i, "text": s, "keep": bool(keep)})
 
-        parsed = parse_raw_text(raw)
+        parsed, parse_hit = parse_text_cached(cache_info["parse_key"], raw)
         payload = {
             "source_url": pdf_url,
+            "cache": {"text": cache_info["text_cache"], "parse": "hit" if parse_hit else "miss"},
             "raw_length": len(raw),
             "raw_text": raw[:max_chars],
             "line_count": len(lines),
@@ -1315,7 +3067,8 @@ def diag_parse_preview():
             "parsed": parsed,
             "summary": {
                 "teams_found": parsed.get("teamCount", 0),
-                "players_total": parsed.get("playerCount", 0)
+                "players_total": parsed.get("playerCount", 0),
+                "engine": parsed.get("engine"),
             }
         }
         return jsonify(payload)
@@ -1464,7 +3217,7 @@ def proxied_upload():
 
         file_name = uploaded_file.filename
         file_type = uploaded_file.mimetype or "application/octet-stream"
-        kind = "pdf" if file_type.startswith("application/pdf") or file_name.lower().endswith(".pdf") else "image"
+        kind = upload_kind(file_name, file_type)
         try:
             validate_upload(kind, uploaded_file)
         except ValueError as ve:
@@ -1482,6 +3235,234 @@ def proxied_upload():
         logger.exception("proxied_upload failed (gcs_version=%s)", getattr(gcs, "__version__", "unknown"))
         return jsonify({"error": str(e)}), 500
 
+# ------------------------------------------------------------------------------
+# Upload endpoints (direct to GCS)
+# ------------------------------------------------------------------------------
+# Clients get a V4 signed URL that starts a GCS resumable session and send the bytes
+# straight to GCS, so a slow phone upload never holds a gunicorn thread. The object is
+# only usable by /create-event after POST /uploads/<id>/complete has checked its
+# metadata. /generate-upload-url stays as the proxied fallback (and add-photo keeps
+# handling iOS raw-body posts).
+UPLOAD_URL_TTL = int(os.getenv("UPLOAD_URL_TTL", "900"))
+
+def _upload_limit(kind):
+    return MAX_PDF_BYTES if kind == "pdf" else MAX_IMG_BYTES
+
+def _signing_kwargs():
+    """
+    Extra generate_signed_url() args. Key-file credentials sign locally; Cloud Run's
+    metadata credentials have no private key, so sign through IAM signBlob with the
+    runtime service account's email and a fresh access token.
+    """
+    import google.auth.credentials
+    import google.auth.transport.requests
+    creds = storage_client._credentials
+    if isinstance(creds, google.auth.credentials.Signing):
+        return {}
+    if not creds.valid:
+        creds.refresh(google.auth.transport.requests.Request())
+    email = getattr(creds, "service_account_email", None)
+    if not email or "@" not in email:
+        email = get_runtime_sa_email()
+    return {"service_account_email": email, "access_token": creds.token}
+
+def unverified_upload_urls(cur, urls):
+    """URLs (of ours) whose direct upload session exists but has not passed /complete."""
+    by_key = {}
+    for url in urls:
+        ref = gcs_object_for_url(url)
+        if ref:
+            by_key[ref[1]] = url
+    if not by_key:
+        return []
+    cur.execute(
+        "SELECT object_key FROM uploads WHERE object_key = ANY(%s) AND status <> 'verified';",
+        (list(by_key),),
+    )
+    return [by_key[r[0]] for r in cur.fetchall()]
+
+def pinned_upload_url(key, generation):
+    return f"https://storage.googleapis.com/{GCS_BUCKET}/{key}?generation={generation}"
+
+def pin_upload_urls(cur, urls):
+    """
+    {url: url pinned to the verified generation} for URLs that are verified direct uploads.
+    Reads through the pinned URL never see bytes written to the key after /complete.
+    """
+    by_key = {}
+    for url in urls:
+        ref = gcs_object_for_url(url)
+        if ref and gcs_url_generation(url) is None:
+            by_key.setdefault(ref[1], []).append(url)
+    if not by_key:
+        return {}
+    cur.execute(
+        "SELECT object_key, generation FROM uploads WHERE object_key = ANY(%s) AND status = 'verified' AND generation IS NOT NULL;",
+        (list(by_key),),
+    )
+    return {url: pinned_upload_url(key, gen) for key, gen in cur.fetchall() for url in by_key[key]}
+
+@app.post("/uploads")
+def create_upload_session():
+    """
+    Body: {fileName, contentType, size}. Returns a signed URL for the client to POST
+    (with the returned headers) to start a resumable upload; GCS answers with a session
+    URI in the Location header that the client PUTs the bytes to.
+    """
+    auth_error = require_auth(required_roles=['host', 'admin'])
+    if auth_error:
+        return auth_error
+    if not GCS_BUCKET:
+        return jsonify({"error": "GCS_BUCKET env var missing or empty"}), 500
+
+    d = request.json or {}
+    file_name = (d.get("fileName") or "").strip() or f"upload-{datetime.utcnow():%H%M%S}.bin"
+    content_type = (d.get("contentType") or "application/octet-stream").strip().lower()
+    try:
+        size = int(d.get("size") or 0)
+    except (TypeError, ValueError):
+        return jsonify({"error": "size must be an integer byte count"}), 400
+    kind = upload_kind(file_name, content_type)
+    try:
+        check_upload_meta(kind, content_type, file_name, size)
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 413
+
+    key = safe_key(file_name)
+    user_id = (getattr(request, 'user', None) or {}).get('id')
+    # Signed into the URL, so a replay can't overwrite the object once it exists and
+    # GCS refuses bodies over the kind's limit before they land in the bucket.
+    headers = {
+        "x-goog-resumable": "start",
+        "x-goog-if-generation-match": "0",
+        "x-goog-content-length-range": f"0,{_upload_limit(kind)}",
+    }
+    try:
+        upload_url = storage_client.bucket(GCS_BUCKET).blob(key).generate_signed_url(
+            version="v4",
+            expiration=timedelta(seconds=UPLOAD_URL_TTL),
+            method="POST",
+            content_type=content_type,
+            headers=headers,
+            **_signing_kwargs(),
+        )
+    except Exception as e:
+        logger.exception("[uploads] signing failed key=%s", key)
+        return jsonify({"error": f"Could not sign upload URL: {e}", "fallback": "/generate-upload-url"}), 500
+
+    conn = getconn()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            INSERT INTO uploads (object_key, kind, content_type, declared_bytes, created_by_user_id, expires_at)
+            VALUES (%s, %s, %s, %s, %s, now() + make_interval(secs => %s))
+            RETURNING id, expires_at;
+            """,
+            (key, kind, content_type, size, user_id, UPLOAD_URL_TTL),
+        )
+        upload_id, expires_at = cur.fetchone()
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        logger.exception("[uploads] create session failed")
+        return jsonify({"error": str(e)}), 500
+    finally:
+        conn.close()
+
+    logger.info("[uploads] session id=%s key=%s kind=%s bytes=%s", upload_id, key, kind, size)
+    return jsonify({
+        "uploadId": upload_id,
+        "uploadUrl": upload_url,
+        "method": "POST",
+        "headers": dict(headers, **{"Content-Type": content_type}),
+        "publicUrl": f"https://storage.googleapis.com/{GCS_BUCKET}/{key}",
+        "expiresAt": expires_at.isoformat() if expires_at else None,
+        "completeUrl": f"/uploads/{upload_id}/complete",
+    })
+
+def _verify_uploaded_blob(blob, kind, content_type, declared_bytes):
+    """Reason string if the uploaded object doesn't match its session, else None."""
+    size = blob.size or 0
+    if size <= 0:
+        return "uploaded object is empty"
+    if size > _upload_limit(kind):
+        return f"uploaded object exceeds {_upload_limit(kind)} bytes"
+    if declared_bytes and size != declared_bytes:
+        return f"uploaded size {size} does not match declared size {declared_bytes}"
+    actual_type = (blob.content_type or "").lower()
+    if actual_type != content_type:
+        return f"uploaded content type {actual_type or 'n/a'} does not match declared {content_type}"
+    if kind == "pdf":
+        head = blob.download_as_bytes(start=0, end=4, if_generation_match=blob.generation)
+        if not head.startswith(b"%PDF"):
+            return "uploaded object is not a PDF"
+    return None
+
+@app.post("/uploads/<int:upload_id>/complete")
+def complete_upload(upload_id):
+    auth_error = require_auth(required_roles=['host', 'admin'])
+    if auth_error:
+        return auth_error
+    user = getattr(request, 'user', None) or {}
+
+    conn = getconn()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT object_key, kind, content_type, declared_bytes, status, created_by_user_id, generation
+            FROM uploads WHERE id=%s FOR UPDATE;
+            """,
+            (upload_id,),
+        )
+        row = cur.fetchone()
+        if not row:
+            return jsonify({"error": "Upload not found"}), 404
+        key, kind, content_type, declared_bytes, status, owner_id, generation = row
+        if owner_id and user.get('id') != owner_id and user.get('role') != 'admin':
+            return jsonify({"error": "Upload belongs to another user"}), 403
+        if status == "verified":
+            conn.rollback()
+            return jsonify({"status": "ok", "uploadId": upload_id, "publicUrl": pinned_upload_url(key, generation)})
+
+        blob = storage_client.bucket(GCS_BUCKET).get_blob(key)
+        if blob is None:
+            conn.rollback()
+            return jsonify({"error": "Object has not been uploaded yet"}), 409
+
+        reason = _verify_uploaded_blob(blob, kind, content_type, declared_bytes)
+        if reason:
+            try:
+                blob.delete(if_generation_match=blob.generation)
+            except Exception:
+                logger.warning("[uploads] could not delete rejected object key=%s", key)
+            cur.execute(
+                "UPDATE uploads SET status='rejected', error=%s, actual_bytes=%s, completed_at=now() WHERE id=%s;",
+                (reason, blob.size, upload_id),
+            )
+            conn.commit()
+            logger.warning("[uploads] rejected id=%s key=%s: %s", upload_id, key, reason)
+            return jsonify({"error": reason, "uploadId": upload_id}), 422
+
+        cur.execute(
+            """
+            UPDATE uploads SET status='verified', actual_bytes=%s, generation=%s, completed_at=now(), error=NULL
+            WHERE id=%s;
+            """,
+            (blob.size, blob.generation, upload_id),
+        )
+        conn.commit()
+        logger.info("[uploads] verified id=%s key=%s bytes=%s", upload_id, key, blob.size)
+        return jsonify({"status": "ok", "uploadId": upload_id,
+                        "publicUrl": pinned_upload_url(key, blob.generation), "bytes": blob.size})
+    except Exception as e:
+        conn.rollback()
+        logger.exception("[uploads] complete failed id=%s", upload_id)
+        return jsonify({"error": str(e)}), 500
+    finally:
+        conn.close()
+
 @app.post("/debug/direct-upload")
 def debug_direct_upload():
     try:
@@ -1569,6 +3550,12 @@ def migrate():
               notes TEXT
             );
         """)
+        # Persisted slug for the /pub venue pages: backfill rows that predate it, then index.
+        cur.execute("ALTER TABLE venues ADD COLUMN IF NOT EXISTS slug TEXT;")
+        cur.execute("SELECT id, name FROM venues WHERE slug IS NULL ORDER BY id;")
+        for venue_id, venue_name in cur.fetchall():
+            assign_venue_slug(cur, venue_id, venue_name)
+        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_venues_slug ON venues(slug);")
         cur.execute("""
             CREATE TABLE IF NOT EXISTS tournament_weeks (
               id SERIAL PRIMARY KEY,
@@ -1642,17 +3629,47 @@ def migrate():
               parsed_json JSONB,
               status TEXT,
               error TEXT,
+              extract_meta JSONB,
+              pdf_sha256 TEXT,
+              parser_engine TEXT,
               created_at TIMESTAMP DEFAULT now()
             );
         """)
+        cur.execute("ALTER TABLE event_parse_log ADD COLUMN IF NOT EXISTS extract_meta JSONB;")
+        cur.execute("ALTER TABLE event_parse_log ADD COLUMN IF NOT EXISTS pdf_sha256 TEXT;")
+        cur.execute("ALTER TABLE event_parse_log ADD COLUMN IF NOT EXISTS parser_engine TEXT;")
+
+        # --- Extraction/parse caches (see load_pdf_text / parse_text_cached) ---
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS pdf_text_cache (
+              sha256 TEXT PRIMARY KEY,
+              source_url TEXT,
+              validator TEXT,
+              raw_text_gz BYTEA NOT NULL,
+              extract_meta JSONB,
+              byte_size INTEGER,
+              created_at TIMESTAMP DEFAULT now(),
+              last_used_at TIMESTAMP DEFAULT now()
+            );
+        """)
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_pdf_text_cache_source ON pdf_text_cache(source_url, validator);")
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS pdf_parse_cache (
+              sha256 TEXT NOT NULL,
+              parser_version TEXT NOT NULL,
+              parsed_json JSONB NOT NULL,
+              created_at TIMESTAMP DEFAULT now(),
+              PRIMARY KEY (sha256, parser_version)
+            );
+        """)
 
         # --- Final Tournament Scores Table (Connects multiple tables) ---
         cur.execute("""
             CREATE TABLE IF NOT EXISTS tournament_team_scores (
               id SERIAL PRIMARY KEY,
-              tournament_team_id INTEGER UNIQUE NOT NULL REFERENCES tournament_teams(id) ON DELETE CASCADE,
-              venue_id INTEGER UNIQUE NOT NULL REFERENCES venues(id) ON DELETE CASCADE,
-              week_id INTEGER UNIQUE NOT NULL REFERENCES tournament_weeks(id) ON DELETE CASCADE,
+              tournament_team_id INTEGER NOT NULL REFERENCES tournament_teams(id) ON DELETE CASCADE,
+              venue_id INTEGER NOT NULL REFERENCES venues(id) ON DELETE CASCADE,
+              week_id INTEGER NOT NULL REFERENCES tournament_weeks(id) ON DELETE CASCADE,
               event_id INTEGER REFERENCES events(id) ON DELETE SET NULL,
               points INTEGER DEFAULT 0,
               num_players INTEGER,
@@ -1665,11 +3682,157 @@ def migrate():
 
         # --- Indexes for Performance (PostgreSQL creates unique indexes for PRIMARY KEY and UNIQUE constraints automatically) ---
         cur.execute("CREATE INDEX IF NOT EXISTS idx_event_photos_event ON event_photos(event_id);")
+        # /events keyset paging: (event_date, id) newest first, optionally within status / host.
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_events_date_id ON events(event_date DESC, id DESC);")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_events_status_date_id ON events(status, event_date DESC, id DESC);")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_events_host_date_id ON events(host_id, event_date DESC, id DESC);")
+        # /public/events: only posted events with an FB link, in keyset order.
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_events_public_posted ON events(event_date DESC, id DESC)
+            INCLUDE (venue_id) WHERE status = 'posted' AND fb_event_url IS NOT NULL;
+        """)
+        cur.execute("ALTER TABLE event_photos ADD COLUMN IF NOT EXISTS thumb_url TEXT;")
+        cur.execute("ALTER TABLE event_photos ADD COLUMN IF NOT EXISTS web_url TEXT;")
+        cur.execute("ALTER TABLE event_photos ADD COLUMN IF NOT EXISTS width INTEGER;")
+        cur.execute("ALTER TABLE event_photos ADD COLUMN IF NOT EXISTS height INTEGER;")
+        cur.execute("ALTER TABLE event_photos ADD COLUMN IF NOT EXISTS derived_at TIMESTAMPTZ;")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_event_participation_event_pos ON event_participation(event_id, position);")
+        # Bulk uploads resolve names case-insensitively in one join per entity.
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_tournament_teams_lower_name ON tournament_teams(lower(name));")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_hosts_lower_name ON hosts(lower(name));")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_venues_lower_name ON venues(lower(name));")
+        # Fuzzy name matching (name_candidates). Optional: without pg_trgm it falls back to difflib.
+        cur.execute("SAVEPOINT name_trgm;")
+        try:
+            cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+            for table in NAME_TABLES:
+                cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_name_trgm ON {table} USING gin (lower(name) gin_trgm_ops);")
+            # Admin search boxes also match emails (search_patterns)
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_hosts_email_trgm ON hosts USING gin (lower(email) gin_trgm_ops);")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_tournament_teams_captain_email_trgm ON tournament_teams USING gin (lower(captain_email) gin_trgm_ops);")
+            cur.execute("RELEASE SAVEPOINT name_trgm;")
+        except Exception:
+            cur.execute("ROLLBACK TO SAVEPOINT name_trgm;")
+            logger.warning("pg_trgm not available; fuzzy name matching will use difflib", exc_info=True)
         cur.execute("CREATE INDEX IF NOT EXISTS idx_tts_team_week ON tournament_team_scores(tournament_team_id, week_id);")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_tts_venue_week ON tournament_team_scores(venue_id, week_id);")
+        # Older schemas made each of these columns UNIQUE on its own (one score per team, ever);
+        # only the (team, venue, week) key is intended.
+        for column in ("tournament_team_id", "venue_id", "week_id"):
+            cur.execute(f"ALTER TABLE tournament_team_scores DROP CONSTRAINT IF EXISTS tournament_team_scores_{column}_key;")
+
+        # --- Background jobs (see JobQueue) ---
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+              id BIGSERIAL PRIMARY KEY,
+              kind TEXT NOT NULL,
+              payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+              idempotency_key TEXT,
+              status TEXT NOT NULL DEFAULT 'queued',
+              attempts INTEGER NOT NULL DEFAULT 0,
+              max_attempts INTEGER NOT NULL DEFAULT 3,
+              run_after TIMESTAMPTZ NOT NULL DEFAULT now(),
+              last_error TEXT,
+              result JSONB,
+              locked_at TIMESTAMPTZ,
+              locked_by TEXT,
+              created_at TIMESTAMPTZ DEFAULT now(),
+              updated_at TIMESTAMPTZ DEFAULT now(),
+              started_at TIMESTAMPTZ,
+              finished_at TIMESTAMPTZ
+            );
+        """)
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(run_after, id) WHERE status = 'queued';")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_running_key ON jobs(idempotency_key) WHERE status = 'running';")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs(status, created_at DESC);")
+        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_jobs_queued_key ON jobs(idempotency_key) WHERE status = 'queued';")
+
+        # --- Direct-to-GCS upload sessions (POST /uploads, /uploads/<id>/complete) ---
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS uploads (
+              id BIGSERIAL PRIMARY KEY,
+              object_key TEXT UNIQUE NOT NULL,
+              kind TEXT NOT NULL,
+              content_type TEXT NOT NULL,
+              declared_bytes BIGINT,
+              actual_bytes BIGINT,
+              generation BIGINT,
+              status TEXT NOT NULL DEFAULT 'pending',
+              error TEXT,
+              created_by_user_id INTEGER REFERENCES users(id) ON DELETE SET NULL,
+              created_at TIMESTAMPTZ DEFAULT now(),
+              expires_at TIMESTAMPTZ,
+              completed_at TIMESTAMPTZ
+            );
+        """)
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_uploads_pending ON uploads(created_at) WHERE status = 'pending';")
+
+        # --- Denormalized per-event top teams + totals (refresh_event_summaries) ---
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS event_summaries (
+              event_id INTEGER PRIMARY KEY REFERENCES events(id) ON DELETE CASCADE,
+              top_teams JSONB NOT NULL DEFAULT '[]'::jsonb,
+              total_teams INTEGER NOT NULL DEFAULT 0,
+              total_players INTEGER NOT NULL DEFAULT 0,
+              updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
+        """)
+
+        # --- Tournament standings rollup (refresh_tournament_standings) ---
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS tournament_standings (
+              venue_id INTEGER NOT NULL REFERENCES venues(id) ON DELETE CASCADE,
+              week_id INTEGER NOT NULL REFERENCES tournament_weeks(id) ON DELETE CASCADE,
+              tournament_team_id INTEGER NOT NULL REFERENCES tournament_teams(id) ON DELETE CASCADE,
+              week_ending DATE NOT NULL,
+              week_points INTEGER NOT NULL DEFAULT 0,
+              total_points INTEGER NOT NULL DEFAULT 0,
+              rank INTEGER NOT NULL,
+              prev_rank INTEGER,
+              updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+              PRIMARY KEY (venue_id, week_id, tournament_team_id)
+            );
+        """)
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_tournament_standings_venue_week ON tournament_standings(venue_id, week_ending DESC);")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_tournament_standings_team_week ON tournament_standings(tournament_team_id, week_id);")
+
+        # --- Per-table change counters for public response caching (@public_cached) ---
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS data_version (
+              scope TEXT PRIMARY KEY,
+              version BIGINT NOT NULL DEFAULT 1,
+              updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
+        """)
+        cur.execute("""
+            CREATE OR REPLACE FUNCTION bump_data_version() RETURNS trigger AS $$
+            BEGIN
+              INSERT INTO data_version (scope) VALUES (TG_TABLE_NAME)
+              ON CONFLICT (scope) DO UPDATE
+                SET version = data_version.version + 1, updated_at = now();
+              RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+        """)
+        for table in VERSIONED_TABLES:
+            cur.execute("INSERT INTO data_version (scope) VALUES (%s) ON CONFLICT (scope) DO NOTHING;", (table,))
+            cur.execute(f"""
+                CREATE OR REPLACE TRIGGER trg_data_version_{table}
+                AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+                FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+            """)
+        # Not public-cached, but cached auth entries check this scope. Only the columns the
+        # auth cache holds, so routine last_login/photo writes don't flush every session.
+        cur.execute("INSERT INTO data_version (scope) VALUES ('users') ON CONFLICT (scope) DO NOTHING;")
+        cur.execute("""
+            CREATE OR REPLACE TRIGGER trg_data_version_users
+            AFTER UPDATE OF first_name, last_name, display_name, role, is_active, host_id
+               OR DELETE OR TRUNCATE ON users
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version();
+        """)
 
         conn.commit()
+        _trgm_state["available"] = None
         return jsonify({"status": "ok", "message": "Database schema created/verified successfully."})
     except Exception as e:
         conn.rollback()
@@ -1692,7 +3855,20 @@ def doctor():
             conn.close()
         else:
             val = 1
-        return jsonify({"status": "ok", "db": val})
+        return jsonify({
+            "status": "ok",
+            "db": val,
+            "db_pool": _db_pool.stats(),
+            "auth_cache": _auth_cache.stats(),
+            "activity_log": _activity_writer.stats(),
+            "jobs": _job_queue.stats(),
+            "pdf_extract": _pdf_extractor.stats(),
+            "outbound_http": http_client.stats(),
+            "photo_derivatives": {"pillow": photo_derivs.HAVE_PIL, "heic": photo_derivs.HAVE_HEIF},
+            "public_cache": dict(_response_cache.stats(), data_versions=_data_versions.stats()),
+            "ref_cache": _ref_cache.stats(),
+            "name_match": {"pg_trgm": _trgm_state["available"]},
+        })
     except Exception as e:
         logger.exception("doctor failed")
         return jsonify({"status": "error", "message": str(e)}), 500
@@ -1706,14 +3882,7 @@ def get_hosts():
     if auth_error:
         return auth_error
     
-    conn = getconn()
-    try:
-        cur = conn.cursor()
-        cur.execute("SELECT id, name FROM hosts ORDER BY name;")
-        rows = cur.fetchall()
-        return jsonify([{"id": r[0], "name": r[1]} for r in rows])
-    finally:
-        conn.close()
+    return jsonify([{"id": r[0], "name": r[1]} for r in ref_hosts()])
 
 @app.get("/venues")
 def list_venues():
@@ -1725,31 +3894,20 @@ def list_venues():
     if auth_error:
         return auth_error
     
-    conn = getconn()
-    try:
-        cur = conn.cursor()
-        # UPDATED: Added WHERE is_active = TRUE
-        cur.execute("""
-            SELECT id, name, default_day, default_time, default_host_id, show_type, notes
-            FROM venues 
-            WHERE is_active = TRUE 
-            ORDER BY name
-        """)
-        
-        venues = []
-        for r in cur.fetchall():
-            venues.append({
-                "id": r[0],
-                "name": r[1],
-                "default_day": r[2],
-                "default_time": r[3],
-                "default_host_id": r[4],
-                "show_type": r[5],
-                "notes": r[6]
-            })
-        return jsonify(venues)
-    finally:
-        conn.close()
+    venues = []
+    for r in ref_venues():
+        if r[5] is not True:  # is_active
+            continue
+        venues.append({
+            "id": r[0],
+            "name": r[1],
+            "default_day": r[2],
+            "default_time": r[3],
+            "default_host_id": r[6],
+            "show_type": r[7],
+            "notes": r[8]
+        })
+    return jsonify(venues)
         
 @app.get("/venues/<int:vid>/recent-photos")
 def get_venue_recent_photos(vid):
@@ -1782,13 +3940,14 @@ def get_venue_recent_photos(vid):
         most_recent_event_id = result[0]
 
         # Now get all photos for that event
-        cur.execute("SELECT photo_url FROM event_photos WHERE event_id=%s ORDER BY id;", (most_recent_event_id,))
-        photos = [r[0] for r in cur.fetchall()]
+        cur.execute("SELECT photo_url, thumb_url FROM event_photos WHERE event_id=%s ORDER BY id;", (most_recent_event_id,))
+        rows = cur.fetchall()
 
         conn.close()
         return jsonify({
             "eventId": most_recent_event_id,
-            "photoUrls": photos
+            "photoUrls": [r[0] for r in rows],
+            "thumbUrls": [r[1] or r[0] for r in rows],
         })
     except Exception as e:
         logger.exception("get_venue_recent_photos failed")
@@ -1799,6 +3958,224 @@ def get_venue_recent_photos(vid):
             pass
         return jsonify({"error": str(e)}), 500
 
+ZIP_PREFETCH = int(os.getenv("ZIP_PREFETCH", "4"))
+# Photos are buffered whole until their turn in the ZIP; this caps the bytes held across
+# all prefetched photos (a single larger photo still goes through on its own).
+ZIP_PREFETCH_BYTES = int(os.getenv("ZIP_PREFETCH_BYTES", str(24 * 1024 * 1024)))
+ZIP_CHUNK_BYTES = 64 * 1024
+# Already-compressed formats: deflating them burns CPU for ~0% gain.
+ZIP_STORED_EXTS = {"jpg", "jpeg", "png", "webp", "heic", "heif", "gif"}
+
+class _ZipSink:
+    """Write-only, non-seekable buffer; zipfile then emits data descriptors (streaming mode)."""
+    def __init__(self):
+        self._buf = bytearray()
+        self._pos = 0
+
+    def write(self, b):
+        self._buf += b
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self):
+        return self._pos
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        out = bytes(self._buf)
+        self._buf.clear()
+        return out
+
+class ZipStreamWriter:
+    """
+    Incremental ZIP writer: add() yields the local header + file data (+ data descriptor)
+    as it is written, close() returns the central directory. The writer itself holds at
+    most one chunk; the caller's `parts` decide how much of a file is in memory.
+    """
+    def __init__(self):
+        self._sink = _ZipSink()
+        self._zf = zipfile.ZipFile(self._sink, mode="w", compression=zipfile.ZIP_DEFLATED)
+        self._names = set()
+
+    def _unique(self, name):
+        base, dot, ext = name.rpartition(".")
+        if not dot:
+            base, ext = name, ""
+        candidate, n = name, 2
+        while candidate in self._names:
+            candidate = f"{base}-{n}.{ext}" if ext else f"{base}-{n}"
+            n += 1
+        self._names.add(candidate)
+        return candidate
+
+    def add(self, name, parts):
+        name = self._unique(name)
+        zinfo = zipfile.ZipInfo(name, date_time=time.localtime(time.time())[:6])
+        ext = name.rsplit(".", 1)[-1].lower() if "." in name else ""
+        zinfo.compress_type = zipfile.ZIP_STORED if ext in ZIP_STORED_EXTS else zipfile.ZIP_DEFLATED
+        zinfo.external_attr = 0o644 << 16
+        with self._zf.open(zinfo, mode="w") as w:
+            for part in parts:
+                w.write(part)
+                out = self._sink.drain()
+                if out:
+                    yield out
+        out = self._sink.drain()
+        if out:
+            yield out
+
+    def close(self):
+        self._zf.close()
+        return self._sink.drain()
+
+def photo_zip_name(url):
+    fname = url.split('?')[0].split('/')[-1] or f"photo_{uuid4().hex[:8]}.jpg"
+    return re.sub(r'[^\w\.-]', '_', fname)
+
+class _ByteBudget:
+    """Bytes of downloaded-but-not-yet-zipped photo data allowed in memory at once."""
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self.closed = False
+        self._cond = threading.Condition()
+
+    def acquire(self, n):
+        """Block until `n` more bytes fit (alone, anything fits). False once closed."""
+        with self._cond:
+            while not self.closed and self.used and self.used + n > self.limit:
+                self._cond.wait()
+            if self.closed:
+                return False
+            self.used += n
+            return True
+
+    def release(self, n):
+        with self._cond:
+            self.used -= n
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+def _download_photo(url, max_file_bytes, budget, memory):
+    """
+    Stream one photo into a list of chunks, aborting as soon as it exceeds the per-file cap
+    or the remaining ZIP budget (budget() is re-read per chunk). Before reading, reserves the
+    photo's size (or max_file_bytes when unknown) from `memory`. Returns (parts, reserved),
+    or None on skip/failure with nothing left reserved.
+    """
+    reserved = 0
+    try:
+        if gcs_object_for_url(url):
+            try:
+                blob = gcs_get_blob(url)
+                if blob is None or (blob.size or 0) > max_file_bytes or (blob.size or 0) > budget():
+                    return None
+                if not memory.acquire(blob.size or 0):
+                    return None
+                reserved = blob.size or 0
+                parts = list(iter_gcs_blob(blob, chunk_size=GCS_READ_CHUNK_BYTES,
+                                           max_bytes=min(max_file_bytes, budget())))
+                if not parts:
+                    return None
+                result, reserved = (parts, reserved), 0  # the consumer releases it now
+                return result
+            except Exception as e:
+                logger.warning(f"Error reading {url} from GCS: {e}")
+                return None
+
+        r = None
+        try:
+            r = httpx.get(url, stream=True, timeout=20)
+            r.raise_for_status()
+            clen = int(r.headers.get('Content-Length') or 0)
+            if clen > max_file_bytes or clen > budget():
+                return None
+            if not memory.acquire(clen or max_file_bytes):
+                return None
+            reserved = clen or max_file_bytes
+            parts, size = [], 0
+            for part in r.iter_content(ZIP_CHUNK_BYTES):
+                if not part:
+                    continue
+                size += len(part)
+                if size > max_file_bytes or size > budget():
+                    return None
+                parts.append(part)
+            if not size:
+                return None
+            result, reserved = (parts, reserved), 0  # the consumer releases it now
+            return result
+        except Exception as e:
+            logger.warning(f"Error downloading {url}: {e}")
+            return None
+        finally:
+            if r is not None:
+                try:
+                    r.close()
+                except Exception:
+                    pass
+    finally:
+        if reserved:
+            memory.release(reserved)
+
+def stream_photo_downloads(urls, max_file_bytes, max_total_bytes, prefetch=None, prefetch_bytes=None):
+    """
+    Generator of (url, chunks) in completion order, with at most `prefetch` downloads in
+    flight and at most `prefetch_bytes` buffered across them (one photo larger than that
+    still goes through alone), so peak memory is about max(prefetch_bytes, max_file_bytes).
+    A photo's bytes are released when the consumer asks for the next one. Stops once the
+    next photo would push the total past max_total_bytes. Closing the generator cancels
+    pending downloads.
+    """
+    prefetch = max(1, prefetch or ZIP_PREFETCH)
+    memory = _ByteBudget(prefetch_bytes or ZIP_PREFETCH_BYTES)
+    emitted = 0
+    budget = lambda: max_total_bytes - emitted
+    pending_urls = iter(urls)
+    in_flight = set()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=prefetch, thread_name_prefix="zip-fetch")
+    futures_url = {}
+    try:
+        def refill():
+            while len(in_flight) < prefetch:
+                url = next(pending_urls, None)
+                if url is None:
+                    return
+                fut = executor.submit(_download_photo, url, max_file_bytes, budget, memory)
+                futures_url[fut] = url
+                in_flight.add(fut)
+
+        refill()
+        while in_flight:
+            done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+            for fut in done:
+                in_flight.discard(fut)
+                result = fut.result()
+                if not result:
+                    continue
+                parts, reserved = result
+                try:
+                    size = sum(len(p) for p in parts)
+                    if emitted + size > max_total_bytes:
+                        logger.warning(f"Hit ZIP limit ({max_total_bytes}). Stopping.")
+                        return
+                    emitted += size
+                    yield futures_url[fut], parts
+                finally:
+                    memory.release(reserved)
+            refill()
+    finally:
+        memory.close()
+        for fut in in_flight:
+            fut.cancel()
+        executor.shutdown(wait=False)
+
 @app.get("/venues/<int:venue_id>/recent-photos-zip")
 def get_venue_recent_photos_zip(venue_id):
     """
@@ -1811,7 +4188,6 @@ def get_venue_recent_photos_zip(venue_id):
         return auth_error
     
     conn = getconn()
-    temp_zip_path = None
     
     try:
         cur = conn.cursor()
@@ -1851,6 +4227,14 @@ def get_venue_recent_photos_zip(venue_id):
             total_photos = len(photos)
             total_packs = math.ceil(total_photos / PER_PAGE)
             packs = []
+
+            # Previews use the thumbnail derivative where one exists (originals are up to 20 MB).
+            preview_urls = [u for i in range(0, total_photos, PER_PAGE) for u in photos[i:i + 3]]
+            cur.execute("""
+                SELECT photo_url, thumb_url FROM event_photos
+                WHERE photo_url = ANY(%s) AND thumb_url IS NOT NULL;
+            """, (preview_urls,))
+            thumb_for = {r[0]: r[1] for r in cur.fetchall()}
             
             for i in range(total_packs):
                 p_num = i + 1
@@ -1859,7 +4243,7 @@ def get_venue_recent_photos_zip(venue_id):
                 slice_len = len(photos[start:end])
                 
                 # Preview images (first 3 of the pack) for the UI
-                previews = photos[start : start+3]
+                previews = [thumb_for.get(u, u) for u in photos[start : start+3]]
                 
                 packs.append({
                     "part": p_num,
@@ -1891,77 +4275,23 @@ def get_venue_recent_photos_zip(venue_id):
         MAX_TOTAL_ZIP_BYTES = int(os.getenv('MAX_ZIP_BYTES', 100 * 1024 * 1024))
         MAX_FILE_BYTES = int(os.getenv('MAX_FILE_BYTES', 20 * 1024 * 1024))
 
-        # Create Temp File
-        tf = tempfile.NamedTemporaryFile(delete=False, suffix='.zip')
-        temp_zip_path = tf.name
-        tf.close()
-
-        # Threading checks
-        zip_lock = threading.Lock()
-        current_zip_size = 0
-        stop_flag = False
-        files_added = 0
-
-        def process_photo(url):
-            nonlocal current_zip_size, stop_flag, files_added
-            if stop_flag: return
-            
-            try:
-                # HEAD check
-                with requests.head(url, timeout=5) as head:
-                    if head.status_code < 400:
-                        clen = int(head.headers.get('Content-Length', 0))
-                        if clen > MAX_FILE_BYTES: return
-                        if current_zip_size + clen > MAX_TOTAL_ZIP_BYTES:
-                            stop_flag = True
-                            return
-
-                # Download
-                with requests.get(url, timeout=20) as r:
-                    r.raise_for_status()
-                    content = r.content
-
-                if len(content) > MAX_FILE_BYTES: return
-
-                with zip_lock:
-                    if stop_flag: return
-                    if current_zip_size + len(content) > MAX_TOTAL_ZIP_BYTES:
-                        stop_flag = True
-                        logger.warning(f"Hit ZIP limit ({MAX_TOTAL_ZIP_BYTES}). Stopping.")
-                        return
-
-                    with zipfile.ZipFile(temp_zip_path, 'a', zipfile.ZIP_DEFLATED) as zf:
-                        fname = url.split('/')[-1] or f"photo_{uuid4()}.jpg"
-                        fname = re.sub(r'[^\w\.-]', '_', fname)
-                        zf.writestr(fname, content)
-                        
-                    current_zip_size += len(content)
-                    files_added += 1
-
-            except Exception as e:
-                logger.warning(f"Error processing {url}: {e}")
-
-        # Execute Parallel Downloads (Only for the 12 items in 'chunk')
-        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
-            with zipfile.ZipFile(temp_zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-                pass 
-            futures = [executor.submit(process_photo, u) for u in chunk]
-            concurrent.futures.wait(futures)
-
-        if files_added == 0:
-            if os.path.exists(temp_zip_path): os.remove(temp_zip_path)
+        # Photos download in parallel (at most ZIP_PREFETCH in flight) and are written to the
+        # ZIP as each one completes; the response starts as soon as the first photo is in.
+        photo_iter = stream_photo_downloads(chunk, MAX_FILE_BYTES, MAX_TOTAL_ZIP_BYTES)
+        first = next(photo_iter, None)
+        if first is None:
             return jsonify({"error": "Could not download any images."}), 413
 
-        # Stream Response
         def generate():
+            writer = ZipStreamWriter()
             try:
-                with open(temp_zip_path, 'rb') as f:
-                    while True:
-                        data = f.read(64 * 1024)
-                        if not data: break
-                        yield data
+                url, parts = first
+                yield from writer.add(photo_zip_name(url), parts)
+                for url, parts in photo_iter:
+                    yield from writer.add(photo_zip_name(url), parts)
+                yield writer.close()
             finally:
-                if os.path.exists(temp_zip_path): os.remove(temp_zip_path)
+                photo_iter.close()
 
         dl_name = f"{safe_venue_name}-RecentPhotos-Part{part_idx}.zip"
         headers = {
@@ -1972,38 +4302,164 @@ def get_venue_recent_photos_zip(venue_id):
         return Response(stream_with_context(generate()), mimetype='application/zip', headers=headers)
 
     except Exception as e:
-        if temp_zip_path and os.path.exists(temp_zip_path):
-            os.remove(temp_zip_path)
         logger.exception("get_venue_recent_photos_zip failed")
         return jsonify({"error": str(e)}), 500
     finally:
         if conn:
             conn.close()
     
+# ------------------------------------------------------------------------------
+# Name resolution (venues, hosts, tournament teams)
+# ------------------------------------------------------------------------------
+# Exact lookups compare lower(name) and use the idx_<table>_lower_name expression indexes.
+# Fuzzy lookups rank by pg_trgm similarity() over the GIN indexes on lower(name) that
+# /migrate installs; if the extension is missing they fall back to difflib in Python.
+NAME_TABLES = ("venues", "hosts", "tournament_teams")
+NAME_MATCH_MIN_SCORE = float(os.getenv("NAME_MATCH_MIN_SCORE", "0.3"))  # pg_trgm's own `%` cut-off is 0.3
+NAME_MATCH_ACCEPT_SCORE = float(os.getenv("NAME_MATCH_ACCEPT_SCORE", "0.5"))
+NAME_MATCH_MARGIN = 0.1  # a fuzzy winner must beat the runner-up by this much
+# Bulk team uploads bind HomeVenue with nobody reviewing each row, so they keep the
+# stricter cut-offs the upload always used (consider > 0.6, take at 0.7).
+BULK_VENUE_MATCH_MIN_SCORE = 0.6
+BULK_VENUE_MATCH_ACCEPT_SCORE = 0.7
+NAME_MATCH_TYPES = {"venues": "venues", "hosts": "hosts", "teams": "tournament_teams"}
+_trgm_state = {"available": None}  # None = not checked yet in this process
+
+def normalize_name(name):
+    """Lowercase, drop punctuation, collapse spaces: 'The Tap-Room!' -> 'the taproom'."""
+    return re.sub(r"\s+", " ", re.sub(r"[^a-z0-9\s]", "", (name or "").lower())).strip()
+
+def _name_table(table):
+    if table not in NAME_TABLES:
+        raise ValueError(f"unknown name table {table!r}")
+    return table
+
+def name_id(cur, table, name):
+    """Id of the row in `table` whose name equals `name` ignoring case, or None."""
+    cur.execute(f"SELECT id FROM {_name_table(table)} WHERE lower(name) = lower(%s) ORDER BY id LIMIT 1;", (name,))
+    r = cur.fetchone()
+    return r[0] if r else None
+
+def trgm_available(cur):
+    if _trgm_state["available"] is None:
+        cur.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm';")
+        _trgm_state["available"] = cur.fetchone() is not None
+    return _trgm_state["available"]
+
+def name_candidates(cur, table, query, limit=5, where=None, params=(), min_score=None):
+    """
+    Ranked matches for `query` in `table`: [{"id", "name", "score", "exact"}], best first.
+    `exact` means equal after normalize_name() and always ranks first. `where`/`params`
+    narrow the rows (e.g. venues on a given night).
+    """
+    min_score = NAME_MATCH_MIN_SCORE if min_score is None else min_score
+    q = (query or "").strip().lower()
+    if not q:
+        return []
+    table = _name_table(table)
+    extra = f" AND ({where})" if where else ""
+    if trgm_available(cur):
+        cur.execute(f"""
+            SELECT id, name, similarity(lower(name), %s) AS score
+            FROM {table}
+            WHERE lower(name) %% %s{extra}
+              AND similarity(lower(name), %s) >= %s
+            ORDER BY score DESC, name
+            LIMIT %s;
+        """, (q, q, *params, q, min_score, limit * 2))
+        rows = cur.fetchall()
+    else:
+        cur.execute(f"SELECT id, name FROM {table} WHERE TRUE{extra};", tuple(params))
+        q_norm = normalize_name(q)
+        rows = [(r[0], r[1], difflib.SequenceMatcher(None, q_norm, normalize_name(r[1])).ratio()) for r in cur.fetchall()]
+        rows = [r for r in rows if r[2] >= min_score]
+    q_norm = normalize_name(query)
+    out = [{"id": r[0], "name": r[1], "score": round(float(r[2]), 3), "exact": normalize_name(r[1]) == q_norm}
+           for r in rows]
+    out.sort(key=lambda c: (not c["exact"], -c["score"], c["name"] or ""))
+    return out[:limit]
+
+def pick_name_match(candidates, accept=None, margin=NAME_MATCH_MARGIN):
+    """
+    (best, ambiguous) from name_candidates() output. An exact match always wins; otherwise the
+    top candidate needs `accept` score and a `margin` lead. ambiguous lists the candidates
+    within `margin` of the top one when no winner could be picked for that reason.
+    """
+    accept = NAME_MATCH_ACCEPT_SCORE if accept is None else accept
+    if not candidates:
+        return None, []
+    best = candidates[0]
+    if best["exact"]:
+        return best, []
+    if best["score"] < accept:
+        return None, []
+    if len(candidates) > 1 and best["score"] - candidates[1]["score"] < margin:
+        return None, [c for c in candidates if best["score"] - c["score"] < margin]
+    return best, []
+
+def like_escape(text):
+    """Escape LIKE wildcards so user input matches literally (backslash is the default ESCAPE)."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def search_patterns(q):
+    """(exact, prefix, contains) lowercased LIKE patterns for a search box query."""
+    q = q.strip().lower()
+    esc = like_escape(q)
+    return q, esc + "%", "%" + esc + "%"
+
+def search_rank_sql(column):
+    """ORDER BY fragment: exact match, then prefix match, ahead of plain substring matches."""
+    return f"(lower({column}) = %s) DESC, (lower({column}) LIKE %s) DESC"
+
+def search_limit(default, maximum):
+    """?limit= clamped to 1..maximum; junk falls back to `default` instead of a 500."""
+    return max(1, min(request.args.get("limit", default, type=int), maximum))
+
+@app.get("/names/resolve")
+def resolve_name():
+    """
+    Match a typed name against existing records: ?type=venues|hosts|teams&q=...&limit=5.
+    Returns {"match": candidate or null, "ambiguous": bool, "candidates": [...]}.
+    """
+    auth_error = require_auth(required_roles=['host', 'admin'])
+    if auth_error:
+        return auth_error
+    table = NAME_MATCH_TYPES.get(request.args.get("type", "venues"))
+    if not table:
+        return jsonify({"error": f"type must be one of {', '.join(NAME_MATCH_TYPES)}"}), 400
+    q = request.args.get("q", "").strip()
+    limit = max(1, min(request.args.get("limit", 5, type=int), 25))
+    if not q:
+        return jsonify({"match": None, "ambiguous": False, "candidates": []})
+    conn = getconn()
+    try:
+        cur = conn.cursor()
+        candidates = name_candidates(cur, table, q, limit=limit)
+    finally:
+        conn.close()
+    best, ambiguous = pick_name_match(candidates)
+    return jsonify({"match": best, "ambiguous": bool(ambiguous), "candidates": candidates})
+
 # ------------------------------------------------------------------------------
 # Create Event
 # ------------------------------------------------------------------------------
 def resolve_host_venue(cur, host_name, venue_name):
+    """Ids for the named host and venue (case-insensitive), creating either if it doesn't exist."""
     host_id = None
     venue_id = None
 
     if host_name:
-        cur.execute("SELECT id FROM hosts WHERE lower(name)=lower(%s)", (host_name,))
-        r = cur.fetchone()
-        if r:
-            host_id = r[0]
-        else:
+        host_id = name_id(cur, "hosts", host_name)
+        if host_id is None:
             cur.execute("INSERT INTO hosts (name) VALUES (%s) RETURNING id;", (host_name,))
             host_id = cur.fetchone()[0]
 
     if venue_name:
-        cur.execute("SELECT id FROM venues WHERE lower(name)=lower(%s)", (venue_name,))
-        r = cur.fetchone()
-        if r:
-            venue_id = r[0]
-        else:
+        venue_id = name_id(cur, "venues", venue_name)
+        if venue_id is None:
             cur.execute("INSERT INTO venues (name) VALUES (%s) RETURNING id;", (venue_name,))
             venue_id = cur.fetchone()[0]
+            assign_venue_slug(cur, venue_id, venue_name)
 
     return host_id, venue_id
 
@@ -2039,23 +4495,21 @@ def create_event():
     try:
         cur = conn.cursor()
 
-        if not host_id and host_name:
-            cur.execute("SELECT id FROM hosts WHERE lower(name)=lower(%s)", (host_name,))
-            r = cur.fetchone()
-            if r:
-                host_id = r[0]
-            else:
-                cur.execute("INSERT INTO hosts (name) VALUES (%s) RETURNING id", (host_name,))
-                host_id = cur.fetchone()[0]
-
-        if not venue_id and venue_name:
-            cur.execute("SELECT id FROM venues WHERE lower(name)=lower(%s)", (venue_name,))
-            r = cur.fetchone()
-            if r:
-                venue_id = r[0]
-            else:
-                cur.execute("INSERT INTO venues (name) VALUES (%s) RETURNING id", (venue_name,))
-                venue_id = cur.fetchone()[0]
+        pending = unverified_upload_urls(cur, ([pdf_url] if pdf_url else []) + list(photo_urls))
+        if pending:
+            return jsonify({
+                "error": "Uploads not verified; call POST /uploads/<id>/complete first",
+                "unverified": pending,
+            }), 409
+        pinned = pin_upload_urls(cur, ([pdf_url] if pdf_url else []) + list(photo_urls))
+        pdf_url = pinned.get(pdf_url, pdf_url)
+        photo_urls = [pinned.get(u, u) for u in photo_urls]
+
+        resolved_host_id, resolved_venue_id = resolve_host_venue(
+            cur, None if host_id else host_name, None if venue_id else venue_name
+        )
+        host_id = host_id or resolved_host_id
+        venue_id = venue_id or resolved_venue_id
 
         # Get user info for tracking (if authenticated)
         user = getattr(request, 'user', None)
@@ -2085,6 +4539,7 @@ def create_event():
         )
         event_id = cur.fetchone()[0]
 
+        new_photo_ids = []
         for url in set(photo_urls):
             cur.execute(
                 """
@@ -2092,39 +4547,36 @@ def create_event():
                 SELECT %s, %s, %s
                 WHERE NOT EXISTS (
                     SELECT 1 FROM event_photos WHERE event_id=%s AND photo_url=%s
-                );
+                )
+                RETURNING id;
                 """,
                 (event_id, url, user_id, event_id, url),
             )
+            new_photo_ids.extend(r[0] for r in cur.fetchall())
+        deriv_job_ids = enqueue_photo_derivatives(cur, new_photo_ids)
+
+        # Parse runs on the job workers; enqueued in the same transaction so an event
+        # is never committed without its parse job (or vice versa).
+        parse_job_id = None
+        if pdf_url:
+            parse_job_id = _job_queue.enqueue(
+                "parse_pdf", {"event_id": event_id}, idempotency_key=f"parse_pdf:{event_id}", cur=cur
+            )
 
         conn.commit()
         logger.info("Event created id=%s pdf=%s photos=%s show_type=%s by_user=%s", 
                    event_id, bool(pdf_url), len(photo_urls), show_type, user_email or 'legacy')
+        if parse_job_id or deriv_job_ids:
+            _job_queue.notify()
 
         # Log activity
         if user_id:
             log_user_activity(user_id, 'create_event', 'event', event_id)
 
-        try:
-            if pdf_url:
-                # Use current request context to determine host/scheme for the internal call.
-                # Pass authentication headers forward so the sub-request is authorized.
-                target_url = f"{request.scheme}://{request.host}/events/{event_id}/parse-pdf"
-                headers = {}
-                if 'Authorization' in request.headers:
-                    headers['Authorization'] = request.headers['Authorization']
-                elif 'X-GSP-Token' in request.headers:
-                    headers['X-GSP-Token'] = request.headers['X-GSP-Token']
-                elif HOST_TOKEN:
-                    headers['X-GSP-Token'] = HOST_TOKEN
-
-                requests.post(target_url, headers=headers, timeout=2)
-        except Exception as te:
-            logger.warning("Parse trigger failed for event %s: %s", event_id, te)
-
         return jsonify({
             "status": "ok",
             "eventId": event_id,
+            "parseJobId": parse_job_id,
             "publicUrl": f"{PUBLIC_BASE}/host-event.html?id={event_id}",
         })
     except Exception as e:
@@ -2137,8 +4589,59 @@ def create_event():
 # ------------------------------------------------------------------------------
 # Events list/detail/status
 # ------------------------------------------------------------------------------
+def encode_cursor(*values):
+    """Opaque keyset cursor token for the last row of a page (dates as ISO strings)."""
+    raw = json.dumps([v.isoformat() if isinstance(v, (date, datetime)) else v for v in values],
+                     separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def cursor_int(value):
+    """Strict int parser for decode_cursor (rejects strings, floats and bools)."""
+    if type(value) is not int:
+        raise ValueError("not an int")
+    return value
+
+def decode_cursor(token, *parsers):
+    """
+    Inverse of encode_cursor, one parser per value (e.g. date.fromisoformat, cursor_int).
+    Raises ValueError("invalid cursor") for anything that doesn't parse, so a tampered
+    token is a 400 rather than a 500 from int() or from Postgres.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode("utf-8"))
+    except Exception:
+        raise ValueError("invalid cursor")
+    if not isinstance(values, list) or len(values) != len(parsers):
+        raise ValueError("invalid cursor")
+    try:
+        return tuple(parse(v) for parse, v in zip(parsers, values))
+    except (TypeError, ValueError):
+        raise ValueError("invalid cursor")
+
+# field -> (SELECT expression, needs join, serializer). The first six are the legacy payload.
+EVENT_LIST_FIELDS = {
+    "id": ("e.id", None, lambda v: v),
+    "date": ("e.event_date", None, lambda v: v.isoformat() if v else None),
+    "status": ("e.status", None, lambda v: v),
+    "host": ("h.name", "h", lambda v: v),
+    "venue": ("v.name", "v", lambda v: v),
+    "is_validated": ("e.is_validated", None, lambda v: v),
+    "host_id": ("e.host_id", None, lambda v: v),
+    "venue_id": ("e.venue_id", None, lambda v: v),
+    "show_type": ("e.show_type", None, lambda v: v),
+}
+EVENT_LIST_DEFAULT_FIELDS = ("id", "date", "status", "host", "venue", "is_validated")
+EVENT_LIST_MAX_LIMIT = 500
+
 @app.get("/events")
 def list_events():
+    """
+    Events newest first. Filters: status, is_validated, host_id, venue_id, show_type,
+    date_from/date_to (YYYY-MM-DD, inclusive); fields=comma list picks the keys returned.
+    Paging is keyset on (event_date, id): pass limit (max 500) and then the X-Next-Cursor
+    response header as ?cursor= for the following page. Without limit/cursor the whole
+    filtered list is returned, as before.
+    """
     auth_error = require_auth()
     if auth_error:
         return auth_error
@@ -2147,124 +4650,187 @@ def list_events():
     # NEW: is_validated_filter is only applied if explicitly requested, not automatically with `status`
     # This allows hosts to see all their events, regardless of validation status.
     is_validated_param = request.args.get("is_validated") # Can be "true", "false", or absent
-    
+
+    fields = [f.strip() for f in (request.args.get("fields") or "").split(",") if f.strip()]
+    unknown = [f for f in fields if f not in EVENT_LIST_FIELDS]
+    if unknown:
+        return jsonify({"error": f"Unknown fields: {', '.join(unknown)}",
+                        "allowed": sorted(EVENT_LIST_FIELDS)}), 400
+    fields = fields or list(EVENT_LIST_DEFAULT_FIELDS)
+
+    cursor = request.args.get("cursor")
+    limit = request.args.get("limit", type=int)
+    try:
+        after = decode_cursor(cursor, date.fromisoformat, cursor_int) if cursor else None
+        date_from = date.fromisoformat(request.args["date_from"]) if request.args.get("date_from") else None
+        date_to = date.fromisoformat(request.args["date_to"]) if request.args.get("date_to") else None
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    if limit is not None or after is not None:
+        limit = max(1, min(limit or 100, EVENT_LIST_MAX_LIMIT))
+
+    joins = {EVENT_LIST_FIELDS[f][1] for f in fields} - {None}
+    select = [EVENT_LIST_FIELDS[f][0] for f in fields] + ["e.event_date", "e.id"]
+    query_parts = f"SELECT {', '.join(select)} FROM events e"
+    if "h" in joins:
+        query_parts += " LEFT JOIN hosts h ON e.host_id=h.id"
+    if "v" in joins:
+        query_parts += " LEFT JOIN venues v ON e.venue_id=v.id"
+    params = []
+    where_clauses = []
+
+    if st:
+        where_clauses.append("e.status=%s")
+        params.append(st)
+
+    # Apply is_validated filter ONLY if it's explicitly requested in the query params
+    if is_validated_param is not None:
+        if is_validated_param.lower() == "true":
+            where_clauses.append("e.is_validated=TRUE")
+        elif is_validated_param.lower() == "false":
+            where_clauses.append("e.is_validated=FALSE")
+        # If param exists but is not "true"/"false", it won't add a clause.
+
+    for arg, clause in (("host_id", "e.host_id=%s"), ("venue_id", "e.venue_id=%s")):
+        value = request.args.get(arg, type=int)
+        if value is not None:
+            where_clauses.append(clause)
+            params.append(value)
+    if request.args.get("show_type"):
+        where_clauses.append("lower(e.show_type)=lower(%s)")
+        params.append(request.args["show_type"])
+    if date_from:
+        where_clauses.append("e.event_date >= %s")
+        params.append(date_from)
+    if date_to:
+        where_clauses.append("e.event_date <= %s")
+        params.append(date_to)
+    if after is not None:
+        where_clauses.append("(e.event_date, e.id) < (%s::date, %s)")
+        params.extend(after)
+
+    if where_clauses:
+        query_parts += " WHERE " + " AND ".join(where_clauses)
+    query_parts += " ORDER BY e.event_date DESC, e.id DESC"
+    if limit is not None:
+        query_parts += " LIMIT %s"
+        params.append(limit + 1)
+
     conn = getconn()
     try:
         cur = conn.cursor()
-        query_parts = """
-            SELECT e.id, e.event_date, e.status, h.name, v.name, e.is_validated
-            FROM events e
-            LEFT JOIN hosts h ON e.host_id=h.id
-            LEFT JOIN venues v ON e.venue_id=v.id
-        """
-        params = []
-        where_clauses = []
-
-        if st:
-            where_clauses.append("e.status=%s")
-            params.append(st)
-
-        # Apply is_validated filter ONLY if it's explicitly requested in the query params
-        if is_validated_param is not None:
-            if is_validated_param.lower() == "true":
-                where_clauses.append("e.is_validated=TRUE")
-            elif is_validated_param.lower() == "false":
-                where_clauses.append("e.is_validated=FALSE")
-            # If param exists but is not "true"/"false", it won't add a clause.
-
-        if where_clauses:
-            query_parts += " WHERE " + " AND ".join(where_clauses)
-        
-        query_parts += " ORDER BY e.event_date DESC;"
-        
-        cur.execute(query_parts, tuple(params))
+        cur.execute(query_parts + ";", tuple(params))
         rows = cur.fetchall()
-        return jsonify([{
-            "id": r[0],
-            "date": r[1].isoformat() if r[1] else None,
-            "status": r[2],
-            "host": r[3],
-            "venue": r[4],
-            "is_validated": r[5], # New field
-        } for r in rows])
     finally:
         conn.close()
 
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][-2], rows[-1][-1])
+    serializers = [EVENT_LIST_FIELDS[f][2] for f in fields]
+    resp = jsonify([{f: ser(r[i]) for i, (f, ser) in enumerate(zip(fields, serializers))} for r in rows])
+    if next_cursor:
+        resp.headers["X-Next-Cursor"] = next_cursor
+    return resp
+
+PUBLIC_EVENTS_MAX_LIMIT = 100
+EVENT_SUMMARY_TOP_POSITION = 3  # top_teams holds every team placed at or above this
+EVENT_SUMMARY_BATCH = 500
+
+def fetch_top_teams(cur, event_ids):
+    """{event_id: [{"team_name", "position"}, ...]} for positions 1-3, one query for the whole page."""
+    if not event_ids:
+        return {}
+    cur.execute("""
+        SELECT event_id, team_name, position
+        FROM event_participation
+        WHERE event_id = ANY(%s) AND position <= %s
+        ORDER BY event_id, position ASC, id ASC;
+    """, (list(event_ids), EVENT_SUMMARY_TOP_POSITION))
+    out = {}
+    for event_id, team_name, position in cur.fetchall():
+        out.setdefault(event_id, []).append({"team_name": team_name, "position": position})
+    return out
+
 @app.get("/public/events")
+@public_cached("events", "event_participation", "event_summaries", "venues")
 def list_public_events():
-    conn = getconn()
+    """
+    Posted events, newest first (array of events). Paging:
+      - keyset: follow the X-Next-Cursor response header with ?cursor=<token>
+      - legacy: ?offset=N still works for existing embeds (slower on deep pages)
+    """
     try:
-        try:
-            limit = int(request.args.get('limit', 50))
-            offset = int(request.args.get('offset', 0))
-            venue_id = request.args.get('venue_id') # Optional filter
-        except ValueError:
-            limit = 50
-            offset = 0
-            venue_id = None
-            
-        if limit > 100: limit = 100
+        limit = int(request.args.get('limit', 50))
+        offset = int(request.args.get('offset', 0))
+    except ValueError:
+        limit = 50
+        offset = 0
+    venue_id = request.args.get('venue_id', type=int) # Optional filter
+    limit = max(1, min(limit, PUBLIC_EVENTS_MAX_LIMIT))
+    cursor = request.args.get('cursor')
+    try:
+        after = decode_cursor(cursor, date.fromisoformat, cursor_int) if cursor else None
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    # Matches the partial index idx_events_public_posted.
+    where_clauses = ["e.status = 'posted'", "e.fb_event_url IS NOT NULL"]
+    params = []
+    if venue_id:
+        where_clauses.append("e.venue_id = %s")
+        params.append(venue_id)
+    if after is not None:
+        where_clauses.append("(e.event_date, e.id) < (%s::date, %s)")
+        params.extend(after)
+    page_sql = "LIMIT %s"
+    params.append(limit + 1)
+    if after is None and offset > 0:
+        page_sql += " OFFSET %s"
+        params.append(offset)
 
+    conn = getconn()
+    try:
         cur = conn.cursor()
-        
-        # Build the WHERE clause dynamically
-        where_clauses = ["e.status = 'posted'", "e.fb_event_url IS NOT NULL"]
-        params = []
-        
-        if venue_id:
-            where_clauses.append("e.venue_id = %s")
-            params.append(venue_id)
-            
-        # Add Limit/Offset parameters at the end
-        params.extend([limit, offset])
-        
-        where_sql = " AND ".join(where_clauses)
-
-        # SQL Query:
-        # 1. Joins events with venues/hosts.
-        # 2. Uses a lateral subquery (or correlated subquery) to get JSON array of top 3 teams.
-        #    This prevents N+1 queries and is very fast in Postgres.
-        query = f"""
+        cur.execute(f"""
             SELECT e.id,
                    e.event_date,
                    e.ai_recap,
                    e.fb_event_url,
                    v.name AS venue_name,
-                   (
-                       SELECT json_agg(t) FROM (
-                           SELECT team_name, position
-                           FROM event_participation ep
-                           WHERE ep.event_id = e.id AND ep.position <= 3
-                           ORDER BY ep.position ASC
-                       ) t
-                   ) AS top_teams
+                   s.top_teams
             FROM events e
             LEFT JOIN venues v ON e.venue_id = v.id
-            WHERE {where_sql}
-            ORDER BY e.event_date DESC
-            LIMIT %s OFFSET %s;
-        """
-        
-        cur.execute(query, tuple(params))
+            LEFT JOIN event_summaries s ON s.event_id = e.id
+            WHERE {" AND ".join(where_clauses)}
+            ORDER BY e.event_date DESC, e.id DESC
+            {page_sql};
+        """, tuple(params))
         rows = cur.fetchall()
-        
-        events = []
-        for row in rows:
-            events.append({
-                "id": row[0],
-                "date_display": row[1].strftime("%B %d, %Y") if row[1] else "TBA",
-                "ai_recap": row[2],
-                "fb_event_url": row[3],
-                "venue": row[4],
-                # If no teams found, row[5] might be None, so default to empty list
-                "top_teams": row[5] if row[5] else []
-            })
-        
-        return jsonify(events)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        # Events not backfilled into event_summaries yet fall back to the live rows.
+        top_teams = {r[0]: r[5] for r in rows if r[5] is not None}
+        top_teams.update(fetch_top_teams(cur, [r[0] for r in rows if r[5] is None]))
     finally:
         conn.close()
 
+    events = [{
+        "id": row[0],
+        "date_display": row[1].strftime("%B %d, %Y") if row[1] else "TBA",
+        "ai_recap": row[2],
+        "fb_event_url": row[3],
+        "venue": row[4],
+        "top_teams": top_teams.get(row[0], []),
+    } for row in rows]
+    resp = jsonify(events)
+    if has_more:
+        resp.headers["X-Next-Cursor"] = encode_cursor(rows[-1][1], rows[-1][0])
+    return resp
+
 @app.get("/public/venues/search")
+@public_cached("venues")
 def search_venues():
     """
     Returns a list of venues matching the search query.
@@ -2273,12 +4839,17 @@ def search_venues():
     query = request.args.get('q', '').strip()
     if not query:
         return jsonify([])
+    limit = search_limit(10, 20)
+    exact, prefix, like = search_patterns(query)
 
     conn = getconn()
     try:
         cur = conn.cursor()
-        # Case-insensitive search (ILIKE), limit 10 results
-        cur.execute("SELECT id, name FROM venues WHERE name ILIKE %s ORDER BY name LIMIT 10", (f'%{query}%',))
+        # Case-insensitive substring match (trigram index), names starting with the query first
+        cur.execute(f"""
+            SELECT id, name FROM venues WHERE lower(name) LIKE %s
+            ORDER BY {search_rank_sql('name')}, name LIMIT %s
+        """, (like, exact, prefix, limit))
         rows = cur.fetchall()
         return jsonify([{"id": r[0], "name": r[1]} for r in rows])
     finally:
@@ -2315,8 +4886,9 @@ def event_details(eid):
         if not e:
             return jsonify({"error": "not found"}), 404
 
-        cur.execute("SELECT photo_url FROM event_photos WHERE event_id=%s ORDER BY id;", (eid,))
-        photos = [r[0] for r in cur.fetchall()]
+        cur.execute("SELECT photo_url, thumb_url, web_url FROM event_photos WHERE event_id=%s ORDER BY id;", (eid,))
+        photo_rows = cur.fetchall()
+        photos = [r[0] for r in photo_rows]
 
         has_pdf = bool(e[3])
         has_ai = bool((e[4] or "").strip())
@@ -2337,6 +4909,7 @@ def event_details(eid):
             "venue_default_time": e[10],
             "is_validated": e[11], # NEW FIELD
             "photos": photos,
+            "photo_items": [{"url": r[0], "thumb_url": r[1], "web_url": r[2]} for r in photo_rows],
             "photo_count": len(photos),
             "has_pdf": has_pdf,
             "has_ai": has_ai,
@@ -2454,7 +5027,10 @@ def add_photo_to_event(eid):
             (eid, public_url, user_id),
         )
         photo_db_id = cur.fetchone()[0]
+        deriv_job_ids = enqueue_photo_derivatives(cur, [photo_db_id])
         conn.commit()
+        if deriv_job_ids:
+            _job_queue.notify()
         
         # Log activity
         if user_id:
@@ -2503,7 +5079,10 @@ def add_photo_by_url(eid):
             (eid, url, user_id),
         )
         pid = cur.fetchone()[0]
+        deriv_job_ids = enqueue_photo_derivatives(cur, [pid])
         conn.commit()
+        if deriv_job_ids:
+            _job_queue.notify()
         
         # Log activity
         if user_id:
@@ -2547,6 +5126,15 @@ def parse_pdf_for_event(eid):
     if auth_error:
         return auth_error
     
+    payload, status_code = run_event_pdf_parse(eid)
+    return jsonify(payload), status_code
+
+def run_event_pdf_parse(eid):
+    """
+    Download, extract and parse the event's PDF, then replace its participation rows
+    and AI recap. Used by the /events/<id>/parse-pdf route and the 'parse_pdf' job.
+    Returns (payload_dict, http_status).
+    """
     conn = getconn()
     try:
         cur = conn.cursor()
@@ -2562,83 +5150,61 @@ def parse_pdf_for_event(eid):
         """, (eid,))
         row = cur.fetchone()
         if not row:
-            return jsonify({"error": "event not found"}), 404
+            return {"error": "event not found"}, 404
 
         pdf_url = row[3]
         if not pdf_url:
-            return jsonify({"error": "event has no pdf_url"}), 400
+            return {"error": "event has no pdf_url"}, 400
 
-        pdf_bytes = fetch_pdf_bytes(pdf_url)
-        raw_text = safe_extract_text(pdf_bytes)
-        parsed = parse_raw_text(raw_text)
+        raw_text, extract_meta, cache_info = load_pdf_text(pdf_url)
+        parsed, parse_hit = parse_text_cached(cache_info["parse_key"], raw_text)
+        extract_meta = dict(extract_meta, text_cache=cache_info["text_cache"], parse_cache="hit" if parse_hit else "miss")
 
         st = "success" if parsed["teams"] else "failed"
         error = None if parsed["teams"] else "no teams parsed"
+        if extract_meta.get("status") != "ok":
+            error = f"text extraction {extract_meta.get('status')}: {extract_meta.get('error') or extract_meta.get('pypdf_error')}"
 
         # --- Store Parse Log ---
         try:
             raw_text_gz = gzip.compress(raw_text.encode("utf-8")) if raw_text is not None else None
             cur.execute(
-                "INSERT INTO event_parse_log (event_id, raw_text_gz, parsed_json, status, error) VALUES (%s,%s,%s,%s,%s) RETURNING id;",
-                (eid, raw_text_gz, json.dumps(parsed), st, error)
+                "INSERT INTO event_parse_log (event_id, raw_text_gz, parsed_json, status, error, extract_meta, pdf_sha256, parser_engine) VALUES (%s,%s,%s,%s,%s,%s,%s,%s) RETURNING id;",
+                (eid, raw_text_gz, json.dumps(parsed), st, error, json.dumps(extract_meta), cache_info["sha256"], parsed.get("engine"))
             )
             log_id = cur.fetchone()[0]
             cleanup_parse_logs(eid, cur, max_logs_to_keep=2)
         except Exception as e:
             conn.rollback() # CRITICAL: Rollback immediately on failure
             logger.exception(f"Failed to store parse log for event {eid}")
-            return jsonify({"error": f"Failed to store parse log: {str(e)}"}), 500
-
-        # --- Delete existing participation ---
-        try:
-            cur.execute("DELETE FROM event_participation WHERE event_id=%s;", (eid,))
-        except Exception as e:
-            conn.rollback() # CRITICAL: Rollback immediately on failure
-            logger.exception(f"Failed to delete existing participation for event {eid}")
-            return jsonify({"error": f"Failed to clear old participation: {str(e)}"}), 500
+            return {"error": f"Failed to store parse log: {str(e)}"}, 500
 
-        # --- Insert new participation records ---
+        # --- Replace participation records (+ event totals and summary) ---
         winners = []
-        try:
-            for t in parsed["teams"]:
-                team_name = str(t.get("name") or "").strip()
-                score = t.get("score")
-                num_players = t.get("playerCount")
-                position = t.get("position")
-                is_visiting = bool(t.get("isVisiting", False))
-                is_tournament = bool(t.get("isTournament", False))
-
-                if not team_name:
-                    logger.warning(f"Skipping team with no name in parse results for event {eid}: {t}")
-                    continue # Skip inserting teams with no name
-
-                if t.get("position") in (1, 2, 3) and len(winners) < 3:
-                    winners.append({
-                        "name": team_name,
-                        "score": score,
-                        "playerCount": num_players,
-                    })
-                
-                cur.execute("""
-                    INSERT INTO event_participation
-                      (event_id, team_name, score, position, num_players, is_visiting, is_tournament)
-                    VALUES (%s,%s,%s,%s,%s,%s,%s)
-                """, (
-                    eid, team_name, score, position, num_players, is_visiting, is_tournament,
-                ))
-        
-            # Update event totals
-            cur.execute("""
-                UPDATE events 
-                SET total_teams = (SELECT COUNT(*) FROM event_participation WHERE event_id = %s),
-                    total_players = (SELECT SUM(num_players) FROM event_participation WHERE event_id = %s)
-                WHERE id = %s
-            """, (eid, eid, eid))
+        rows = []
+        for t in parsed["teams"]:
+            team_name = str(t.get("name") or "").strip()
+            if not team_name:
+                logger.warning(f"Skipping team with no name in parse results for event {eid}: {t}")
+                continue # Skip inserting teams with no name
 
+            if t.get("position") in (1, 2, 3) and len(winners) < 3:
+                winners.append({
+                    "name": team_name,
+                    "score": t.get("score"),
+                    "playerCount": t.get("playerCount"),
+                })
+            rows.append({
+                "team_name": team_name, "score": t.get("score"), "position": t.get("position"),
+                "num_players": t.get("playerCount"), "is_visiting": t.get("isVisiting", False),
+                "is_tournament": t.get("isTournament", False),
+            })
+        try:
+            write_event_participation(cur, eid, rows)
         except Exception as e:
             conn.rollback() # CRITICAL: Rollback immediately on failure
             logger.exception(f"Failed to insert participation record for event {eid}")
-            return jsonify({"error": f"Failed to insert participation records: {str(e)}"}), 500
+            return {"error": f"Failed to insert participation records: {str(e)}"}, 500
 
         # --- Generate and update AI Recap ---
         ai_text = ""
@@ -2662,11 +5228,11 @@ def parse_pdf_for_event(eid):
             ai_text = "AI recap generation failed. See logs for details." # Provide this as status message
 
         conn.commit()
-        return jsonify({"status": st, "logId": log_id, "parsed": parsed, "ai_recap_generated": ai_text, "error": error})
+        return {"status": st, "logId": log_id, "parsed": parsed, "ai_recap_generated": ai_text, "error": error}, 200
     except Exception as e: # This outer block catches errors not caught by inner blocks
         conn.rollback()
         logger.exception(f"parse-pdf failed for event {eid} in outer block")
-        return jsonify({"error": f"Parse operation failed: {str(e)}"}), 500
+        return {"error": f"Parse operation failed: {str(e)}"}, 500
     finally:
         conn.close()
 
@@ -2708,40 +5274,17 @@ def import_from_last_parse(eid):
         if not event_row_for_recap:
             return jsonify({"error": "event not found for recap generation"}), 404
 
-        # --- Delete existing participation ---
-        try:
-            cur.execute("DELETE FROM event_participation WHERE event_id=%s;", (eid,))
-        except Exception as e:
-            conn.rollback()
-            logger.exception(f"Failed to delete existing participation for event {eid} during import")
-            return jsonify({"error": f"Failed to clear old participation: {str(e)}"}), 500
-
-        # --- Insert new participation records ---
-        winners = []
+        # --- Replace participation records (+ event totals and summary) ---
+        # The first three parsed teams are the winners and get positions 1-3 in order.
+        winners = [{"name": t["name"], "score": t.get("score"), "playerCount": t.get("playerCount")}
+                   for t in parsed["teams"][:3]]
+        rows = [{
+            "team_name": t["name"], "score": t.get("score"),
+            "position": i + 1 if i < 3 else t.get("position"),
+            "num_players": t.get("playerCount"), "is_visiting": t.get("isVisiting", False),
+        } for i, t in enumerate(parsed["teams"])]
         try:
-            pos = 1
-            for t in parsed["teams"][:3]: # Only top 3 for winners list
-                winners.append({"name": t["name"], "score": t.get("score"), "playerCount": t.get("playerCount")})
-                cur.execute(
-                    "INSERT INTO event_participation (event_id, team_name, score, position, num_players, is_visiting) VALUES (%s,%s,%s,%s,%s,%s)",
-                    (eid, t["name"], t.get("score"), pos, t.get("playerCount"), t.get("isVisiting", False))
-                )
-                pos += 1
-            # Insert all other teams from parsed data if you want more than just winners
-            for t in parsed["teams"][3:]:
-                 cur.execute(
-                    "INSERT INTO event_participation (event_id, team_name, score, position, num_players, is_visiting) VALUES (%s,%s,%s,%s,%s,%s)",
-                    (eid, t["name"], t.get("score"), t.get("position"), t.get("playerCount"), t.get("isVisiting", False))
-                )
-
-            # Update event totals
-            cur.execute("""
-                UPDATE events 
-                SET total_teams = (SELECT COUNT(*) FROM event_participation WHERE event_id = %s),
-                    total_players = (SELECT SUM(num_players) FROM event_participation WHERE event_id = %s)
-                WHERE id = %s
-            """, (eid, eid, eid))
-
+            write_event_participation(cur, eid, rows)
         except Exception as e:
             conn.rollback()
             logger.exception(f"Failed to insert participation record for event {eid} during import")
@@ -2788,14 +5331,14 @@ def get_parse_log_by_id(log_id):
     try:
         cur = conn.cursor()
         cur.execute("""
-            SELECT id, event_id, created_at, status, error, raw_text_gz, parsed_json
+            SELECT id, event_id, created_at, status, error, raw_text_gz, parsed_json, extract_meta, parser_engine
             FROM event_parse_log
             WHERE id=%s;
         """, (log_id,))
         r = cur.fetchone()
         if not r:
             return jsonify({"error": "log not found"}), 404
-        _id, event_id, created_at, status_s, err, raw_gz, parsed_json = r
+        _id, event_id, created_at, status_s, err, raw_gz, parsed_json, extract_meta, parser_engine = r
         raw_text = None
         if raw_gz:
             try:
@@ -2810,6 +5353,8 @@ def get_parse_log_by_id(log_id):
             "error": err,
             "raw_text": raw_text,
             "parsed_json": parsed_json,
+            "extract_meta": extract_meta,
+            "parser_engine": parser_engine,
         })
     finally:
         conn.close()
@@ -2882,6 +5427,168 @@ def update_ai_text(eid):
         conn.close()
 
 
+# ------------------------------------------------------------------------------
+# Event participation writes + summaries (denormalized top teams + totals)
+# ------------------------------------------------------------------------------
+def write_event_participation(cur, event_id, teams):
+    """
+    Replace the event's participation rows with `teams` (dicts with team_name, score,
+    position, num_players, is_visiting, is_tournament) and recompute events.total_teams /
+    total_players, all in one statement; then refresh the event summary. Runs in the
+    caller's transaction. Returns the number of rows written.
+    """
+    rows = [(
+        t.get("team_name"), t.get("score"), t.get("position"), t.get("num_players"),
+        bool(t.get("is_visiting")), bool(t.get("is_tournament")),
+    ) for t in teams]
+    columns = [list(c) for c in zip(*rows)] if rows else [[] for _ in range(6)]
+    cur.execute("""
+        WITH cleared AS (
+            DELETE FROM event_participation WHERE event_id = %s
+        ), written AS (
+            INSERT INTO event_participation
+              (event_id, team_name, score, position, num_players, is_visiting, is_tournament, updated_at)
+            SELECT %s, t.team_name, t.score, t.position, t.num_players, t.is_visiting, t.is_tournament, NOW()
+            FROM unnest(%s::text[], %s::int[], %s::int[], %s::int[], %s::bool[], %s::bool[])
+                 AS t(team_name, score, position, num_players, is_visiting, is_tournament)
+            RETURNING num_players
+        )
+        UPDATE events
+        SET total_teams = (SELECT COUNT(*) FROM written),
+            total_players = (SELECT SUM(num_players) FROM written),
+            updated_at = NOW()
+        WHERE id = %s
+        RETURNING total_teams;
+    """, (event_id, event_id, *columns, event_id))
+    row = cur.fetchone()
+    refresh_event_summaries(cur, [event_id])
+    return row[0] if row else 0
+
+# event_summaries mirrors what the public lists need from event_participation so they
+# read one row per event. Every path that rewrites an event's participation calls
+# refresh_event_summaries() on the same cursor before committing, so the summary and
+# the rows it was computed from land (or roll back) together.
+def _event_summary_select(where_sql):
+    """SELECT (event_id, top_teams, total_teams, total_players) recomputed from event_participation."""
+    return f"""
+        SELECT e.id,
+               COALESCE((
+                   SELECT jsonb_agg(jsonb_build_object('team_name', p.team_name, 'position', p.position)
+                                    ORDER BY p.position, p.id)
+                   FROM event_participation p
+                   WHERE p.event_id = e.id AND p.position <= %s
+               ), '[]'::jsonb) AS top_teams,
+               (SELECT COUNT(*) FROM event_participation p WHERE p.event_id = e.id)::int AS total_teams,
+               (SELECT COALESCE(SUM(p.num_players), 0) FROM event_participation p WHERE p.event_id = e.id)::int AS total_players
+        FROM events e
+        WHERE {where_sql}
+    """
+
+def refresh_event_summaries(cur, event_ids):
+    """Upsert event_summaries for `event_ids` inside the caller's transaction. Returns rows written."""
+    ids = sorted({int(i) for i in event_ids or []})
+    if not ids:
+        return 0
+    cur.execute(f"""
+        INSERT INTO event_summaries (event_id, top_teams, total_teams, total_players, updated_at)
+        SELECT s.id, s.top_teams, s.total_teams, s.total_players, NOW()
+        FROM ({_event_summary_select("e.id = ANY(%s)")}) s
+        ON CONFLICT (event_id) DO UPDATE
+          SET top_teams = EXCLUDED.top_teams,
+              total_teams = EXCLUDED.total_teams,
+              total_players = EXCLUDED.total_players,
+              updated_at = EXCLUDED.updated_at;
+    """, (EVENT_SUMMARY_TOP_POSITION, ids))
+    return len(ids)
+
+def find_stale_event_summaries(cur, after_id=0, limit=EVENT_SUMMARY_BATCH):
+    """
+    Compare stored summaries with a recompute for events with id > after_id (one batch).
+    Returns (checked_ids, [{"event_id", "problem", ...}]) where problem is 'missing' or 'stale'.
+    """
+    cur.execute(f"""
+        WITH fresh AS ({_event_summary_select("e.id > %s")} ORDER BY e.id LIMIT %s)
+        SELECT f.id, f.top_teams, f.total_teams, f.total_players,
+               s.event_id IS NOT NULL, s.top_teams, s.total_teams, s.total_players
+        FROM fresh f
+        LEFT JOIN event_summaries s ON s.event_id = f.id
+        ORDER BY f.id;
+    """, (EVENT_SUMMARY_TOP_POSITION, after_id, limit))
+    checked, problems = [], []
+    for eid, top, teams, players, has_summary, s_top, s_teams, s_players in cur.fetchall():
+        checked.append(eid)
+        if not has_summary:
+            problems.append({"event_id": eid, "problem": "missing"})
+        elif (top, teams, players) != (s_top, s_teams, s_players):
+            problems.append({
+                "event_id": eid, "problem": "stale",
+                "expected": {"top_teams": top, "total_teams": teams, "total_players": players},
+                "stored": {"top_teams": s_top, "total_teams": s_teams, "total_players": s_players},
+            })
+    return checked, problems
+
+@app.get("/admin/event-summaries/check")
+def check_event_summaries():
+    """
+    Consistency check: recompute summaries for up to ?limit= events (default 500, max 5000)
+    after ?after_id= and report missing/stale ones. Follow next_after_id to scan the rest.
+    """
+    auth_error = require_auth(required_roles=['admin'])
+    if auth_error:
+        return auth_error
+    limit = max(1, min(request.args.get("limit", EVENT_SUMMARY_BATCH, type=int), 5000))
+    after_id = request.args.get("after_id", 0, type=int)
+    conn = getconn()
+    try:
+        cur = conn.cursor()
+        checked, problems = find_stale_event_summaries(cur, after_id, limit)
+    finally:
+        conn.close()
+    return jsonify({
+        "checked": len(checked),
+        "problems": problems,
+        "next_after_id": checked[-1] if len(checked) == limit else None,
+    })
+
+@app.post("/admin/event-summaries/backfill")
+def backfill_event_summaries():
+    """
+    Rebuild event summaries. Body {"eventIds": [...]} limits it to those events;
+    otherwise every event is rewritten in batches of EVENT_SUMMARY_BATCH, one commit per batch.
+    """
+    auth_error = require_auth(required_roles=['admin'])
+    if auth_error:
+        return auth_error
+    d = request.get_json(silent=True) or {}
+    event_ids = d.get("eventIds")
+    if event_ids is not None and not isinstance(event_ids, list):
+        return jsonify({"error": "eventIds must be an array"}), 400
+    conn = getconn()
+    try:
+        cur = conn.cursor()
+        written = 0
+        if event_ids is not None:
+            for i in range(0, len(event_ids), EVENT_SUMMARY_BATCH):
+                written += refresh_event_summaries(cur, event_ids[i:i + EVENT_SUMMARY_BATCH])
+                conn.commit()
+        else:
+            after_id = 0
+            while True:
+                cur.execute("SELECT id FROM events WHERE id > %s ORDER BY id LIMIT %s;", (after_id, EVENT_SUMMARY_BATCH))
+                ids = [r[0] for r in cur.fetchall()]
+                if not ids:
+                    break
+                written += refresh_event_summaries(cur, ids)
+                conn.commit()
+                after_id = ids[-1]
+        return jsonify({"status": "ok", "written": written})
+    except Exception as e:
+        conn.rollback()
+        logger.exception("backfill_event_summaries failed")
+        return jsonify({"error": str(e)}), 500
+    finally:
+        conn.close()
+
 # ------------------------------------------------------------------------------
 # Admin migrate PDF and sweeps
 # ------------------------------------------------------------------------------
@@ -2899,6 +5606,14 @@ def migrate_pdf():
     if not event_id and not pdf_url_in:
         return jsonify({"error": "Provide event_id or pdf_url"}), 400
 
+    payload, status_code = run_pdf_migration(event_id, pdf_url_in, update_event)
+    return jsonify(payload), status_code
+
+def run_pdf_migration(event_id=None, pdf_url_in="", update_event=False):
+    """
+    Copy a PDF (typically a Google Drive link) into GCS and optionally point the event at it.
+    Used by /admin/migrate-pdf and the 'migrate_pdf' job. Returns (payload_dict, http_status).
+    """
     conn = getconn()
     try:
         cur = conn.cursor()
@@ -2908,14 +5623,20 @@ def migrate_pdf():
             cur.execute("SELECT pdf_url FROM events WHERE id=%s;", (event_id,))
             row = cur.fetchone()
             if not row or not row[0]:
-                return jsonify({"error": "event has no pdf_url"}), 400
+                return {"error": "event has no pdf_url"}, 400
             pdf_url = row[0]
 
+        # Already in our bucket: nothing to download, it's already where it belongs.
+        if gcs_object_for_url(pdf_url):
+            if gcs_get_blob(pdf_url) is None:
+                return {"error": "source object not found in bucket"}, 404
+            return {"status": "ok", "gcs_url": pdf_url, "already_in_bucket": True}, 200
+
         try:
             pdf_bytes = fetch_pdf_bytes(pdf_url)
         except Exception as e:
             logger.exception("fetch_pdf_bytes failed")
-            return jsonify({"error": f"failed to download source pdf: {e}"}), 500
+            return {"error": f"failed to download source pdf: {e}"}, 500
 
         filename = "recap.pdf"
         m = re.search(r"/([^/]+)\.(pdf|PDF)(?:\?|$)", pdf_url)
@@ -2931,7 +5652,7 @@ def migrate_pdf():
 
         key = safe_key(filename)
         if not GCS_BUCKET:
-            return jsonify({"error": "GCS_BUCKET not configured"}), 500
+            return {"error": "GCS_BUCKET not configured"}, 500
 
         blob = storage_client.bucket(GCS_BUCKET).blob(key)
         blob.upload_from_string(pdf_bytes, content_type="application/pdf")
@@ -2941,66 +5662,286 @@ def migrate_pdf():
             cur.execute("UPDATE events SET pdf_url=%s WHERE id=%s;", (public_url, event_id))
             conn.commit()
 
-        return jsonify({"status": "ok", "gcs_url": public_url})
+        return {"status": "ok", "gcs_url": public_url}, 200
+    except Exception as e:
+        conn.rollback()
+        logger.exception("migrate_pdf failed")
+        return {"error": str(e)}, 500
+    finally:
+        conn.close()
+
+@app.post("/admin/migrate-all-drive-pdfs")
+def migrate_all_drive_pdfs():
+    auth_error = require_auth(required_roles=['admin'])
+    if auth_error:
+        return auth_error
+    
+    limit = int(request.args.get("limit", "500"))
+    conn = getconn()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT id FROM events WHERE pdf_url ILIKE '%%drive.google.com%%' ORDER BY id DESC LIMIT %s;",
+            (limit,)
+        )
+        ids = [r[0] for r in cur.fetchall()]
+    finally:
+        conn.close()
+
+    try:
+        job_ids, skipped = _job_queue.enqueue_many(
+            "migrate_pdf", [({"event_id": eid}, f"migrate_pdf:{eid}") for eid in ids]
+        )
+        return jsonify({"status": "queued", "attempted": len(ids), "queued": len(job_ids),
+                        "already_queued": skipped, "jobIds": job_ids}), 202
+    except Exception as e:
+        logger.exception("migrate_all_drive_pdfs failed")
+        return jsonify({"error": str(e)}), 500
+
+@app.post("/admin/parse-sweep")
+def parse_sweep():
+    auth_error = require_auth(required_roles=['admin'])
+    if auth_error:
+        return auth_error
+    
+    return parse_all_events()
+
+
+def _job_parse_pdf(payload):
+    eid = int(payload["event_id"])
+    result, status_code = run_event_pdf_parse(eid)
+    if status_code >= 500:
+        raise JobFailed(result.get("error") or f"HTTP {status_code}")
+    if status_code >= 400:
+        raise JobFailed(result.get("error") or f"HTTP {status_code}", retryable=False)
+    return {
+        "event_id": eid,
+        "status": result.get("status"),
+        "logId": result.get("logId"),
+        "teams": len((result.get("parsed") or {}).get("teams") or []),
+        "error": result.get("error"),
+    }
+
+def _job_migrate_pdf(payload):
+    result, status_code = run_pdf_migration(payload.get("event_id"), payload.get("pdf_url") or "",
+                                            bool(payload.get("update_event", True)))
+    if status_code >= 500:
+        raise JobFailed(result.get("error") or f"HTTP {status_code}")
+    if status_code >= 400:
+        raise JobFailed(result.get("error") or f"HTTP {status_code}", retryable=False)
+    return result
+
+_job_queue.register("parse_pdf", _job_parse_pdf)
+_job_queue.register("migrate_pdf", _job_migrate_pdf)
+
+# ------------------------------------------------------------------------------
+# Photo derivatives (thumbnail + web size)
+# ------------------------------------------------------------------------------
+# Dashboards only need small images; originals are up to 20 MB. Each new event_photos
+# row queues a photo_derivatives job that writes <original>.thumb.webp and
+# <original>.web.webp next to the original and records them on the row.
+DERIVATIVE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+def derivative_key(photo_id, photo_url, name, ext):
+    ref = gcs_object_for_url(photo_url)
+    if ref:
+        base = re.sub(r"\.[A-Za-z0-9]{1,6}$", "", ref[1])
+        return f"{base}.{name}.{ext}"
+    return f"derived/photos/{photo_id}.{name}.{ext}"
+
+def enqueue_photo_derivatives(cur, photo_ids):
+    """Queue derivative jobs for new event_photos rows in the caller's transaction (caller notifies)."""
+    if not photo_derivs.HAVE_PIL or not GCS_BUCKET or not photo_ids:
+        return []
+    ids, _ = _job_queue.enqueue_many(
+        "photo_derivatives", [({"photo_id": pid}, f"photo_derivatives:{pid}") for pid in photo_ids], cur=cur
+    )
+    return ids
+
+def _job_photo_derivatives(payload):
+    pid = int(payload["photo_id"])
+    if not photo_derivs.HAVE_PIL:
+        raise JobFailed("Pillow is not installed", retryable=False)
+    conn = getconn()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT photo_url FROM event_photos WHERE id=%s;", (pid,))
+        row = cur.fetchone()
+    finally:
+        conn.close()
+    if not row:
+        return {"photo_id": pid, "status": "gone"}
+    photo_url = row[0]
+
+    memory = _ByteBudget(MAX_IMG_BYTES)
+    fetched = _download_photo(to_direct_download(photo_url), MAX_IMG_BYTES, lambda: MAX_IMG_BYTES, memory)
+    if not fetched:
+        raise JobFailed(f"could not download {photo_url}")
+    parts, reserved = fetched
+    data = b"".join(parts)
+    memory.release(reserved)
+    try:
+        out = photo_derivs.make_derivatives(data)
+    except ValueError as e:
+        raise JobFailed(str(e), retryable=False)
+
+    bucket = storage_client.bucket(GCS_BUCKET)
+    urls = {}
+    for name, v in out["variants"].items():
+        key = derivative_key(pid, photo_url, name, v["ext"])
+        blob = bucket.blob(key)
+        blob.cache_control = DERIVATIVE_CACHE_CONTROL
+        blob.upload_from_string(v["bytes"], content_type=v["content_type"])
+        urls[name] = f"https://storage.googleapis.com/{GCS_BUCKET}/{key}"
+
+    conn = getconn()
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            UPDATE event_photos
+            SET thumb_url=%s, web_url=%s, width=%s, height=%s, derived_at=now()
+            WHERE id=%s AND photo_url=%s;
+        """, (urls.get("thumb"), urls.get("web"), out["width"], out["height"], pid, photo_url))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return {
+        "photo_id": pid,
+        "thumb_url": urls.get("thumb"),
+        "web_url": urls.get("web"),
+        "bytes": {name: len(v["bytes"]) for name, v in out["variants"].items()},
+    }
+
+_job_queue.register("photo_derivatives", _job_photo_derivatives)
+
+@app.post("/admin/photos/derivatives/backfill")
+def backfill_photo_derivatives():
+    """Queue derivative jobs for photos without them (?limit=, default 500; ?force=1 redoes all)."""
+    auth_error = require_auth(required_roles=['admin'])
+    if auth_error:
+        return auth_error
+    if not photo_derivs.HAVE_PIL:
+        return jsonify({"error": "Pillow is not installed on this instance"}), 503
+    limit = max(1, min(request.args.get("limit", 500, type=int), 5000))
+    force = request.args.get("force") in ("1", "true", "yes")
+    conn = getconn()
+    try:
+        cur = conn.cursor()
+        cur.execute(f"""
+            SELECT id FROM event_photos
+            {"" if force else "WHERE thumb_url IS NULL"}
+            ORDER BY id DESC
+            LIMIT %s;
+        """, (limit,))
+        ids = [r[0] for r in cur.fetchall()]
+    finally:
+        conn.close()
+    try:
+        job_ids, skipped = _job_queue.enqueue_many(
+            "photo_derivatives", [({"photo_id": pid}, f"photo_derivatives:{pid}") for pid in ids]
+        )
+        return jsonify({"status": "queued", "attempted": len(ids), "queued": len(job_ids),
+                        "already_queued": skipped, "heic": photo_derivs.HAVE_HEIF}), 202
     except Exception as e:
-        conn.rollback()
-        logger.exception("migrate_pdf failed")
+        logger.exception("backfill_photo_derivatives failed")
         return jsonify({"error": str(e)}), 500
+
+def _job_row_to_dict(r):
+    return {
+        "id": r[0], "kind": r[1], "payload": r[2], "idempotency_key": r[3], "status": r[4],
+        "attempts": r[5], "max_attempts": r[6],
+        "run_after": r[7].isoformat() if r[7] else None,
+        "last_error": r[8], "result": r[9], "locked_by": r[10],
+        "created_at": r[11].isoformat() if r[11] else None,
+        "started_at": r[12].isoformat() if r[12] else None,
+        "finished_at": r[13].isoformat() if r[13] else None,
+    }
+
+@app.get("/admin/jobs")
+def admin_list_jobs():
+    """
+    Job queue status: counts per kind/status plus the most recent jobs.
+    Optional filters: ?status=queued|running|done|failed|superseded&kind=parse_pdf&limit=50
+    """
+    auth_error = require_auth(required_roles=['admin'])
+    if auth_error:
+        return auth_error
+    
+    status_f = (request.args.get("status") or "").strip() or None
+    kind_f = (request.args.get("kind") or "").strip() or None
+    try:
+        limit = max(1, min(int(request.args.get("limit", "50")), 500))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+
+    conn = getconn()
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT kind, status, COUNT(*) FROM jobs
+            WHERE status IN ('queued', 'running') OR created_at > now() - interval '1 day'
+            GROUP BY kind, status ORDER BY kind, status;
+        """)
+        counts = {}
+        for kind, st, n in cur.fetchall():
+            counts.setdefault(kind, {})[st] = n
+        cur.execute(f"""
+            SELECT {JobQueue._COLS} FROM jobs
+            WHERE (%s::text IS NULL OR status = %s) AND (%s::text IS NULL OR kind = %s)
+            ORDER BY id DESC LIMIT %s;
+        """, (status_f, status_f, kind_f, kind_f, limit))
+        jobs = [_job_row_to_dict(r) for r in cur.fetchall()]
+        return jsonify({"counts_24h": counts, "jobs": jobs, "workers": _job_queue.stats()})
     finally:
         conn.close()
 
-@app.post("/admin/migrate-all-drive-pdfs")
-def migrate_all_drive_pdfs():
+@app.get("/admin/jobs/<int:job_id>")
+def admin_get_job(job_id):
     auth_error = require_auth(required_roles=['admin'])
     if auth_error:
         return auth_error
     
-    limit = int(request.args.get("limit", "500"))
     conn = getconn()
-    results = {"attempted":0, "migrated":0, "failed":0, "errors":[]}
     try:
         cur = conn.cursor()
-        cur.execute(
-            "SELECT id, pdf_url FROM events WHERE pdf_url ILIKE '%%drive.google.com%%' ORDER BY id DESC LIMIT %s;",
-            (limit,)
-        )
-        rows = cur.fetchall()
-        cur.close()
+        cur.execute(f"SELECT {JobQueue._COLS} FROM jobs WHERE id=%s;", (job_id,))
+        r = cur.fetchone()
+        if not r:
+            return jsonify({"error": "job not found"}), 404
+        return jsonify(_job_row_to_dict(r))
+    finally:
         conn.close()
 
-        for eid, url in rows:
-            results["attempted"] += 1
-            try:
-                target_url = f"{request.scheme}://{request.host}/admin/migrate-pdf"
-                headers = {}
-                if 'Authorization' in request.headers:
-                    headers['Authorization'] = request.headers['Authorization']
-                elif 'X-GSP-Token' in request.headers:
-                    headers['X-GSP-Token'] = request.headers['X-GSP-Token']
-                elif HOST_TOKEN:
-                    headers['X-GSP-Token'] = HOST_TOKEN
-
-                r = requests.post(target_url, json={"event_id": eid}, headers=headers, timeout=60)
-                if r.ok and r.json().get("status") == "ok":
-                    results["migrated"] += 1
-                else:
-                    results["failed"] += 1
-                    results["errors"].append({"event": eid, "msg": r.text})
-            except Exception as e:
-                results["failed"] += 1
-                results["errors"].append({"event": eid, "msg": str(e)})
-        return jsonify(results)
-    except Exception as e:
-        logger.exception("migrate_all_drive_pdfs failed")
-        return jsonify({"error": str(e), "partial": results}), 500
-
-@app.post("/admin/parse-sweep")
-def parse_sweep():
+@app.post("/admin/jobs/<int:job_id>/retry")
+def admin_retry_job(job_id):
+    """Requeue a failed/superseded job immediately with a fresh attempt budget."""
     auth_error = require_auth(required_roles=['admin'])
     if auth_error:
         return auth_error
     
-    return parse_all_events()
+    conn = getconn()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT kind, payload, idempotency_key, max_attempts, status FROM jobs WHERE id=%s;", (job_id,))
+        r = cur.fetchone()
+        if not r:
+            return jsonify({"error": "job not found"}), 404
+        if r[4] in ('queued', 'running'):
+            return jsonify({"error": f"job is already {r[4]}"}), 409
+        payload = r[1] if not isinstance(r[1], str) else json.loads(r[1])
+        new_id = _job_queue.enqueue(r[0], payload, idempotency_key=r[2], max_attempts=r[3], cur=cur)
+        conn.commit()
+        _job_queue.notify()
+        return jsonify({"status": "queued", "jobId": new_id, "retryOf": job_id}), 202
+    except Exception as e:
+        conn.rollback()
+        logger.exception("admin_retry_job failed")
+        return jsonify({"error": str(e)}), 500
+    finally:
+        conn.close()
 
 # ------------------------------------------------------------------------------
 # Admin Data
@@ -3014,14 +5955,7 @@ def admin_list_hosts():
     if auth_error:
         return auth_error
     
-    conn = getconn()
-    try:
-        cur = conn.cursor()
-        cur.execute("SELECT id, name, phone, email FROM hosts ORDER BY name;")
-        rows = cur.fetchall()
-        return jsonify([{"id": r[0], "name": r[1], "phone": r[2], "email": r[3]} for r in rows])
-    finally:
-        conn.close()
+    return jsonify([{"id": r[0], "name": r[1], "phone": r[2], "email": r[3]} for r in ref_hosts()])
 
 @app.post("/admin/hosts")
 def admin_create_host():
@@ -3039,10 +5973,9 @@ def admin_create_host():
     conn = getconn()
     try:
         cur = conn.cursor()
-        cur.execute("SELECT id FROM hosts WHERE lower(name) = lower(%s);", (name,))
-        existing = cur.fetchone()
-        if existing:
-            return jsonify({"status": "exists", "id": existing[0]}), 200 # Return 200 OK if exists
+        existing_id = name_id(cur, "hosts", name)
+        if existing_id is not None:
+            return jsonify({"status": "exists", "id": existing_id}), 200 # Return 200 OK if exists
         
         cur.execute(
             "INSERT INTO hosts (name, phone, email) VALUES (%s, %s, %s) RETURNING id;",
@@ -3050,6 +5983,7 @@ def admin_create_host():
         )
         new_id = cur.fetchone()[0]
         conn.commit()
+        _ref_cache.invalidate("hosts")
         return jsonify({"status": "created", "id": new_id}), 201 # Return 201 Created
     except Exception as e:
         conn.rollback()
@@ -3093,6 +6027,7 @@ def admin_update_host(host_id):
         cur = conn.cursor()
         cur.execute("UPDATE hosts SET name=%s, phone=%s, email=%s WHERE id=%s;", (name, phone, email, host_id))
         conn.commit()
+        _ref_cache.invalidate("hosts")
         if cur.rowcount == 0:
             return jsonify({"error": "Host not found"}), 404
         return jsonify({"status": "ok", "id": host_id})
@@ -3114,6 +6049,7 @@ def admin_delete_host(host_id):
         cur = conn.cursor()
         cur.execute("DELETE FROM hosts WHERE id=%s;", (host_id,))
         conn.commit()
+        _ref_cache.invalidate("hosts")
         if cur.rowcount == 0:
             return jsonify({"error": "Host not found or could not be deleted"}), 404
         return jsonify({"status": "ok"})
@@ -3134,17 +6070,10 @@ def admin_list_venues():
     if auth_error:
         return auth_error
     
-    conn = getconn()
-    try:
-        cur = conn.cursor()
-        cur.execute("SELECT id, name, default_day, default_time, access_key, is_active, default_host_id, show_type, notes FROM venues ORDER BY name;")
-        rows = cur.fetchall()
-        return jsonify([
-            {"id": r[0], "name": r[1], "default_day": r[2], "default_time": r[3], "access_key": r[4], "is_active": r[5], "default_host_id": r[6], "show_type": r[7], "notes": r[8]}
-            for r in rows
-        ])
-    finally:
-        conn.close()
+    return jsonify([
+        {"id": r[0], "name": r[1], "default_day": r[2], "default_time": r[3], "access_key": r[4], "is_active": r[5], "default_host_id": r[6], "show_type": r[7], "notes": r[8], "slug": r[9]}
+        for r in ref_venues()
+    ])
 
 @app.post("/admin/venues")
 def admin_create_venue():
@@ -3168,16 +6097,17 @@ def admin_create_venue():
     conn = getconn()
     try:
         cur = conn.cursor()
-        cur.execute("SELECT id FROM venues WHERE lower(name) = lower(%s);", (name,))
-        existing_id = cur.fetchone()
-        if existing_id:
-            return jsonify({"status": "exists", "id": existing_id[0]}), 200
+        existing_id = name_id(cur, "venues", name)
+        if existing_id is not None:
+            return jsonify({"status": "exists", "id": existing_id}), 200
         cur.execute(
             "INSERT INTO venues (name, default_day, default_time, default_host_id, show_type, access_key, is_active) VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING id;",
             (name, default_day, default_time, default_host_id, show_type, new_access_key, is_active)
         )
         new_id = cur.fetchone()[0]
+        assign_venue_slug(cur, new_id, name)
         conn.commit()
+        _ref_cache.invalidate("venues")
         return jsonify({"status": "created", "id": new_id, "access_key": new_access_key}), 201
     except Exception as e:
         logger.exception("admin_create_venue failed")
@@ -3231,7 +6161,10 @@ def admin_update_venue(vid):
             SET name=%s, default_day=%s, default_time=%s, access_key=%s, is_active=%s, default_host_id=%s, show_type=%s, notes=%s
             WHERE id=%s
         """, (name, dday, dtime, akey, is_active, default_host_id, show_type, notes, vid))
+        if cur.rowcount:
+            assign_venue_slug(cur, vid, name)
         conn.commit()
+        _ref_cache.invalidate("venues")
         return jsonify({"success": True})
     finally:
         conn.close()
@@ -3247,6 +6180,7 @@ def admin_delete_venue(venue_id):
         cur = conn.cursor()
         cur.execute("DELETE FROM venues WHERE id=%s;", (venue_id,))
         conn.commit()
+        _ref_cache.invalidate("venues")
         if cur.rowcount == 0:
             return jsonify({"error": "Venue not found or could not be deleted"}), 404
         return jsonify({"status": "ok", "message": "Venue deleted"})
@@ -3274,6 +6208,7 @@ def admin_generate_venue_access_key(venue_id):
         cur.execute("UPDATE venues SET access_key=%s WHERE id=%s RETURNING access_key;", (new_key, venue_id))
         result = cur.fetchone()
         conn.commit()
+        _ref_cache.invalidate("venues")
         if not result:
             return jsonify({"error": "Venue not found"}), 404
         return jsonify({"status": "ok", "id": venue_id, "access_key": result[0]})
@@ -3291,23 +6226,10 @@ def admin_list_tournament_teams():
     if auth_error:
         return auth_error
     
-    conn = getconn()
-    try:
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT tt.id, tt.name, tt.home_venue_id, v.name AS home_venue_name,
-                   tt.captain_name, tt.captain_email, tt.captain_phone, tt.player_count
-            FROM tournament_teams tt
-            LEFT JOIN venues v ON tt.home_venue_id = v.id
-            ORDER BY tt.name;
-        """)
-        rows = cur.fetchall()
-        return jsonify([{
-            "id": r[0], "name": r[1], "home_venue_id": r[2], "home_venue": r[3],
-            "captain_name": r[4], "captain_email": r[5], "captain_phone": r[6], "player_count": r[7]
-        } for r in rows])
-    finally:
-        conn.close()
+    return jsonify([{
+        "id": r[0], "name": r[1], "home_venue_id": r[2], "home_venue": r[3],
+        "captain_name": r[4], "captain_email": r[5], "captain_phone": r[6], "player_count": r[7]
+    } for r in ref_tournament_teams()])
 
 @app.post("/admin/tournament-teams")
 def admin_create_tournament_team():
@@ -3327,16 +6249,16 @@ def admin_create_tournament_team():
     conn = getconn()
     try:
         cur = conn.cursor()
-        cur.execute("SELECT id FROM tournament_teams WHERE lower(name) = lower(%s);", (name,))
-        existing_id = cur.fetchone()
-        if existing_id:
-            return jsonify({"status": "exists", "id": existing_id[0]}), 200
+        existing_id = name_id(cur, "tournament_teams", name)
+        if existing_id is not None:
+            return jsonify({"status": "exists", "id": existing_id}), 200
         cur.execute("""
             INSERT INTO tournament_teams (name, home_venue_id, captain_name, captain_email, captain_phone, player_count)
             VALUES (%s, %s, %s, %s, %s, %s) RETURNING id;
         """, (name, home_venue_id, captain_name, captain_email, captain_phone, player_count))
         new_id = cur.fetchone()[0]
         conn.commit()
+        _ref_cache.invalidate("tournament_teams")
         return jsonify({"status": "created", "id": new_id}), 201
     except Exception as e:
         logger.exception("admin_create_tournament_team failed")
@@ -3399,8 +6321,12 @@ def admin_update_tournament_team(team_id):
             """,
             (name, home_venue_id, captain_name, captain_email, captain_phone, player_count, team_id)
         )
+        updated = cur.rowcount
+        if updated:
+            refresh_team_standings(cur, [team_id])
         conn.commit()
-        if cur.rowcount == 0:
+        _ref_cache.invalidate("tournament_teams")
+        if updated == 0:
             return jsonify({"error": "Tournament team not found"}), 404
         return jsonify({"status": "ok", "id": team_id})
     except Exception as e:
@@ -3419,9 +6345,13 @@ def admin_delete_tournament_team(team_id):
     conn = getconn()
     try:
         cur = conn.cursor()
+        venue_ids = tournament_standings_venues(cur, [team_id])
         cur.execute("DELETE FROM tournament_teams WHERE id=%s;", (team_id,))
+        deleted = cur.rowcount
+        refresh_tournament_standings(cur, venue_ids)
         conn.commit()
-        if cur.rowcount == 0:
+        _ref_cache.invalidate("tournament_teams")
+        if deleted == 0:
             return jsonify({"error": "Tournament team not found or could not be deleted"}), 404
         return jsonify({"status": "ok", "message": "Tournament team deleted"})
     except pg8000.exceptions.IntegrityError as e:
@@ -3539,22 +6469,39 @@ def save_team_weekly_scores(team_id):
     if not venue_id or not scores:
         return jsonify({"error": "venue_id and a scores array are required"}), 400
 
+    # Later entries for the same week win; blank cells from the weekly grid are stored as NULL
+    by_week = {}
+    for score_entry in scores:
+        try:
+            week_ending = date.fromisoformat(str(score_entry.get("week_ending")))
+        except ValueError:
+            return jsonify({"error": f"Invalid week_ending: {score_entry.get('week_ending')!r} (YYYY-MM-DD)"}), 400
+        by_week[week_ending] = (
+            score_entry.get("points") if score_entry.get("points") != "" else None,
+            score_entry.get("num_players") if score_entry.get("num_players") != "" else None,
+        )
+
     conn = getconn()
     try:
         cur = conn.cursor()
-        for score_entry in scores:
-            week_ending = score_entry.get("week_ending")
-            points = score_entry.get("points")
-            num_players = score_entry.get("num_players")
+        cur.execute("SELECT week_ending, id FROM tournament_weeks WHERE week_ending = ANY(%s::date[]);",
+                    ([w.isoformat() for w in by_week],))
+        week_ids = dict(cur.fetchall())
+        missing = sorted(w.isoformat() for w in by_week if w not in week_ids)
+        if missing:
+            return jsonify({"error": f"week_ending not found: {', '.join(missing)}"}), 404
+
+        # Use an UPSERT to handle both new and existing weekly scores, one statement for all weeks
+        cur.execute("""
+            INSERT INTO tournament_team_scores (tournament_team_id, venue_id, week_id, points, num_players, updated_at)
+            SELECT %s, %s, t.week_id, t.points, t.num_players, NOW()
+            FROM unnest(%s::int[], %s::int[], %s::int[]) AS t(week_id, points, num_players)
+            ON CONFLICT (tournament_team_id, venue_id, week_id)
+            DO UPDATE SET points = EXCLUDED.points, num_players = EXCLUDED.num_players, updated_at = NOW();
+        """, (team_id, venue_id, [week_ids[w] for w in by_week],
+              [p for p, _ in by_week.values()], [n for _, n in by_week.values()]))
+        refresh_team_standings(cur, [team_id])
 
-            # Use an UPSERT to handle both new and existing weekly scores
-            cur.execute("""
-                INSERT INTO tournament_team_scores (tournament_team_id, venue_id, week_ending, points, num_players, updated_at)
-                VALUES (%s, %s, %s, %s, %s, NOW())
-                ON CONFLICT (tournament_team_id, venue_id, week_ending)
-                DO UPDATE SET points = EXCLUDED.points, num_players = EXCLUDED.num_players, updated_at = NOW();
-            """, (team_id, venue_id, week_ending, points, num_players))
-        
         conn.commit()
         return jsonify({"status": "ok", "message": f"{len(scores)} weekly scores saved for team {team_id}."})
     except Exception as e:
@@ -3565,6 +6512,7 @@ def save_team_weekly_scores(team_id):
 
 # Public route for team breakdown (used in the "See More" modal)
 @app.get("/pub/teams/<int:team_id>/breakdown")
+@public_cached("tournament_team_scores", "tournament_teams", "venues")
 def get_public_team_breakdown(team_id):
     """
     Fetches the full score history for a team to show in a public breakdown.
@@ -3573,11 +6521,12 @@ def get_public_team_breakdown(team_id):
     try:
         cur = conn.cursor()
         cur.execute("""
-            SELECT v.name as venue_name, tts.week_ending, tts.points
+            SELECT v.name as venue_name, tw.week_ending, tts.points
             FROM tournament_team_scores tts
+            JOIN tournament_weeks tw ON tts.week_id = tw.id
             JOIN venues v ON tts.venue_id = v.id
             WHERE tts.tournament_team_id = %s AND tts.points > 0
-            ORDER BY tts.week_ending DESC;
+            ORDER BY tw.week_ending DESC;
         """, (team_id,))
         
         breakdown = [{"venue": r[0], "week_ending": r[1].isoformat(), "points": r[2]} for r in cur.fetchall()]
@@ -3599,17 +6548,17 @@ def admin_search_hosts():
         return auth_error
     
     q = (request.args.get("q") or "").strip()
-    limit = min(int(request.args.get("limit", "25")), 200)
+    limit = search_limit(25, 200)
     conn = getconn()
     try:
         cur = conn.cursor()
         if q:
-            like = f"%{q}%"
+            exact, prefix, like = search_patterns(q)
             cur.execute(
                 "SELECT id, name, phone, email FROM hosts "
-                "WHERE LOWER(name) LIKE LOWER(%s) OR LOWER(email) LIKE LOWER(%s) "
-                "ORDER BY name LIMIT %s;",
-                (like, like, limit)
+                "WHERE LOWER(name) LIKE %s OR LOWER(email) LIKE %s "
+                f"ORDER BY {search_rank_sql('name')}, name LIMIT %s;",
+                (like, like, exact, prefix, limit)
             )
         else:
             cur.execute(
@@ -3628,7 +6577,7 @@ def admin_search_venues():
         return auth_error
     
     q = request.args.get("q", "").strip()
-    limit = int(request.args.get("limit", 20))
+    limit = search_limit(20, 200)
     conn = getconn()
     try:
         cur = conn.cursor()
@@ -3636,12 +6585,13 @@ def admin_search_venues():
             # Added is_active, default_host_id, show_type, and notes to selection
             cur.execute("SELECT id, name, default_day, default_time, access_key, is_active, default_host_id, show_type, notes FROM venues ORDER BY name LIMIT %s", (limit,))
         else:
-            term = f"%{q}%"
+            exact, prefix, like = search_patterns(q)
             # Added is_active, default_host_id, show_type, and notes to selection
-            cur.execute("""
+            cur.execute(f"""
                 SELECT id, name, default_day, default_time, access_key, is_active, default_host_id, show_type, notes
-                FROM venues WHERE name ILIKE %s ORDER BY name LIMIT %s
-            """, (term, limit))
+                FROM venues WHERE lower(name) LIKE %s
+                ORDER BY {search_rank_sql('name')}, name LIMIT %s
+            """, (like, exact, prefix, limit))
         
         # Map 9 columns now
         res = [
@@ -3669,20 +6619,20 @@ def admin_search_teams():
         return auth_error
     
     q = (request.args.get("q") or "").strip()
-    limit = min(int(request.args.get("limit", "25")), 200)
+    limit = search_limit(25, 200)
     conn = getconn()
     try:
         cur = conn.cursor()
         if q:
-            like = f"%{q}%"
+            exact, prefix, like = search_patterns(q)
             cur.execute(
                 "SELECT tt.id, tt.name, tt.home_venue_id, v.name AS home_venue_name, "
                 "tt.captain_name, tt.captain_email, tt.captain_phone, tt.player_count "
                 "FROM tournament_teams tt "
                 "LEFT JOIN venues v ON tt.home_venue_id=v.id "
-                "WHERE LOWER(tt.name) LIKE LOWER(%s) OR LOWER(tt.captain_email) LIKE LOWER(%s) "
-                "ORDER BY tt.name LIMIT %s;",
-                (like, like, limit)
+                "WHERE LOWER(tt.name) LIKE %s OR LOWER(tt.captain_email) LIKE %s "
+                f"ORDER BY {search_rank_sql('tt.name')}, tt.name LIMIT %s;",
+                (like, like, exact, prefix, limit)
             )
         else:
             cur.execute(
@@ -3717,7 +6667,7 @@ def admin_list_events():
     status_f = (request.args.get("status") or "").strip()
     start = (request.args.get("start") or "").strip()  # YYYY-MM-DD
     end = (request.args.get("end") or "").strip()
-    limit = min(int(request.args.get("limit", "200")), 1000)
+    limit = search_limit(200, 1000)
 
     conn = getconn()
     try:
@@ -3733,8 +6683,14 @@ def admin_list_events():
             LEFT JOIN venues v ON e.venue_id=v.id
         """
         if q:
-            clauses.append("(LOWER(h.name) LIKE LOWER(%s) OR LOWER(v.name) LIKE LOWER(%s))")
-            params.extend([f"%{q}%", f"%{q}%"])
+            # Match the (small) host/venue tables through their trigram indexes first, then
+            # walk events by host_id / venue_id instead of filtering the full join.
+            _, _, like = search_patterns(q)
+            clauses.append(
+                "(e.host_id IN (SELECT id FROM hosts WHERE lower(name) LIKE %s)"
+                " OR e.venue_id IN (SELECT id FROM venues WHERE lower(name) LIKE %s))"
+            )
+            params.extend([like, like])
         if show_type:
             clauses.append("COALESCE(e.show_type,'gsp') = %s")
             params.append(show_type)
@@ -3802,8 +6758,9 @@ def admin_event_detail(eid):
             "num_players": r[3], "is_visiting": r[4], "is_tournament": r[5]
         } for r in cur.fetchall()]
 
-        cur.execute("SELECT photo_url FROM event_photos WHERE event_id=%s ORDER BY id", (eid,))
-        photos = [r[0] for r in cur.fetchall()]
+        cur.execute("SELECT photo_url, thumb_url, web_url FROM event_photos WHERE event_id=%s ORDER BY id", (eid,))
+        photo_rows = cur.fetchall()
+        photos = [r[0] for r in photo_rows]
 
         return jsonify({
             "id": e[0],
@@ -3820,7 +6777,8 @@ def admin_event_detail(eid):
             "created_at": e[15].isoformat() if e[15] else None,
             "updated_at": e[16].isoformat() if e[16] else None,
             "participation": parts,
-            "photos": photos
+            "photos": photos,
+            "photo_items": [{"url": r[0], "thumb_url": r[1], "web_url": r[2]} for r in photo_rows],
         })
     finally:
         conn.close()
@@ -3931,12 +6889,9 @@ def admin_replace_participation(eid):
         venue_defaults = {"default_day": event_row[10], "default_time": event_row[11]}
         # --- End of Fix ---
 
-        cur.execute("DELETE FROM event_participation WHERE event_id=%s", (eid,))
-        
         # Sort teams by position from the frontend payload to find the winners
         teams.sort(key=lambda t: t.get('position') or float('inf'))
         winners = []
-
         for t in teams:
             # Re-populate winners list based on the new, sorted data
             if t.get("position") in (1, 2, 3) and len(winners) < 3:
@@ -3946,22 +6901,7 @@ def admin_replace_participation(eid):
                     "playerCount": t.get("num_players"),
                 })
 
-            cur.execute("""
-                INSERT INTO event_participation
-                (event_id, team_name, score, position, num_players, is_visiting, is_tournament, updated_at)
-                VALUES (%s,%s,%s,%s,%s,%s,%s,NOW())
-            """, (
-                eid, t.get("team_name"), t.get("score"), t.get("position"),
-                t.get("num_players"), bool(t.get("is_visiting")), bool(t.get("is_tournament"))
-            ))
-            cur.execute("""
-                UPDATE events 
-                SET 
-                    total_teams = (SELECT COUNT(*) FROM event_participation WHERE event_id = %s),
-                    total_players = (SELECT SUM(num_players) FROM event_participation WHERE event_id = %s),
-                    updated_at = NOW()
-                WHERE id = %s
-            """, (eid, eid, eid))
+        written = write_event_participation(cur, eid, teams)
 
         # Now, call format_ai_recap with the correct dictionary and the new winners list
         ai_text = None
@@ -3970,7 +6910,7 @@ def admin_replace_participation(eid):
             cur.execute("UPDATE events SET ai_recap=%s, updated_at=NOW() WHERE id=%s;", (ai_text, eid))
 
         conn.commit()
-        return jsonify({"status": "ok", "count": len(teams), "ai_recap": ai_text})
+        return jsonify({"status": "ok", "count": written, "ai_recap": ai_text})
     except Exception as e:
         conn.rollback()
         logger.exception("admin_replace_participation failed")
@@ -4044,6 +6984,7 @@ def save_tournament_scores_for_event(event_id):
 
         # 4. Loop through teams and perform an UPSERT (this logic remains the same)
         upserted_count = 0
+        team_ids = []
         for team_data in teams:
             if not isinstance(team_data, dict):
                 logging.error(f"FATAL: Item in 'teams' list was not a dictionary. Type: {type(team_data)}")
@@ -4072,7 +7013,9 @@ def save_tournament_scores_for_event(event_id):
                 (team_id, venue_id, week_id, event_id, points, num_players)
             )
             upserted_count += 1
-        
+            team_ids.append(team_id)
+
+        refresh_team_standings(cur, team_ids)
         conn.commit()
         return jsonify({
             "status": "ok",
@@ -4107,7 +7050,10 @@ def admin_add_photo_url(eid):
         cur = conn.cursor()
         cur.execute("INSERT INTO event_photos (event_id, photo_url) VALUES (%s,%s) RETURNING id", (eid, url))
         pid = cur.fetchone()[0]
+        deriv_job_ids = enqueue_photo_derivatives(cur, [pid])
         conn.commit()
+        if deriv_job_ids:
+            _job_queue.notify()
         return jsonify({"status":"ok", "photoId": pid})
     except Exception as e:
         conn.rollback()
@@ -4186,6 +7132,122 @@ def admin_batch_validate_by_criteria():
     finally:
         conn.close()
 # ------------------------------------------------------------------------------
+# Tournament standings (rollup of validated scores per home venue and week)
+# ------------------------------------------------------------------------------
+# tournament_standings holds one row per (home venue, week, team) for every week in
+# which any team from that venue has a validated score: the team's points that week,
+# its running total and its rank among the venue's teams as of that week (prev_rank is
+# the rank the week before). Score writers call refresh_team_standings() on the same
+# cursor before committing; only the touched home venues are recomputed.
+#
+# Advisory lock class: (key, venue_id) per venue; the bare key is held shared by venue
+# refreshes and exclusively by a full rebuild.
+TOURNAMENT_STANDINGS_LOCK = 72_010_025
+
+def _tournament_standings_insert(teams_where):
+    """INSERT … SELECT recomputing standings rows for tournament_teams matching `teams_where`."""
+    return f"""
+        WITH teams AS (
+            SELECT id, home_venue_id AS venue_id FROM tournament_teams WHERE {teams_where}
+        ), points AS (
+            SELECT t.venue_id, s.tournament_team_id, s.week_id, SUM(COALESCE(s.points, 0)) AS points
+            FROM tournament_team_scores s
+            JOIN teams t ON t.id = s.tournament_team_id
+            WHERE s.is_validated
+            GROUP BY t.venue_id, s.tournament_team_id, s.week_id
+        ), weeks AS (
+            SELECT DISTINCT p.venue_id, p.week_id, w.week_ending
+            FROM points p
+            JOIN tournament_weeks w ON w.id = p.week_id
+        ), totals AS (
+            SELECT wk.venue_id, wk.week_id, wk.week_ending, t.id AS team_id,
+                   COALESCE(p.points, 0) AS week_points,
+                   SUM(COALESCE(p.points, 0)) OVER running AS total_points,
+                   COUNT(p.week_id) OVER running AS weeks_played
+            FROM weeks wk
+            JOIN teams t ON t.venue_id = wk.venue_id
+            LEFT JOIN points p ON p.tournament_team_id = t.id AND p.week_id = wk.week_id
+            WINDOW running AS (PARTITION BY t.id ORDER BY wk.week_ending)
+        ), ranked AS (
+            SELECT venue_id, week_id, week_ending, team_id, week_points, total_points,
+                   RANK() OVER (PARTITION BY venue_id, week_id ORDER BY total_points DESC) AS rank
+            FROM totals
+            WHERE weeks_played > 0
+        )
+        INSERT INTO tournament_standings
+          (venue_id, week_id, tournament_team_id, week_ending, week_points, total_points, rank, prev_rank, updated_at)
+        SELECT venue_id, week_id, team_id, week_ending, week_points, total_points, rank,
+               LAG(rank) OVER (PARTITION BY team_id ORDER BY week_ending), NOW()
+        FROM ranked;
+    """
+
+def refresh_tournament_standings(cur, venue_ids=None):
+    """
+    Recompute standings for the given home venues (every venue when None) inside the
+    caller's transaction. Returns the number of rows written.
+    """
+    if venue_ids is not None:
+        venue_ids = sorted({int(v) for v in venue_ids if v is not None})
+        if not venue_ids:
+            return 0
+    # Concurrent refreshes of the same venue would otherwise both re-insert its rows.
+    # Writes for different venues don't wait on each other; venue locks are taken in
+    # sorted order so two multi-venue refreshes can't deadlock.
+    if venue_ids is None:
+        cur.execute("SELECT pg_advisory_xact_lock(%s);", (TOURNAMENT_STANDINGS_LOCK,))
+        cur.execute("DELETE FROM tournament_standings;")
+        cur.execute(_tournament_standings_insert("home_venue_id IS NOT NULL"))
+    else:
+        cur.execute("SELECT pg_advisory_xact_lock_shared(%s);", (TOURNAMENT_STANDINGS_LOCK,))
+        cur.execute("SELECT pg_advisory_xact_lock(%s, v) FROM unnest(%s::int[]) AS v;",
+                    (TOURNAMENT_STANDINGS_LOCK, venue_ids))
+        cur.execute("DELETE FROM tournament_standings WHERE venue_id = ANY(%s);", (venue_ids,))
+        cur.execute(_tournament_standings_insert("home_venue_id = ANY(%s)"), (venue_ids,))
+    return cur.rowcount
+
+def tournament_standings_venues(cur, team_ids):
+    """Home venues of `team_ids`, plus any venue they still have standings rows under."""
+    ids = sorted({int(t) for t in team_ids or [] if t is not None})
+    if not ids:
+        return []
+    cur.execute("""
+        SELECT home_venue_id FROM tournament_teams WHERE id = ANY(%s) AND home_venue_id IS NOT NULL
+        UNION
+        SELECT venue_id FROM tournament_standings WHERE tournament_team_id = ANY(%s);
+    """, (ids, ids))
+    return [r[0] for r in cur.fetchall()]
+
+def refresh_team_standings(cur, team_ids):
+    """Refresh the standings every venue `team_ids` count towards. Returns rows written."""
+    return refresh_tournament_standings(cur, tournament_standings_venues(cur, team_ids))
+
+@app.post("/admin/tournament/standings/rebuild")
+def rebuild_tournament_standings():
+    """
+    Recompute tournament_standings from tournament_team_scores.
+    Body {"venueIds": [...]} limits it to those home venues; otherwise every venue is rebuilt.
+    """
+    auth_error = require_auth(required_roles=['admin'])
+    if auth_error:
+        return auth_error
+    d = request.get_json(silent=True) or {}
+    venue_ids = d.get("venueIds")
+    if venue_ids is not None and not isinstance(venue_ids, list):
+        return jsonify({"error": "venueIds must be an array"}), 400
+    conn = getconn()
+    try:
+        cur = conn.cursor()
+        written = refresh_tournament_standings(cur, venue_ids)
+        conn.commit()
+        return jsonify({"status": "ok", "written": written})
+    except Exception as e:
+        conn.rollback()
+        logger.exception("rebuild_tournament_standings failed")
+        return jsonify({"error": str(e)}), 500
+    finally:
+        conn.close()
+
+# ------------------------------------------------------------------------------
 # Tournament Admin (MODIFIED for PUT, NEW for validation)
 # ------------------------------------------------------------------------------
 @app.get("/admin/tournament/scores")
@@ -4208,10 +7270,11 @@ def get_tournament_scores():
             return jsonify({"rows": []})
         week_id = w[0]
         cur.execute("""
-          SELECT team_name, points, num_players, is_validated -- NEW: Include validation status
-          FROM tournament_team_scores
-          WHERE venue_id=%s AND week_id=%s
-          ORDER BY points DESC NULLS LAST, team_name ASC
+          SELECT tt.name, tts.points, tts.num_players, tts.is_validated -- NEW: Include validation status
+          FROM tournament_team_scores tts
+          JOIN tournament_teams tt ON tts.tournament_team_id = tt.id
+          WHERE tts.venue_id=%s AND tts.week_id=%s
+          ORDER BY tts.points DESC NULLS LAST, tt.name ASC
         """, (venue_id, week_id))
         rows = [{"team_name": r[0], "points": r[1], "num_players": r[2], "is_validated": r[3]} for r in cur.fetchall()]
         return jsonify({"rows": rows})
@@ -4226,44 +7289,22 @@ def parse_all_events():
     
     limit = int(request.args.get("limit", "500"))
     conn = getconn()
-    results = {"attempted":0, "success":0, "failed":0, "errors":[]}
     try:
         cur = conn.cursor()
         cur.execute("SELECT id FROM events WHERE pdf_url IS NOT NULL ORDER BY id DESC LIMIT %s;", (limit,))
         ids = [r[0] for r in cur.fetchall()]
-        cur.close()
+    finally:
         conn.close()
-        for eid in ids:
-            results["attempted"] += 1
-            try:
-                # Use current request context and pass auth forward
-                target_url = f"{request.scheme}://{request.host}/events/{eid}/parse-pdf"
-                headers = {}
-                if 'Authorization' in request.headers:
-                    headers['Authorization'] = request.headers['Authorization']
-                elif 'X-GSP-Token' in request.headers:
-                    headers['X-GSP-Token'] = request.headers['X-GSP-Token']
-                elif HOST_TOKEN:
-                    headers['X-GSP-Token'] = HOST_TOKEN
-
-                r = requests.post(target_url, headers=headers, timeout=30)
-                if r.ok:
-                    js = r.json()
-                    if js.get("status") == "success":
-                        results["success"] += 1
-                    else:
-                        results["failed"] += 1
-                        results["errors"].append({"event":eid, "msg":"parse non-success"})
-                else:
-                    results["failed"] += 1
-                    results["errors"].append({"event":eid, "msg":f"HTTP {r.status_code}"})
-            except Exception as e:
-                results["failed"] += 1
-                results["errors"].append({"event":eid, "msg":str(e)})
-        return jsonify(results)
+
+    try:
+        job_ids, skipped = _job_queue.enqueue_many(
+            "parse_pdf", [({"event_id": eid}, f"parse_pdf:{eid}") for eid in ids]
+        )
+        return jsonify({"status": "queued", "attempted": len(ids), "queued": len(job_ids),
+                        "already_queued": skipped, "jobIds": job_ids}), 202
     except Exception as e:
         logger.exception("parse_all_events failed")
-        return jsonify({"error": str(e), "partial": results}), 500
+        return jsonify({"error": str(e)}), 500
 
 @app.get("/admin/weekly-report")
 def admin_weekly_report():
@@ -4365,23 +7406,35 @@ def put_tournament_scores():
             return jsonify({"error": "week_ending not found"}), 404
         week_id = week_row[0]
 
-        # Delete existing scores for this venue and week before inserting new ones
-        cur.execute("DELETE FROM tournament_team_scores WHERE venue_id=%s AND week_id=%s;", (venue_id, week_id))
-
-        for r in rows:
-            team_name = (r.get("team_name") or "").strip()
-            points = r.get("points")
-            num_players = r.get("num_players")
+        # Only rows with a team_name are stored; names map to tournament_teams in one lookup
+        rows = [r for r in rows if (r.get("team_name") or "").strip()]
+        names = sorted({r["team_name"].strip().lower() for r in rows})
+        ids_by_name = {}
+        if names:
+            cur.execute("SELECT lower(name), id FROM tournament_teams WHERE lower(name) = ANY(%s);", (names,))
+            for name, tid in cur.fetchall():
+                ids_by_name.setdefault(name, tid)
+        missing = [r["team_name"].strip() for r in rows if r["team_name"].strip().lower() not in ids_by_name]
+        if missing:
+            return jsonify({"error": f"Team '{missing[0]}' not found in tournament_teams"}), 404
 
-            if team_name: # Only insert if team_name is provided
-                cur.execute(
-                    """
-                    INSERT INTO tournament_team_scores
-                      (team_name, venue_id, week_id, points, num_players, is_validated)
-                    VALUES (%s,%s,%s,%s,%s,FALSE) -- NEW: Always FALSE by default when scores are updated
-                    """,
-                    (team_name, venue_id, week_id, points, num_players)
-                )
+        # Delete existing scores for this venue and week before inserting new ones
+        cur.execute(
+            "DELETE FROM tournament_team_scores WHERE venue_id=%s AND week_id=%s RETURNING tournament_team_id;",
+            (venue_id, week_id)
+        )
+        team_ids = [r[0] for r in cur.fetchall()]
+        new_ids = [ids_by_name[r["team_name"].strip().lower()] for r in rows]
+        cur.execute(
+            """
+            INSERT INTO tournament_team_scores
+              (tournament_team_id, venue_id, week_id, points, num_players, is_validated)
+            SELECT t.team_id, %s, %s, t.points, t.num_players, FALSE -- Always FALSE by default when scores are updated
+            FROM unnest(%s::int[], %s::int[], %s::int[]) AS t(team_id, points, num_players);
+            """,
+            (venue_id, week_id, new_ids, [r.get("points") for r in rows], [r.get("num_players") for r in rows])
+        )
+        refresh_team_standings(cur, team_ids + new_ids)
         conn.commit()
         return jsonify({"status": "ok", "count": len(rows)})
     except Exception as e:
@@ -4459,37 +7512,42 @@ def validate_tournament_scores(venue_id, week_ending):
 
         event_id = event_row[0]
 
-        # 4. Insert into tournament_team_scores, mapping team_name to tournament_team_id
-        inserted = 0
+        # 4. Map team_name to tournament_team_id (one lookup for every name without a team_id)
+        names = sorted({t["team_name"].lower() for t in teams if not t.get("team_id") and t.get("team_name")})
+        ids_by_name = {}
+        if names:
+            cur.execute("SELECT lower(name), id FROM tournament_teams WHERE lower(name) = ANY(%s);", (names,))
+            for name, tid in cur.fetchall():
+                ids_by_name.setdefault(name, tid)
+        team_ids = []
         for team in teams:
             team_name = team.get("team_name")
             team_id = team.get("team_id")  # Use if provided
-
-            # Map if team_id not provided
             if not team_id and team_name:
-                cur.execute("SELECT id FROM tournament_teams WHERE lower(name) = lower(%s);", (team_name,))
-                id_row = cur.fetchone()
-                if not id_row:
+                team_id = ids_by_name.get(team_name.lower())
+                if team_id is None:
                     return jsonify({"error": f"Team '{team_name}' not found in tournament_teams"}), 404
-                team_id = id_row[0]
+            team_ids.append(team_id)
 
-            # Insert (adjust if you want upsert instead of insert)
-            cur.execute(
-                """
-                INSERT INTO tournament_team_scores 
-                    (tournament_team_id, venue_id, week_id, event_id, points, num_players, is_validated, updated_at)
-                VALUES (%s, %s, %s, %s, %s, %s, true, NOW());
-                """,
-                (
-                    team_id,
-                    venue_id,
-                    week_id,
-                    event_id,
-                    team.get("score"),  # Maps to points
-                    team.get("num_players"),
-                )
+        # 5. Insert every row in one statement (adjust if you want upsert instead of insert)
+        cur.execute(
+            """
+            INSERT INTO tournament_team_scores
+                (tournament_team_id, venue_id, week_id, event_id, points, num_players, is_validated, updated_at)
+            SELECT t.team_id, %s, %s, %s, t.points, t.num_players, true, NOW()
+            FROM unnest(%s::int[], %s::int[], %s::int[]) AS t(team_id, points, num_players);
+            """,
+            (
+                venue_id,
+                week_id,
+                event_id,
+                team_ids,
+                [t.get("score") for t in teams],  # Maps to points
+                [t.get("num_players") for t in teams],
             )
-            inserted += 1
+        )
+        inserted = len(team_ids)
+        refresh_team_standings(cur, team_ids)
 
         conn.commit()
         return jsonify({
@@ -4507,6 +7565,75 @@ def validate_tournament_scores(venue_id, week_ending):
     finally:
         conn.close()        
         
+# ------- Bulk-upload helpers (set-based: one statement per entity) -------
+def resolve_host_ids(cur, names):
+    """
+    {lower(name): host_id} for every name in `names`, creating the missing hosts with a
+    single INSERT (first spelling seen wins). Returns (ids, hosts_created).
+    """
+    wanted = {}
+    for n in names:
+        wanted.setdefault(n.lower(), n)
+    ids = {(r[1] or "").lower(): r[0] for r in ref_hosts()}
+    missing = [k for k in wanted if k not in ids]
+    created = 0
+    if missing:
+        cur.execute("SELECT lower(name), id FROM hosts WHERE lower(name) = ANY(%s);", (missing,))
+        for key, hid in cur.fetchall():
+            ids.setdefault(key, hid)
+        new_names = [wanted[k] for k in missing if k not in ids]
+        if new_names:
+            cur.execute("""
+                INSERT INTO hosts (name) SELECT unnest(%s::text[])
+                ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
+                RETURNING lower(name), id, (xmax = 0);
+            """, (new_names,))
+            for key, hid, inserted in cur.fetchall():
+                ids[key] = hid
+                created += bool(inserted)
+    return {k: ids[k] for k in wanted}, created
+
+def insert_events_skip_existing(cur, columns, rows):
+    """
+    Insert `rows` into events in one statement. `columns` is [(name, pg_type), ...] and must
+    include venue_id and event_date (a date). A row whose (venue_id, event_date) already
+    exists, or repeats an earlier row, is skipped.
+    Returns one (event_id, inserted) per row; event_id is the existing event's for skipped rows.
+    """
+    if not rows:
+        return []
+    names = [c[0] for c in columns]
+    vi, di = names.index("venue_id"), names.index("event_date")
+    cur.execute(f"""
+        INSERT INTO events ({", ".join(names)})
+        SELECT {", ".join("b." + n for n in names)}
+        FROM unnest({", ".join(f"%s::{t}[]" for _, t in columns)}) WITH ORDINALITY AS b({", ".join(names)}, ord)
+        ORDER BY b.ord
+        ON CONFLICT (venue_id, event_date) DO NOTHING
+        RETURNING id, venue_id, event_date;
+    """, tuple(list(c) for c in zip(*rows)))
+    inserted = {(r[1], r[2]): r[0] for r in cur.fetchall()}
+
+    keys = [(row[vi], row[di]) for row in rows]
+    existing = [k for k in dict.fromkeys(keys) if k not in inserted]
+    existing_ids = {}
+    if existing:
+        cur.execute("""
+            SELECT e.id, e.venue_id, e.event_date
+            FROM events e
+            JOIN unnest(%s::int[], %s::date[]) AS k(venue_id, event_date)
+              ON e.venue_id = k.venue_id AND e.event_date = k.event_date;
+        """, ([k[0] for k in existing], [k[1] for k in existing]))
+        existing_ids = {(r[1], r[2]): r[0] for r in cur.fetchall()}
+    out, claimed = [], set()
+    for key in keys:
+        if key in inserted and key not in claimed:
+            claimed.add(key)
+            out.append((inserted[key], True))
+        else:
+            out.append((inserted.get(key) or existing_ids.get(key), False))
+    return out
+
 @app.post("/admin/bulk-upload-tournament-teams")
 def admin_bulk_upload_tournament_teams():
     """
@@ -4514,6 +7641,8 @@ def admin_bulk_upload_tournament_teams():
       - Tournament teams (upsert with venue matching, no venue creation)
       - Events: skip duplicates; new ones are auto-validated and marked 'posted'
     Duplicate event rule: same venue_id and event_date already exists.
+    Rows are checked in Python first (each bad row gets its own error entry); the good
+    ones are then written with one statement per entity.
     Body:
       {
         "teams": [ { Name, HomeVenue, DefaultNight, CaptainName, CaptainEmail, CaptainCell, PlayerCount } ],
@@ -4554,41 +7683,44 @@ def admin_bulk_upload_tournament_teams():
     try:
         cur = conn.cursor()
 
-        # ------- Venue cache for team fuzzy matching -------
-        cur.execute("SELECT id, name, default_day FROM venues;")
-        all_venues_db_rows = cur.fetchall()
-
-        venue_exact_normalized_lookup = {}
-        venue_fuzzy_list = []
-        for v_id, v_name, v_default_day in all_venues_db_rows:
-            normalized_name = re.sub(r"[^a-z0-9\s]", "", (v_name or "").lower())
-            venue_exact_normalized_lookup[normalized_name] = v_id
-            venue_fuzzy_list.append({
-                "id": v_id,
-                "name_raw": v_name or "",
-                "name_lower": (v_name or "").lower(),
-                "name_normalized": normalized_name,
-                "default_day_lower": (v_default_day or "").lower()
-            })
+        # ------- Venue lookups for team HomeVenue matching -------
+        all_venues_db_rows = ref_venues()
+        venue_ids_by_lower = {(r[1] or "").lower(): r[0] for r in all_venues_db_rows}
+        venue_exact_normalized_lookup = {normalize_name(r[1]): r[0] for r in all_venues_db_rows}
+
+        # A season file repeats the same few venue spellings; resolve each one only once.
+        home_venue_matches = {}
+
+        def match_home_venue(home_venue_name_raw: str, default_night_raw: str):
+            """(venue_id, None) or (None, error message) for a team's HomeVenue."""
+            input_norm = normalize_name(home_venue_name_raw)
+            target_day = (default_night_raw or "").lower()
+            memo_key = (input_norm, target_day)
+            if memo_key in home_venue_matches:
+                return home_venue_matches[memo_key]
+
+            # exact normalized, then fuzzy among venues on the team's default night
+            match = (venue_exact_normalized_lookup.get(input_norm), None)
+            if match[0] is None:
+                candidates = name_candidates(
+                    cur, "venues", home_venue_name_raw,
+                    where="lower(COALESCE(default_day, '')) = %s", params=(target_day,),
+                    min_score=BULK_VENUE_MATCH_MIN_SCORE,
+                )
+                best, ambiguous = pick_name_match(candidates, accept=BULK_VENUE_MATCH_ACCEPT_SCORE)
+                if best:
+                    match = (best["id"], None)
+                    logger.info(f"Fuzzy matched '{home_venue_name_raw}' -> '{best['name']}' ({best['score']:.2f})")
+                elif ambiguous:
+                    names = [c["name"] for c in ambiguous]
+                    match = (None, f"HomeVenue '{home_venue_name_raw}' ambiguous: {', '.join(names)}")
+                else:
+                    match = (None, f"HomeVenue '{home_venue_name_raw}' not found (fuzzy)")
+            home_venue_matches[memo_key] = match
+            return match
 
-        # ------- Helper: resolve host/venue ids by name (create if missing for hosts, not venues) -------
-        def resolve_host_id(name: str) -> int:
-            cur.execute("SELECT id FROM hosts WHERE lower(name)=lower(%s);", (name,))
-            r = cur.fetchone()
-            if r:
-                return r[0]
-            cur.execute("INSERT INTO hosts (name) VALUES (%s) RETURNING id;", (name,))
-            return cur.fetchone()[0]
-
-        def resolve_venue_id_strict(name: str) -> int:
-            cur.execute("SELECT id FROM venues WHERE lower(name)=lower(%s);", (name,))
-            r = cur.fetchone()
-            if r:
-                return r[0]
-            # Do NOT create new venues here
-            raise ValueError(f"Venue '{name}' not found")
-
-        # ------- TEAMS: upsert with fuzzy venue matching (no venue creation) -------
+        # ------- TEAMS: validate rows, then one upsert for all of them -------
+        staged_teams = {}  # lower(name) -> row; a later row for the same team replaces an earlier one
         for team_entry in teams_data:
             results["teams"]["total_attempted"] += 1
             try:
@@ -4602,61 +7734,26 @@ def admin_bulk_upload_tournament_teams():
 
                 if not team_name:
                     raise ValueError("Team 'Name' is required")
+                if player_count in ("", None):
+                    player_count = None
+                else:
+                    try:
+                        player_count = int(player_count)
+                    except (TypeError, ValueError):
+                        raise ValueError(f"PlayerCount '{player_count}' is not a number")
 
                 home_venue_id = None
                 if home_venue_name_raw:
-                    input_norm = re.sub(r"[^a-z0-9\s]", "", home_venue_name_raw.lower())
-                    target_day = (default_night_raw or "").lower()
-
-                    # exact normalized
-                    home_venue_id = venue_exact_normalized_lookup.get(input_norm)
-                    # fuzzy with default night filter
-                    if home_venue_id is None:
-                        candidates = []
-                        for v in venue_fuzzy_list:
-                            if v["default_day_lower"] == target_day:
-                                ratio = difflib.SequenceMatcher(None, input_norm, v["name_normalized"]).ratio()
-                                if ratio > 0.6:
-                                    candidates.append((v, ratio))
-                        candidates.sort(key=lambda x: x[1], reverse=True)
-                        if candidates and candidates[0][1] > 0.7:
-                            best, best_ratio = candidates[0]
-                            ambiguous = len(candidates) > 1 and (best_ratio - candidates[1][1] < 0.1)
-                            if not ambiguous:
-                                home_venue_id = best["id"]
-                                logger.info(f"Fuzzy matched '{home_venue_name_raw}' -> '{best['name_raw']}' ({best_ratio:.2f})")
-                            else:
-                                results["teams"]["venues_not_found"] += 1
-                                names = [d["name_raw"] for d, r in candidates if r > 0.6]
-                                raise ValueError(f"HomeVenue '{home_venue_name_raw}' ambiguous: {', '.join(names)}")
-                        else:
-                            results["teams"]["venues_not_found"] += 1
-                            raise ValueError(f"HomeVenue '{home_venue_name_raw}' not found (fuzzy)")
-
-                # Upsert team by name
-                cur.execute("SELECT id FROM tournament_teams WHERE lower(name)=lower(%s);", (team_name,))
-                row = cur.fetchone()
-                if row:
-                    cur.execute(
-                        """
-                        UPDATE tournament_teams
-                           SET home_venue_id=%s, captain_name=%s, captain_email=%s,
-                               captain_phone=%s, player_count=%s
-                         WHERE id=%s
-                        """,
-                        (home_venue_id, captain_name, captain_email, captain_phone, player_count, row[0])
-                    )
+                    home_venue_id, venue_error = match_home_venue(home_venue_name_raw, default_night_raw)
+                    if venue_error:
+                        results["teams"]["venues_not_found"] += 1
+                        raise ValueError(venue_error)
+
+                key = team_name.lower()
+                if key in staged_teams:
+                    # the earlier row would have been written and then updated by this one
                     results["teams"]["teams_updated"] += 1
-                else:
-                    cur.execute(
-                        """git
-                        INSERT INTO tournament_teams
-                            (name, home_venue_id, captain_name, captain_email, captain_phone, player_count)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                        """,
-                        (team_name, home_venue_id, captain_name, captain_email, captain_phone, player_count)
-                    )
-                    results["teams"]["teams_created"] += 1
+                staged_teams[key] = (team_name, home_venue_id, captain_name, captain_email, captain_phone, player_count)
 
             except Exception as e:
                 results["teams"]["skipped_errors"] += 1
@@ -4664,66 +7761,101 @@ def admin_bulk_upload_tournament_teams():
                 results["teams"]["errors"].append(f"Team '{tn}': {e}")
                 logger.error(f"Bulk team error: {e}", exc_info=True)
 
-        # ------- EVENTS: skip duplicates, auto-validate/post new -------
-        for ev in events_data:
+        if staged_teams:
+            # Existing teams match case-insensitively and keep their stored spelling, so the
+            # upsert conflicts on the exact name.
+            cols = [list(c) for c in zip(*staged_teams.values())]
+            cur.execute("""
+                INSERT INTO tournament_teams
+                    (name, home_venue_id, captain_name, captain_email, captain_phone, player_count)
+                SELECT COALESCE(t.name, b.name), b.home_venue_id, b.captain_name, b.captain_email,
+                       b.captain_phone, b.player_count
+                FROM unnest(%s::text[], %s::int[], %s::text[], %s::text[], %s::text[], %s::int[])
+                     AS b(name, home_venue_id, captain_name, captain_email, captain_phone, player_count)
+                LEFT JOIN LATERAL (
+                    SELECT name FROM tournament_teams WHERE lower(name) = lower(b.name) ORDER BY id LIMIT 1
+                ) t ON true
+                ON CONFLICT (name) DO UPDATE
+                   SET home_venue_id = EXCLUDED.home_venue_id, captain_name = EXCLUDED.captain_name,
+                       captain_email = EXCLUDED.captain_email, captain_phone = EXCLUDED.captain_phone,
+                       player_count = EXCLUDED.player_count
+                RETURNING (xmax = 0);
+            """, tuple(cols))
+            for (created,) in cur.fetchall():
+                results["teams"]["teams_created" if created else "teams_updated"] += 1
+            # Home venues may have moved: refresh both the new venues and the ones the teams left
+            cur.execute("""
+                SELECT DISTINCT s.venue_id FROM tournament_standings s
+                JOIN tournament_teams tt ON tt.id = s.tournament_team_id
+                WHERE lower(tt.name) = ANY(%s);
+            """, (list(staged_teams),))
+            refresh_tournament_standings(cur, [r[0] for r in cur.fetchall()] + cols[1])
+
+        # ------- EVENTS: validate rows, resolve names in bulk, insert skipping duplicates -------
+        staged_events = []
+        event_errors = []  # (row index, message): reported in payload order
+        for i, ev in enumerate(events_data):
             results["events"]["total_attempted"] += 1
             try:
                 host_name = (ev.get("hostName") or "").strip()
                 venue_name = (ev.get("venueName") or "").strip()
                 event_date = (ev.get("eventDate") or "").strip()  # YYYY-MM-DD
-                highlights = ev.get("highlights") or ""
-                pdf_url = ev.get("pdfUrl") or ""
-                photo_urls = ev.get("photoUrls") or []
-
                 if not host_name or not venue_name or not event_date:
                     raise ValueError("hostName, venueName, and eventDate are required")
-
-                host_id = resolve_host_id(host_name)
-                venue_id = resolve_venue_id_strict(venue_name)
-
-                # Duplicate check: venue_id + event_date
-                cur.execute(
-                    "SELECT id FROM events WHERE venue_id=%s AND event_date=%s LIMIT 1;",
-                    (venue_id, event_date),
-                )
-                existing = cur.fetchone()
-                if existing:
-                    results["events"]["duplicates_skipped"] += 1
-                    if len(results["events"]["duplicate_samples"]) < 20:
-                        results["events"]["duplicate_samples"].append(existing[0])
-                    continue
-
-                # Insert event
-                cur.execute(
-                    """
-                    INSERT INTO events (host_id, venue_id, event_date, highlights, pdf_url, status)
-                    VALUES (%s,%s,%s,%s,%s,'ready') RETURNING id;
-                    """,
-                    (host_id, venue_id, event_date, highlights, pdf_url),
-                )
-                event_id = cur.fetchone()[0]
-
-                # Insert photos
-                for url in photo_urls:
-                    cur.execute(
-                        "INSERT INTO event_photos (event_id, photo_url) VALUES (%s,%s);",
-                        (event_id, url),
-                    )
-
-                # Auto-validate/post: set status to 'posted' and stamp fb_event_url
-                cur.execute(
-                    "UPDATE events SET status='posted', fb_event_url=COALESCE(fb_event_url, 'historical-import') WHERE id=%s;",
-                    (event_id,),
-                )
-
-                results["events"]["inserted"] += 1
-                results["events"]["inserted_ids"].append(event_id)
-
+                try:
+                    event_date = date.fromisoformat(event_date)
+                except ValueError:
+                    raise ValueError(f"eventDate '{event_date}' is not YYYY-MM-DD")
+                staged_events.append((i, ev, host_name, venue_name, event_date))
             except Exception as e:
-                results["events"]["errors"].append(str(e))
+                event_errors.append((i, str(e)))
                 logger.error(f"Bulk event error: {e}", exc_info=True)
 
+        # Venues are never created here: unknown names fail their rows.
+        unknown = sorted({s[3].lower() for s in staged_events} - venue_ids_by_lower.keys())
+        if unknown:
+            cur.execute("SELECT lower(name), id FROM venues WHERE lower(name) = ANY(%s);", (unknown,))
+            for key, vid in cur.fetchall():
+                venue_ids_by_lower.setdefault(key, vid)
+        resolvable = []
+        for s in staged_events:
+            if s[3].lower() in venue_ids_by_lower:
+                resolvable.append(s)
+            else:
+                event_errors.append((s[0], f"Venue '{s[3]}' not found"))
+        results["events"]["errors"] = [msg for _, msg in sorted(event_errors)]
+        host_ids, _ = resolve_host_ids(cur, [s[2] for s in resolvable])
+
+        written = insert_events_skip_existing(cur, [
+            ("host_id", "int"), ("venue_id", "int"), ("event_date", "date"), ("highlights", "text"),
+            ("pdf_url", "text"), ("status", "text"), ("fb_event_url", "text"),
+        ], [(
+            host_ids[host_name.lower()], venue_ids_by_lower[venue_name.lower()], event_date,
+            ev.get("highlights") or "", ev.get("pdfUrl") or "",
+            # Auto-validate/post: historical imports go straight to 'posted'
+            "posted", "historical-import",
+        ) for _, ev, host_name, venue_name, event_date in resolvable])
+
+        photo_event_ids, photo_urls = [], []
+        for (_, ev, *_), (event_id, inserted) in zip(resolvable, written):
+            if not inserted:
+                results["events"]["duplicates_skipped"] += 1
+                if len(results["events"]["duplicate_samples"]) < 20:
+                    results["events"]["duplicate_samples"].append(event_id)
+                continue
+            results["events"]["inserted"] += 1
+            results["events"]["inserted_ids"].append(event_id)
+            for url in ev.get("photoUrls") or []:
+                photo_event_ids.append(event_id)
+                photo_urls.append(url)
+        if photo_urls:
+            cur.execute(
+                "INSERT INTO event_photos (event_id, photo_url) SELECT * FROM unnest(%s::int[], %s::text[]);",
+                (photo_event_ids, photo_urls),
+            )
+
         conn.commit()
+        _ref_cache.invalidate("hosts", "tournament_teams")
         return jsonify({"status": "ok", "summary": results})
 
     except Exception as e:
@@ -4788,11 +7920,6 @@ def admin_bulk_upload_summary_events():
         if not cur.fetchone():
             return jsonify({"error": f"Target venue with ID {target_venue_id} not found."}), 404
 
-        # Fetch all hosts once for quick lookup
-        cur.execute("SELECT id, name FROM hosts;")
-        all_hosts = cur.fetchall()
-        host_lookup = { (name or "").lower(): host_id for host_id, name in all_hosts }
-
         def parse_date_flex(s: str):
             s = (s or "").strip()
             if not s:
@@ -4817,60 +7944,50 @@ def admin_bulk_upload_summary_events():
                 pass
             raise ValueError(f"Unrecognized date format: {s}")
 
+        def opt_int(v, label):
+            if v in ("", None):
+                return None
+            try:
+                return int(v)
+            except (TypeError, ValueError):
+                raise ValueError(f"'{label}' must be a number, got {v!r}")
+
+        # Validate every row first; the valid ones are written with one statement per table.
+        staged = []
         for row in events_data:
             results["total_attempted"] += 1
             try:
                 date_raw = str(row.get("Date") or "").strip()
                 host_name_raw = str(row.get("Host") or "").strip()
-                num_people = row.get("# of people")
-                num_teams = row.get("# of teams")
                 comments = str(row.get("Comments") or "").strip()
 
                 if not date_raw or not host_name_raw:
                     raise ValueError("Date and Host are required for each row.")
 
                 event_date = parse_date_flex(date_raw)
-
-                # Find or create host
-                host_key = host_name_raw.lower()
-                host_id = host_lookup.get(host_key)
-                if host_id is None:
-                    cur.execute("INSERT INTO hosts (name) VALUES (%s) RETURNING id;", (host_name_raw,))
-                    host_id = cur.fetchone()[0]
-                    host_lookup[host_key] = host_id
-                    results["hosts_created"] += 1
-
-                # Check for existing event (venue_id + date)
-                cur.execute(
-                    "SELECT id FROM events WHERE venue_id=%s AND event_date=%s;",
-                    (target_venue_id, event_date)
-                )
-                if cur.fetchone():
-                    results["events_skipped_existing"] += 1
-                    continue
-
-                # Insert new event
-                cur.execute(
-                    """
-                    INSERT INTO events (
-                        host_id, venue_id, event_date, highlights,
-                        total_players, total_teams,
-                        status, is_validated, created_at
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW())
-                    RETURNING id;
-                    """,
-                    (host_id, target_venue_id, event_date, comments,
-                     num_people, num_teams, status_val, mark_validated)
-                )
-                new_event_id = cur.fetchone()[0]
-                results["events_created"] += 1
+                num_people = opt_int(row.get("# of people"), "# of people")
+                num_teams = opt_int(row.get("# of teams"), "# of teams")
+                staged.append((host_name_raw, event_date, comments, num_people, num_teams))
 
             except Exception as e:
                 results["skipped_errors"] += 1
                 label = f"{row.get('Date','?')} - {row.get('Host','?')}"
                 results["errors"].append(f"Row '{label}': {str(e)}")
 
+        # Find or create hosts, then insert events skipping existing (venue_id + date)
+        host_ids, results["hosts_created"] = resolve_host_ids(cur, [r[0] for r in staged])
+        written = insert_events_skip_existing(cur, [
+            ("host_id", "int"), ("venue_id", "int"), ("event_date", "date"), ("highlights", "text"),
+            ("total_players", "int"), ("total_teams", "int"), ("status", "text"), ("is_validated", "bool"),
+        ], [(
+            host_ids[host_name.lower()], target_venue_id, event_date, comments,
+            num_people, num_teams, status_val, mark_validated,
+        ) for host_name, event_date, comments, num_people, num_teams in staged])
+        results["events_created"] = sum(1 for _, inserted in written if inserted)
+        results["events_skipped_existing"] = len(written) - results["events_created"]
+
         conn.commit()
+        _ref_cache.invalidate("hosts")
         return jsonify({"status": "ok", "summary": results})
     except Exception as e:
         conn.rollback()
@@ -4882,6 +7999,7 @@ def admin_bulk_upload_summary_events():
 # Public tournament scores (MODIFIED to filter by is_validated)
 # ------------------------------------------------------------------------------
 @app.get("/pub/tournament/scores")
+@public_cached("tournament_weeks", "tournament_team_scores", "tournament_teams")
 def pub_scores():
     venue_id = request.args.get("venue_id")
     week_ending = request.args.get("week_ending")
@@ -4908,9 +8026,9 @@ def pub_scores():
                 tts.num_players
             FROM tournament_team_scores tts
             JOIN tournament_teams tt ON tts.tournament_team_id = tt.id
-            WHERE tts.venue_id = %s AND tts.week_ending = %s AND tts.is_validated = TRUE
+            WHERE tts.venue_id = %s AND tts.week_id = %s AND tts.is_validated = TRUE
             ORDER BY tts.points DESC NULLS LAST, tt.name ASC;
-        """, (venue_id, week_ending))
+        """, (venue_id, week_id))
         
         rows = [{"team_id": r[0], "team_name": r[1], "points": r[2], "num_players": r[3]} for r in cur.fetchall()]
         
@@ -4922,6 +8040,7 @@ def pub_scores():
         conn.close()
 
 @app.get("/pub/tournament-standings")
+@public_cached("tournament_standings", "tournament_teams")
 def get_public_standings():
     venue_id = request.args.get("venue_id")
     if not venue_id:
@@ -4930,19 +8049,29 @@ def get_public_standings():
     conn = getconn()
     try:
         cur = conn.cursor()
-        # Sums all points for teams whose HOME venue is the one requested
+        # Teams whose HOME venue is the one requested, as of the venue's latest scored week
+        # (tournament_standings is kept current by every score write).
         cur.execute("""
-            SELECT
-                tt.name,
-                SUM(tts.points_gained) as total_points
-            FROM tournament_team_scores tts
-            JOIN tournament_teams tt ON tts.tournament_team_id = tt.id
-            WHERE tt.home_venue_id = %s
-            GROUP BY tt.name
-            ORDER BY total_points DESC;
-        """, (venue_id,))
+            SELECT tt.id, tt.name, s.total_points, s.week_points, s.rank, s.prev_rank, s.week_ending
+            FROM tournament_standings s
+            JOIN tournament_teams tt ON tt.id = s.tournament_team_id
+            WHERE s.venue_id = %s AND s.week_id = (
+                SELECT week_id FROM tournament_standings
+                WHERE venue_id = %s ORDER BY week_ending DESC LIMIT 1
+            )
+            ORDER BY s.rank, tt.name;
+        """, (venue_id, venue_id))
         rows = cur.fetchall()
-        standings = [{"team_name": r[0], "total_points": r[1]} for r in rows]
+        standings = [{
+            "team_id": r[0],
+            "team_name": r[1],
+            "total_points": r[2],
+            "week_points": r[3],
+            "rank": r[4],
+            # positive = moved up since the previous week; None for a team's first week
+            "rank_change": r[5] - r[4] if r[5] is not None else None,
+            "week_ending": r[6].isoformat(),
+        } for r in rows]
         return jsonify(standings)
     finally:
         conn.close()
@@ -4960,27 +8089,36 @@ def get_team_stats(team_id):
         # Authenticate and get team info
         cur.execute("SELECT name, access_key FROM tournament_teams WHERE id=%s;", (team_id,))
         team_row = cur.fetchone()
-        if not team_row or team_row[1] != key:
+        if not team_row or not access_key_matches(key, team_row[1]):
             return jsonify({"error": "Invalid team or access key"}), 403
 
-        # Fetch weekly score breakdown
+        # Fetch weekly score breakdown, with the team's standing as of each week
         cur.execute("""
             SELECT
-                tts.week_ending,
-                SUM(tts.points_gained) as weekly_points,
-                json_agg(json_build_object('venue', v.name, 'points', tts.points_gained)) as events
+                tw.week_ending,
+                SUM(tts.points) as weekly_points,
+                json_agg(json_build_object('venue', v.name, 'points', tts.points) ORDER BY v.name) as events,
+                s.total_points,
+                s.rank,
+                s.prev_rank
             FROM tournament_team_scores tts
+            JOIN tournament_weeks tw ON tts.week_id = tw.id
             JOIN venues v ON tts.venue_id = v.id
-            WHERE tts.tournament_team_id = %s
-            GROUP BY tts.week_ending
-            ORDER BY tts.week_ending DESC;
+            LEFT JOIN tournament_standings s
+              ON s.tournament_team_id = tts.tournament_team_id AND s.week_id = tts.week_id
+            WHERE tts.tournament_team_id = %s AND tts.is_validated = TRUE
+            GROUP BY tw.week_ending, s.total_points, s.rank, s.prev_rank
+            ORDER BY tw.week_ending DESC;
         """, (team_id,))
         rows = cur.fetchall()
         
         weekly_summary = [{
             "week_ending": r[0].isoformat(),
             "weekly_points": r[1],
-            "events": r[2]
+            "events": r[2],
+            "total_points": r[3],
+            "rank": r[4],
+            "rank_change": r[5] - r[4] if r[4] is not None and r[5] is not None else None,
         } for r in rows]
 
         return jsonify({"team_name": team_row[0], "weekly_summary": weekly_summary})
@@ -4988,25 +8126,26 @@ def get_team_stats(team_id):
         conn.close()
 
 @app.get("/pub/tournament/venue/<slug>/<date>")
+@public_cached("venues", "tournament_weeks", "tournament_team_scores")
 def pub_venue_week(slug, date):
     conn = getconn()
     try:
         cur = conn.cursor()
-        cur.execute("SELECT id, name FROM venues")
-        rows = cur.fetchall()
-        by_slug = { re.sub(r'[^a-z0-9]+','-', (r[1] or '').lower()).strip('-') : r for r in rows }
-        if slug not in by_slug: return jsonify({"error":"not found"}), 404
-        vid, vname = by_slug[slug]
+        cur.execute("SELECT id, name FROM venues WHERE slug=%s;", (slug,))
+        venue_row = cur.fetchone()
+        if not venue_row: return jsonify({"error":"not found"}), 404
+        vid, vname = venue_row
         
         cur.execute("SELECT id FROM tournament_weeks WHERE week_ending=%s", (date,))
         w = cur.fetchone()
         if not w: return jsonify({"venue": {"id": vid, "name": vname, "slug": slug}, "week_ending": date, "rows": []})
         week_id = w[0]
         cur.execute("""
-            SELECT team_name, points, num_players
-            FROM tournament_team_scores
-            WHERE venue_id=%s AND week_id=%s AND is_validated=TRUE -- NEW: Filter by validation
-            ORDER BY points DESC NULLS LAST, team_name ASC
+            SELECT tt.name, tts.points, tts.num_players
+            FROM tournament_team_scores tts
+            JOIN tournament_teams tt ON tts.tournament_team_id = tt.id
+            WHERE tts.venue_id=%s AND tts.week_id=%s AND tts.is_validated=TRUE -- NEW: Filter by validation
+            ORDER BY tts.points DESC NULLS LAST, tt.name ASC
         """, (vid, week_id))
         rows = [{"team_name": r[0], "points": r[1], "num_players": r[2]} for r in cur.fetchall()]
         return jsonify({"venue": {"id": vid, "name": vname, "slug": slug}, "week_ending": date, "rows": rows})
@@ -5028,26 +8167,26 @@ def pub_venue_stats_secure(slug):
 
         cur = conn.cursor()
 
-        # Fetch the specific venue by slug and verify its key.
-        cur.execute("SELECT id, name, default_day, default_time, access_key, is_active, default_host_id FROM venues;")
-        venues_raw = cur.fetchall()
+        # Fetch the specific venue by slug (unique index) and verify its key.
+        cur.execute(
+            "SELECT id, name, default_day, default_time, access_key, is_active, default_host_id FROM venues WHERE slug=%s;",
+            (slug,),
+        )
+        v = cur.fetchone()
 
         venue_info = None
-        for v in venues_raw:
+        if v:
             (v_id, v_name, v_default_day, v_default_time, v_access_key, v_is_active, v_default_host_id) = v
-            venue_slug_from_db = re.sub(r'[^a-z0-9]+', '-', (v_name or '').lower()).strip('-')
-            if venue_slug_from_db == slug:
-                venue_info = {
-                    "id": v_id, "name": v_name, "default_day": v_default_day,
-                    "default_time": v_default_time, "access_key": v_access_key,
-                    "is_active": v_is_active, "default_host_id": v_default_host_id
-                }
-                break
+            venue_info = {
+                "id": v_id, "name": v_name, "default_day": v_default_day,
+                "default_time": v_default_time, "access_key": v_access_key,
+                "is_active": v_is_active, "default_host_id": v_default_host_id
+            }
 
         if not venue_info:
             return jsonify({"error": "Venue not found or invalid URL."}), 404
         
-        if access_key != venue_info["access_key"]:
+        if not access_key_matches(access_key, venue_info["access_key"]):
             return jsonify({"error": "Invalid access key for this venue."}), 403
 
         # SQL query to fetch detailed, GSP-only stats
@@ -5137,6 +8276,7 @@ def update_current_user():
     if not display_name:
         return jsonify({"error": "display_name required"}), 400
     
+    conn = None
     try:
         conn = getconn()
         cur = conn.cursor()
@@ -5151,11 +8291,11 @@ def update_current_user():
         updated = cur.fetchone()
         conn.commit()
         cur.close()
-        conn.close()
         
         if not updated:
             return jsonify({"error": "User not found"}), 404
         
+        _auth_cache.invalidate_user(user["id"])
         log_user_activity(user["id"], "update_profile", "user", user["id"])
         
         return jsonify({
@@ -5170,6 +8310,9 @@ def update_current_user():
     except Exception as e:
         logger.exception("update_current_user failed")
         return jsonify({"error": str(e)}), 500
+    finally:
+        if conn is not None:
+            conn.close()
 
 @app.route("/api/users", methods=["GET"])
 def list_users():
@@ -5178,6 +8321,7 @@ def list_users():
     if auth_error:
         return auth_error
     
+    conn = None
     try:
         conn = getconn()
         cur = conn.cursor()
@@ -5209,7 +8353,6 @@ def list_users():
             })
         
         cur.close()
-        conn.close()
         
         log_user_activity(request.user["id"], "list_users", "users")
         
@@ -5218,6 +8361,9 @@ def list_users():
     except Exception as e:
         logger.exception("list_users failed")
         return jsonify({"error": str(e)}), 500
+    finally:
+        if conn is not None:
+            conn.close()
 
 @app.route("/api/users/<int:user_id>", methods=["PUT"])
 def update_user(user_id):
@@ -5238,6 +8384,7 @@ def update_user(user_id):
     if role and role not in ['admin', 'host', 'smm']:
         return jsonify({"error": "Invalid role. Must be admin, host, or smm"}), 400
     
+    conn = None
     try:
         conn = getconn()
         cur = conn.cursor()
@@ -5282,13 +8429,12 @@ def update_user(user_id):
         updated = cur.fetchone()
         
         if not updated:
-            conn.close()
             return jsonify({"error": "User not found"}), 404
         
         conn.commit()
         cur.close()
-        conn.close()
         
+        _auth_cache.invalidate_user(user_id)
         log_user_activity(request.user["id"], "update_user", "user", user_id)
         
         return jsonify({
@@ -5305,6 +8451,9 @@ def update_user(user_id):
     except Exception as e:
         logger.exception(f"update_user {user_id} failed")
         return jsonify({"error": str(e)}), 500
+    finally:
+        if conn is not None:
+            conn.close()
 
 @app.route("/api/users/activity", methods=["GET"])
 def get_user_activity():
@@ -5316,6 +8465,7 @@ def get_user_activity():
     limit = request.args.get("limit", 100, type=int)
     limit = min(limit, 500)  # Cap at 500
     
+    conn = None
     try:
         conn = getconn()
         cur = conn.cursor()
@@ -5345,13 +8495,15 @@ def get_user_activity():
             })
         
         cur.close()
-        conn.close()
         
         return jsonify({"activities": activities, "limit": limit})
         
     except Exception as e:
         logger.exception("get_user_activity failed")
         return jsonify({"error": str(e)}), 500
+    finally:
+        if conn is not None:
+            conn.close()
 
 # ------------------------------------------------------------------------------
 # Entrypoint 
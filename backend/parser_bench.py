@@ -0,0 +1,273 @@
+"""
+Parser regression + throughput bench over a local corpus of recap texts.
+
+  # 1. Export anonymized texts and golden team lists from the DB (needs PG* env vars)
+  python backend/parser_bench.py export --limit 200 --out backend/tests/fixtures/parse_corpus
+
+  # 2. Run every parser engine over the corpus
+  python backend/parser_bench.py run --corpus backend/tests/fixtures/parse_corpus --repeat 5 --show-diffs
+
+Corpus layout: <name>.txt (raw extracted text) + <name>.golden.json ({"teams": [...]}).
+Golden teams come from event_participation (what admins validated), falling back to
+the logged parse when an event has no participation rows.
+"""
+import argparse
+import glob
+import gzip
+import json
+import os
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+
+try:
+    import app as appmod
+except ImportError:  # run as `python -m backend.parser_bench` or imported by tests
+    from backend import app as appmod
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests", "fixtures", "parse_corpus")
+GOLDEN_FIELDS = ("position", "name", "score", "playerCount", "isTournament", "isVisiting")
+
+
+# ------------------------------------------------------------------------------
+# Corpus I/O
+# ------------------------------------------------------------------------------
+def load_corpus(corpus_dir):
+    """Return [(doc_name, raw_text, golden_teams_or_None)] sorted by name."""
+    docs = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "*.txt"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        with open(path, encoding="utf-8") as f:
+            raw = f.read()
+        golden = None
+        gpath = os.path.join(corpus_dir, name + ".golden.json")
+        if os.path.exists(gpath):
+            with open(gpath, encoding="utf-8") as f:
+                golden = json.load(f).get("teams")
+        docs.append((name, raw, golden))
+    return docs
+
+
+def _norm_name(name):
+    return re.sub(r"\s+", " ", str(name or "")).strip().lower()
+
+
+def normalize_teams(teams):
+    out = []
+    for t in teams or []:
+        row = {k: t.get(k) for k in GOLDEN_FIELDS}
+        row["name"] = _norm_name(row["name"])
+        row["playerCount"] = row["playerCount"] or 0
+        row["isTournament"] = bool(row["isTournament"])
+        row["isVisiting"] = bool(row["isVisiting"])
+        out.append(row)
+    return sorted(out, key=lambda r: (r["position"] or 999, r["name"]))
+
+
+def diff_teams(golden, parsed):
+    """List of human-readable differences between golden and parsed team lists ([] = match)."""
+    g = {r["name"]: r for r in normalize_teams(golden)}
+    p = {r["name"]: r for r in normalize_teams(parsed)}
+    diffs = []
+    for name in g.keys() - p.keys():
+        diffs.append(f"missing: {name}")
+    for name in p.keys() - g.keys():
+        diffs.append(f"extra: {name}")
+    for name in sorted(g.keys() & p.keys()):
+        for k in GOLDEN_FIELDS:
+            if g[name][k] != p[name][k]:
+                diffs.append(f"{name}: {k} expected {g[name][k]!r} got {p[name][k]!r}")
+    return sorted(diffs)
+
+
+# ------------------------------------------------------------------------------
+# export
+# ------------------------------------------------------------------------------
+def _anonymizer(names):
+    """Replace each known name (longest first, case-insensitive) with a stable pseudonym."""
+    mapping = {}
+    for n in sorted({n for n in names if n and len(n.strip()) >= 2}, key=len, reverse=True):
+        mapping.setdefault(n.strip(), f"Team {len(mapping) + 1:03d}")
+    pattern = re.compile("|".join(re.escape(n) for n in mapping), re.IGNORECASE) if mapping else None
+    lower_map = {k.lower(): v for k, v in mapping.items()}
+
+    def apply(text):
+        if not pattern or not text:
+            return text
+        return pattern.sub(lambda m: lower_map.get(m.group(0).lower(), m.group(0)), text)
+    return apply
+
+
+def cmd_export(args):
+    os.makedirs(args.out, exist_ok=True)
+    conn = appmod.getconn()
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT DISTINCT ON (l.event_id) l.event_id, l.raw_text_gz, l.parsed_json,
+                   v.name AS venue_name, h.name AS host_name
+            FROM event_parse_log l
+            JOIN events e ON e.id = l.event_id
+            LEFT JOIN venues v ON v.id = e.venue_id
+            LEFT JOIN hosts h ON h.id = e.host_id
+            WHERE l.raw_text_gz IS NOT NULL
+            ORDER BY l.event_id DESC, l.created_at DESC
+            LIMIT %s;
+        """, (args.limit,))
+        rows = cur.fetchall()
+        written = 0
+        for idx, (event_id, raw_gz, parsed_json, venue_name, host_name) in enumerate(rows, start=1):
+            raw = gzip.decompress(raw_gz).decode("utf-8", errors="replace")
+            cur.execute("""
+                SELECT team_name, score, position, num_players, is_tournament, is_visiting
+                FROM event_participation WHERE event_id=%s ORDER BY position NULLS LAST, id;
+            """, (event_id,))
+            part = cur.fetchall()
+            if part:
+                golden = [{"name": r[0], "score": r[1], "position": r[2], "playerCount": r[3] or 0,
+                           "isTournament": bool(r[4]), "isVisiting": bool(r[5])} for r in part]
+            else:
+                parsed = json.loads(parsed_json) if isinstance(parsed_json, str) else (parsed_json or {})
+                golden = parsed.get("teams") or []
+
+            anon = _anonymizer([t["name"] for t in golden])
+            text = anon(raw)
+            for label, value in (("Venue", venue_name), ("Host", host_name)):
+                if value and len(value.strip()) >= 3:
+                    text = re.sub(re.escape(value.strip()), f"{label} Name", text, flags=re.IGNORECASE)
+            golden = [dict(t, name=anon(t["name"])) for t in golden]
+
+            name = f"doc_{idx:04d}"
+            with open(os.path.join(args.out, name + ".txt"), "w", encoding="utf-8") as f:
+                f.write(text)
+            with open(os.path.join(args.out, name + ".golden.json"), "w", encoding="utf-8") as f:
+                json.dump({"teams": golden}, f, indent=2, default=str)
+            written += 1
+        print(f"exported {written} documents to {args.out}")
+    finally:
+        conn.close()
+    return 0
+
+
+# ------------------------------------------------------------------------------
+# run
+# ------------------------------------------------------------------------------
+def _percentile(sorted_vals, pct):
+    if not sorted_vals:
+        return 0.0
+    k = min(len(sorted_vals) - 1, max(0, int(round(pct / 100.0 * (len(sorted_vals) - 1)))))
+    return sorted_vals[k]
+
+
+def bench_engine(engine, docs, repeat=3):
+    """
+    Parse every doc `repeat` times with `engine` ("auto" = detection). Returns a result dict:
+    throughput, latency percentiles (ms), tracemalloc peak (KiB), accuracy vs golden, diffs.
+    """
+    forced = None if engine == "auto" else engine
+    latencies = []
+    t_total = 0.0
+    results = {}
+    for _ in range(max(1, repeat)):
+        for name, raw, _golden in docs:
+            t0 = time.perf_counter()
+            parsed = appmod.parse_raw_text(raw, engine=forced)
+            dt = time.perf_counter() - t0
+            t_total += dt
+            latencies.append(dt * 1000)
+            results[name] = parsed
+
+    # Separate pass for memory: tracemalloc slows parsing too much to time under it.
+    tracemalloc.start()
+    for _name, raw, _golden in docs:
+        appmod.parse_raw_text(raw, engine=forced)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    diffs = {}
+    graded = 0
+    for name, _raw, golden in docs:
+        if golden is None:
+            continue
+        graded += 1
+        d = diff_teams(golden, results[name]["teams"])
+        if d:
+            diffs[name] = d
+    latencies.sort()
+    return {
+        "engine": engine,
+        "docs": len(docs),
+        "runs": len(latencies),
+        "docs_per_sec": round(len(latencies) / t_total, 1) if t_total else None,
+        "p50_ms": round(_percentile(latencies, 50), 3),
+        "p90_ms": round(_percentile(latencies, 90), 3),
+        "p99_ms": round(_percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        "mean_ms": round(statistics.mean(latencies), 3) if latencies else 0.0,
+        "peak_kib": round(peak / 1024, 1),
+        "graded": graded,
+        "exact": graded - len(diffs),
+        "accuracy": round((graded - len(diffs)) / graded, 4) if graded else None,
+        "engines_used": sorted({r.get("engine") or "none" for r in results.values()}),
+        "diffs": diffs,
+    }
+
+
+def cmd_run(args):
+    docs = load_corpus(args.corpus)
+    if not docs:
+        print(f"no *.txt documents in {args.corpus}", file=sys.stderr)
+        return 2
+    engines = ["auto"] + sorted(appmod.PARSER_ENGINES) if args.engine == "all" else [args.engine]
+    reports = [bench_engine(e, docs, repeat=args.repeat) for e in engines]
+
+    if args.json:
+        print(json.dumps({"parser_version": appmod.PARSER_VERSION, "reports": reports}, indent=2))
+    else:
+        print(f"corpus={args.corpus} docs={len(docs)} parser_version={appmod.PARSER_VERSION}")
+        print(f"{'engine':20s} {'docs/s':>9s} {'p50ms':>8s} {'p90ms':>8s} {'p99ms':>8s} {'maxms':>8s} {'peakKiB':>9s} {'exact':>9s}")
+        for r in reports:
+            exact = f"{r['exact']}/{r['graded']}"
+            print(f"{r['engine']:20s} {r['docs_per_sec'] or 0:9.1f} {r['p50_ms']:8.3f} {r['p90_ms']:8.3f} "
+                  f"{r['p99_ms']:8.3f} {r['max_ms']:8.3f} {r['peak_kib']:9.1f} {exact:>9s}")
+        if args.show_diffs:
+            for r in reports:
+                for name, d in sorted(r["diffs"].items()):
+                    print(f"\n[{r['engine']}] {name}")
+                    for line in d[:args.max_diff_lines]:
+                        print(f"  {line}")
+
+    auto = next((r for r in reports if r["engine"] == "auto"), reports[0])
+    if args.fail_under is not None and auto["accuracy"] is not None and auto["accuracy"] < args.fail_under:
+        print(f"accuracy {auto['accuracy']} below --fail-under {args.fail_under}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    ex = sub.add_parser("export", help="export anonymized parse-log texts + golden outputs from the DB")
+    ex.add_argument("--out", default=DEFAULT_CORPUS)
+    ex.add_argument("--limit", type=int, default=200)
+    ex.set_defaults(func=cmd_export)
+
+    rn = sub.add_parser("run", help="benchmark parser engines over a corpus")
+    rn.add_argument("--corpus", default=DEFAULT_CORPUS)
+    rn.add_argument("--engine", default="all", help="'all', 'auto' or an engine name from PARSER_ENGINES")
+    rn.add_argument("--repeat", type=int, default=3)
+    rn.add_argument("--json", action="store_true")
+    rn.add_argument("--show-diffs", action="store_true")
+    rn.add_argument("--max-diff-lines", type=int, default=20)
+    rn.add_argument("--fail-under", type=float, default=None, help="exit 1 if auto-engine accuracy is below this")
+    rn.set_defaults(func=cmd_run)
+
+    args = ap.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
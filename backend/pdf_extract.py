@@ -0,0 +1,65 @@
+"""
+PDF text extraction that runs inside a worker process (see PdfExtractor in app.py).
+
+Kept separate from app.py on purpose: worker processes are spawned, and importing
+this module only pulls in pdfminer/pypdf, not Flask, Firebase or the DB pool.
+"""
+import os
+import time
+from io import BytesIO
+
+from pdfminer.high_level import extract_text
+from pypdf import PdfReader
+
+
+def _current_vm_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return 0
+
+
+def init_worker(mem_limit_mb):
+    """
+    Pool initializer: cap this process's address space at its current size plus
+    `mem_limit_mb`, so a pathological PDF raises MemoryError instead of growing
+    until the container is OOM-killed. No-op where RLIMIT_AS is unavailable.
+    """
+    if not mem_limit_mb or mem_limit_mb <= 0:
+        return
+    try:
+        import resource
+        limit = _current_vm_bytes() + int(mem_limit_mb) * 1024 * 1024
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except Exception:
+        pass
+
+
+def extract(pdf_bytes):
+    """
+    Extract text with pdfminer, falling back to pypdf.
+    Returns {"text": str, "meta": {...}}; never raises for bad input.
+    meta.engine is "pdfminer", "pypdf" or None (both failed).
+    """
+    t0 = time.monotonic()
+    meta = {"engine": None, "status": "ok", "bytes": len(pdf_bytes or b"")}
+    text = ""
+    try:
+        text = extract_text(BytesIO(pdf_bytes)) or ""
+        meta["engine"] = "pdfminer"
+    except Exception as e:  # MemoryError included; the rlimit makes it recoverable
+        meta["pdfminer_error"] = f"{type(e).__name__}: {e}"[:500]
+        try:
+            reader = PdfReader(BytesIO(pdf_bytes))
+            text = "\n".join([p.extract_text() or "" for p in reader.pages])
+            meta["engine"] = "pypdf"
+        except Exception as e2:
+            meta["pypdf_error"] = f"{type(e2).__name__}: {e2}"[:500]
+            meta["status"] = "failed"
+            text = ""
+    meta["elapsed_ms"] = round((time.monotonic() - t0) * 1000, 1)
+    return {"text": text, "meta": meta}
@@ -0,0 +1,79 @@
+"""
+Thumbnail and web-size derivatives for event photos (run by the photo_derivatives job in app.py).
+
+Pillow is optional: without it HAVE_PIL is False and app.py never queues the job.
+HEIC/HEIF decoding additionally needs pillow-heif (HAVE_HEIF).
+"""
+from io import BytesIO
+
+try:
+    from PIL import Image, ImageOps, features
+    HAVE_PIL = True
+except ImportError:
+    Image = ImageOps = features = None
+    HAVE_PIL = False
+
+HAVE_HEIF = False
+if HAVE_PIL:
+    try:
+        import pillow_heif
+        pillow_heif.register_heif_opener()
+        HAVE_HEIF = True
+    except ImportError:
+        pass
+
+# (name, longest edge in px, encoder quality); largest first, each is resized from the previous.
+DERIVATIVE_SIZES = (("web", 1600, 80), ("thumb", 320, 72))
+MAX_PIXELS = 80_000_000
+_EXIF_ORIENTATION = 0x0112
+
+
+def _encode(img, quality, webp):
+    buf = BytesIO()
+    if webp:
+        img.save(buf, "WEBP", quality=quality, method=4)
+        return buf.getvalue(), "image/webp", "webp"
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    img.save(buf, "JPEG", quality=quality, optimize=True, progressive=True)
+    return buf.getvalue(), "image/jpeg", "jpg"
+
+
+def make_derivatives(data, sizes=DERIVATIVE_SIZES):
+    """
+    Decode `data` once, apply EXIF orientation and return
+    {"width", "height", "format", "variants": {name: {"bytes", "content_type", "ext", "width", "height"}}}
+    where width/height are the oriented original's. WebP when the Pillow build supports it,
+    else progressive JPEG. Raises ValueError for images that can't (or shouldn't) be decoded.
+    """
+    if not HAVE_PIL:
+        raise RuntimeError("Pillow is not installed")
+    webp = features.check("webp")
+    try:
+        img = Image.open(BytesIO(data))
+        width, height = img.size
+        if width * height > MAX_PIXELS:
+            raise ValueError(f"image too large to process ({width}x{height})")
+        fmt = img.format
+        if img.getexif().get(_EXIF_ORIENTATION, 1) in (5, 6, 7, 8):
+            width, height = height, width
+        # JPEG: let libjpeg decode straight at 1/2..1/8 scale when the biggest target allows it.
+        largest = max(edge for _, edge, _ in sizes)
+        img.draft("RGB", (largest, largest))
+        img = ImageOps.exif_transpose(img)
+        has_alpha = img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+        img = img.convert("RGBA" if has_alpha and webp else "RGB")
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"cannot decode image: {type(e).__name__}: {e}") from e
+
+    variants = {}
+    current = img
+    for name, edge, quality in sorted(sizes, key=lambda s: -s[1]):
+        current = current.copy()
+        current.thumbnail((edge, edge), Image.LANCZOS, reducing_gap=3.0)
+        body, ctype, ext = _encode(current, quality, webp)
+        variants[name] = {"bytes": body, "content_type": ctype, "ext": ext,
+                          "width": current.width, "height": current.height}
+    return {"width": width, "height": height, "format": fmt, "variants": variants}
@@ -0,0 +1,81 @@
+import pytest
+
+import backend.app as appmod
+
+
+class ScriptedDB:
+    """
+    Fake for getconn(): every cursor answers from `answers`, a list of (sql substring, rows)
+    where the first match wins and `rows` may be a callable taking the query params.
+    Unmatched queries return no rows. Every execute is recorded in `calls` as (sql, params);
+    `events` records the execute/commit/rollback order.
+    """
+
+    def __init__(self, answers=(), rowcount=0):
+        self.answers = list(answers)
+        self.rowcount = rowcount
+        self.calls = []
+        self.events = []
+
+    def getconn(self):
+        return ScriptedConn(self)
+
+    def cursor(self):
+        return ScriptedCursor(self)
+
+    def sql(self, key):
+        return [c for c in self.calls if key in c[0]]
+
+    def index(self, key):
+        return [i for i, (sql, _) in enumerate(self.calls) if key in sql]
+
+
+class ScriptedConn:
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self):
+        return ScriptedCursor(self.db)
+
+    def commit(self):
+        self.db.events.append("commit")
+
+    def rollback(self):
+        self.db.events.append("rollback")
+
+    def close(self):
+        pass
+
+
+class ScriptedCursor:
+    def __init__(self, db):
+        self.db = db
+        self.rowcount = 0
+        self.rows = []
+
+    def execute(self, sql, params=None):
+        db = self.db
+        db.calls.append((sql, params))
+        db.events.append("execute")
+        self.rowcount = db.rowcount
+        self.rows = next((rows(params) if callable(rows) else rows
+                          for key, rows in db.answers if key in sql), [])
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def scripted_db(monkeypatch):
+    """Factory: scripted_db(answers, rowcount=0) builds a ScriptedDB and routes appmod.getconn to it."""
+    def make(answers=(), rowcount=0):
+        db = ScriptedDB(answers, rowcount)
+        monkeypatch.setattr(appmod, "getconn", db.getconn)
+        return db
+    return make
@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+import backend.app as appmod
+
+
+def _row(user_id):
+    return (user_id, "login", "session", None, "10.0.0.1", "ua", datetime(2025, 10, 5, 12, tzinfo=timezone.utc))
+
+
+def test_failed_batch_is_retried_row_by_row_dropping_only_bad_rows(scripted_db):
+    def insert(params):
+        if 99 in params:  # user deleted since the row was queued: FK violation
+            raise Exception("violates foreign key constraint")
+        return []
+    db = scripted_db([("INSERT INTO user_activity_log", insert)])
+    writer = appmod.ActivityLogWriter(max_queue=10, batch_size=10, flush_ms=50)
+
+    writer._flush([_row(1), _row(99), _row(2)])
+    inserts = db.sql("INSERT INTO user_activity_log")
+    assert len(inserts[0][1]) == 21  # the multi-row attempt
+    assert [p[0] for _, p in inserts[1:]] == [1, 99, 2]
+    assert len(db.sql("ROLLBACK TO SAVEPOINT activity_row")) == 1
+    assert db.events[-1] == "commit"
+    stats = writer.stats()
+    assert (stats["written"], stats["dropped_error"]) == (2, 1)
+
+
+def test_rows_are_stamped_with_an_aware_utc_time(monkeypatch):
+    rows = []
+    monkeypatch.setattr(appmod._activity_writer, "enqueue", rows.append)
+    with appmod.app.test_request_context("/", headers={"User-Agent": "ua"}):
+        appmod.log_user_activity(1, "login")
+    assert rows[0][-1].tzinfo is timezone.utc
@@ -0,0 +1,61 @@
+import time
+
+import backend.app as appmod
+
+
+def _cache():
+    return appmod.AuthCache(ttl=300, max_entries=8)
+
+
+def test_hit_under_same_version_and_miss_after_users_version_moves():
+    cache = _cache()
+    decoded = {"uid": "u1", "exp": time.time() + 600}
+    cache.put("k", decoded, {"id": 1, "role": "admin", "is_active": True}, version=4)
+    assert cache.get("k", 4)[1]["role"] == "admin"
+
+    # another instance demoted the user: the shared "users" version moved on
+    assert cache.get("k", 5) is None
+    assert cache.get("k", 4) is None  # the stale entry was dropped, not kept around
+    assert cache.stats() == {"entries": 0, "hits": 1, "misses": 2}
+
+
+def test_unreadable_version_falls_back_to_ttl_only():
+    cache = _cache()
+    cache.put("k", {"uid": "u1"}, {"id": 1, "is_active": True}, version=None)
+    assert cache.get("k", None) is not None
+    cache.put("k", {"uid": "u1"}, {"id": 1, "is_active": True}, version=3)
+    assert cache.get("k", None) is not None
+
+
+def test_entries_never_outlive_token_exp():
+    cache = _cache()
+    cache.put("k", {"uid": "u1", "exp": time.time() - 1}, {"id": 1}, version=1)
+    assert cache.get("k", 1) is None
+
+
+def test_auth_version_reads_the_shared_users_scope(monkeypatch):
+    monkeypatch.setattr(appmod._data_versions, "get", lambda scopes: ((9, None),) if scopes == ("users",) else None)
+    assert appmod._auth_version() == 9
+    monkeypatch.setattr(appmod._data_versions, "get", lambda scopes: None)
+    assert appmod._auth_version() is None
+
+
+def test_last_login_touches_are_swept_and_bounded(monkeypatch):
+    monkeypatch.setattr(appmod, "_last_login_touch", appmod.OrderedDict())
+    monkeypatch.setattr(appmod, "AUTH_CACHE_MAX", 3)
+    monkeypatch.setattr(appmod, "LAST_LOGIN_INTERVAL", 100)
+    with appmod._last_login_lock:
+        appmod._record_login_touch(1, 1000.0)
+        appmod._record_login_touch(2, 1050.0)
+        appmod._record_login_touch(3, 1120.0)  # user 1's touch is past the interval: swept
+    assert list(appmod._last_login_touch) == [2, 3]
+
+    with appmod._last_login_lock:
+        for uid in (4, 5):
+            appmod._record_login_touch(uid, 1130.0)
+    assert list(appmod._last_login_touch) == [3, 4, 5]  # capped at AUTH_CACHE_MAX, oldest out
+
+    monkeypatch.setattr(appmod.time, "time", lambda: 1140.0)
+    assert not appmod._login_touch_due(5)
+    assert appmod._login_touch_due(2)
+    assert list(appmod._last_login_touch) == [4, 5, 2]
@@ -0,0 +1,121 @@
+from datetime import date
+
+import backend.app as appmod
+
+
+VENUES = [(1, "Tap Room", "Tuesday", None, None, True, None, "gsp", None, "tap-room"),
+          (2, "Corner Pub", "Thursday", None, None, True, None, "gsp", None, "corner-pub")]
+
+
+def _setup(monkeypatch, hosts=()):
+    monkeypatch.setattr(appmod, "require_auth", lambda required_roles=None: None)
+    monkeypatch.setattr(appmod, "ref_venues", lambda: VENUES)
+    monkeypatch.setattr(appmod, "ref_hosts", lambda: list(hosts))
+    monkeypatch.setitem(appmod._trgm_state, "available", True)
+    return appmod.app.test_client()
+
+
+def test_teams_are_upserted_in_one_statement_with_per_row_errors(monkeypatch, scripted_db):
+    db = scripted_db([("INSERT INTO tournament_teams", [(True,), (False,)])])
+    client = _setup(monkeypatch)
+
+    res = client.post("/admin/bulk-upload-tournament-teams", json={"teams": [
+        {"Name": "Quizzly Bears", "HomeVenue": "Tap Room", "PlayerCount": "5"},
+        {"Name": "", "HomeVenue": "Tap Room"},
+        {"Name": "Trivia Newton John", "HomeVenue": "Nowhere Bar", "DefaultNight": "Monday"},
+        {"Name": "Smarty Pints", "HomeVenue": "Corner Pub!", "CaptainEmail": " A@B.COM "},
+        {"Name": "quizzly bears", "HomeVenue": "Tap Room", "PlayerCount": 6},
+    ]})
+    summary = res.get_json()["summary"]["teams"]
+    assert summary["total_attempted"] == 5
+    assert summary["skipped_errors"] == 2
+    assert summary["venues_not_found"] == 1
+    assert summary["errors"][0] == "Team 'UNKNOWN': Team 'Name' is required"
+    assert "Nowhere Bar" in summary["errors"][1]
+    # one created + one updated by the upsert, plus the repeated Quizzly Bears row
+    assert (summary["teams_created"], summary["teams_updated"]) == (1, 2)
+
+    upserts = db.sql("INSERT INTO tournament_teams")
+    assert len(upserts) == 1
+    names, venue_ids, _, emails, _, counts = upserts[0][1]
+    assert names == ["quizzly bears", "Smarty Pints"]
+    assert venue_ids == [1, 2] and counts == [6, None] and emails[1] == "a@b.com"
+    assert "ON CONFLICT (name) DO UPDATE" in upserts[0][0]
+
+
+def test_events_resolve_names_in_bulk_and_skip_duplicates(monkeypatch, scripted_db):
+    def inserted(params):
+        # (host_id, venue_id, event_date, ...) arrays; pretend 2025-01-14 already exists
+        return [(100 + i, v, d) for i, (v, d) in enumerate(zip(params[1], params[2]))
+                if d != date(2025, 1, 14)][:1]
+    db = scripted_db([
+        ("FROM venues WHERE lower(name)", []),
+        ("INSERT INTO hosts", [("new host", 9, True)]),
+        ("INSERT INTO events", inserted),
+        ("FROM events e", [(55, 1, date(2025, 1, 14))]),
+    ])
+    client = _setup(monkeypatch, hosts=[(3, "Taylor", None, None)])
+
+    res = client.post("/admin/bulk-upload-tournament-teams", json={"events": [
+        {"hostName": "Taylor", "venueName": "tap room", "eventDate": "2025-01-07", "photoUrls": ["a.jpg", "b.jpg"]},
+        {"hostName": "New Host", "venueName": "Tap Room", "eventDate": "2025-01-14"},
+        {"hostName": "Taylor", "venueName": "Ghost Bar", "eventDate": "2025-01-21"},
+        {"hostName": "Taylor", "venueName": "Tap Room", "eventDate": "01/28/2025"},
+        {"hostName": "Taylor", "venueName": "Tap Room", "eventDate": "2025-01-07"},
+    ]})
+    summary = res.get_json()["summary"]["events"]
+    assert summary["errors"] == ["Venue 'Ghost Bar' not found", "eventDate '01/28/2025' is not YYYY-MM-DD"]
+    assert summary["inserted_ids"] == [100]
+    assert summary["duplicates_skipped"] == 2
+    assert summary["duplicate_samples"] == [55, 100]
+
+    assert len(db.sql("INSERT INTO events")) == 1
+    assert db.sql("INSERT INTO hosts")[0][1] == (["New Host"],)
+    assert db.sql("INSERT INTO event_photos")[0][1] == ([100, 100], ["a.jpg", "b.jpg"])
+
+
+def test_summary_events_write_hosts_and_events_once(monkeypatch, scripted_db):
+    db = scripted_db([
+        ("FROM venues WHERE id", [(7,)]),
+        ("FROM hosts WHERE lower(name)", []),
+        ("INSERT INTO hosts", [("taylor", 4, True)]),
+        ("INSERT INTO events", lambda params: [(200, 7, params[2][0])]),
+        ("FROM events e", [(150, 7, date(2025, 1, 20))]),
+    ])
+    client = _setup(monkeypatch)
+
+    res = client.post("/admin/bulk-upload-summary-events", json={"venue_id": 7, "events": [
+        {"Date": "1/13/25", "Host": "Taylor", "# of people": "19", "# of teams": 5},
+        {"Date": "1/20/25", "Host": "taylor", "# of people": 12},
+        {"Date": "someday", "Host": "Taylor"},
+        {"Date": "1/27/25", "Host": "Taylor", "# of teams": "lots"},
+    ]})
+    summary = res.get_json()["summary"]
+    assert summary["total_attempted"] == 4
+    assert (summary["events_created"], summary["events_skipped_existing"]) == (1, 1)
+    assert summary["hosts_created"] == 1
+    assert summary["skipped_errors"] == 2
+    assert summary["errors"][0] == "Row 'someday - Taylor': Unrecognized date format: someday"
+
+    insert = db.sql("INSERT INTO events")
+    assert len(insert) == 1
+    host_ids, venue_ids, dates, _, players, teams, statuses, validated = insert[0][1]
+    assert host_ids == [4, 4] and venue_ids == [7, 7]
+    assert dates == [date(2025, 1, 13), date(2025, 1, 20)]
+    assert players == [19, 12] and teams == [5, None]
+    assert statuses == ["posted", "posted"] and validated == [True, True]
+
+
+def test_home_venue_fuzzy_match_keeps_bulk_strictness(monkeypatch, scripted_db):
+    db = scripted_db([("similarity(", [(1, "Tap Room", 0.65)])])
+    client = _setup(monkeypatch)
+
+    res = client.post("/admin/bulk-upload-tournament-teams", json={"teams": [
+        {"Name": "Quizzly Bears", "HomeVenue": "Tapp Rm", "DefaultNight": "Tuesday"},
+    ]})
+    summary = res.get_json()["summary"]["teams"]
+    # 0.65 would pass the interactive resolver's 0.5 bar, but bulk rows need 0.7
+    assert summary["venues_not_found"] == 1
+    lookup = db.sql("similarity(")[0][1]
+    assert appmod.BULK_VENUE_MATCH_MIN_SCORE in lookup
+    assert not db.sql("INSERT INTO tournament_teams")
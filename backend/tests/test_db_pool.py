@@ -0,0 +1,109 @@
+import gc
+import threading
+
+import pytest
+
+import backend.app as appmod
+
+
+class RawConn:
+    def __init__(self, ping_ok=True):
+        self.ping_ok = ping_ok
+        self.closed = False
+        self.rollbacks = 0
+
+    def cursor(self):
+        raw = self
+
+        class Cur:
+            def execute(self, sql, params=None):
+                if not raw.ping_ok:
+                    raise OSError("connection reset")
+
+            def fetchone(self):
+                return (1,)
+        return Cur()
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+def _pool(max_size=2, timeout=0.05, healthcheck_idle=30):
+    opened = []
+
+    def connect():
+        opened.append(RawConn())
+        return opened[-1]
+    pool = appmod.PgPool(connect, max_size=max_size, timeout=timeout, max_age=1800,
+                         healthcheck_idle=healthcheck_idle)
+    return pool, opened
+
+
+def test_checkout_and_release_reuse_the_same_connection():
+    pool, opened = _pool()
+    conn = pool.getconn()
+    assert pool.stats()["in_use"] == 1
+    conn.close()
+    conn.close()  # idempotent
+    assert (pool.stats()["in_use"], pool.stats()["idle"]) == (0, 1)
+    assert opened[0].rollbacks == 1
+
+    again = pool.getconn()
+    assert again._raw is opened[0] and len(opened) == 1
+    assert pool.stats()["reused"] == 1
+    again.close()
+
+
+def test_exhausted_pool_times_out():
+    pool, _ = _pool(max_size=1)
+    held = pool.getconn()
+    with pytest.raises(RuntimeError, match="exhausted"):
+        pool.getconn()
+    assert pool.stats()["timeouts"] == 1
+    held.close()
+    pool.getconn().close()
+
+
+def test_leaked_wrapper_gives_its_slot_back():
+    pool, opened = _pool(max_size=1)
+    pool.getconn()  # dropped without close()
+    gc.collect()
+    stats = pool.stats()
+    assert (stats["in_use"], stats["idle"], stats["reclaimed_leaked"]) == (0, 0, 1)
+    assert opened[0].closed  # transaction state unknown: never reused
+    pool.getconn().close()
+
+
+def test_failed_ping_runs_outside_the_lock_and_frees_the_slot():
+    pool, opened = _pool(max_size=1, healthcheck_idle=-1)
+    pool.getconn().close()
+    opened[0].ping_ok = False
+
+    def ping(raw):
+        # another thread can still use the pool while this ping is in flight
+        t = threading.Thread(target=pool.stats)
+        t.start()
+        t.join(1)
+        assert not t.is_alive()
+        return raw.ping_ok
+    pool._ping = ping
+
+    conn = pool.getconn()
+    assert conn._raw is opened[1] and opened[0].closed
+    stats = pool.stats()
+    assert (stats["failed_healthcheck"], stats["in_use"]) == (1, 1)
+    conn.close()
+
+
+def test_user_routes_answer_json_when_the_pool_is_exhausted(monkeypatch):
+    def exhausted():
+        raise RuntimeError("DB pool exhausted (timed out waiting for a connection)")
+    monkeypatch.setattr(appmod, "getconn", exhausted)
+    monkeypatch.setattr(appmod, "require_auth", lambda required_roles=None: None)
+    client = appmod.app.test_client()
+    for res in (client.get("/api/users"), client.get("/api/users/activity"),
+                client.put("/api/users/3", json={"role": "admin"})):
+        assert res.status_code == 500 and "exhausted" in res.get_json()["error"]
@@ -0,0 +1,85 @@
+import backend.app as appmod
+
+
+class FakeBlob:
+    def __init__(self, data, content_type, generation=3):
+        self._data = data
+        self.size = len(data)
+        self.content_type = content_type
+        self.generation = generation
+
+    def download_as_bytes(self, start=None, end=None, **kwargs):
+        return self._data[start:(end + 1) if end is not None else None]
+
+
+def test_verify_uploaded_blob_checks_metadata_and_pdf_magic():
+    verify = appmod._verify_uploaded_blob
+    pdf = b"%PDF-1.7 body"
+    assert verify(FakeBlob(pdf, "application/pdf"), "pdf", "application/pdf", len(pdf)) is None
+    assert "does not match declared size" in verify(FakeBlob(pdf, "application/pdf"), "pdf", "application/pdf", 99)
+    assert "content type" in verify(FakeBlob(pdf, "text/html"), "pdf", "application/pdf", len(pdf))
+    assert verify(FakeBlob(b"<html>", "application/pdf"), "pdf", "application/pdf", 6) == "uploaded object is not a PDF"
+    assert verify(FakeBlob(b"", "image/jpeg"), "image", "image/jpeg", 0) == "uploaded object is empty"
+    big = FakeBlob(b"x", "image/jpeg")
+    big.size = appmod.MAX_IMG_BYTES + 1
+    assert "exceeds" in verify(big, "image", "image/jpeg", 0)
+
+
+def test_unverified_upload_urls_only_queries_our_objects(monkeypatch, scripted_db):
+    monkeypatch.setattr(appmod, "GCS_BUCKET", "gsp-uploads")
+    ours = "https://storage.googleapis.com/gsp-uploads/uploads/2025/01/02/ab-photo.jpg"
+    db = scripted_db([("", [("uploads/2025/01/02/ab-photo.jpg",)])])
+    assert appmod.unverified_upload_urls(db.cursor(), [ours, "https://example.com/x.jpg"]) == [ours]
+    assert db.calls[0][1] == (["uploads/2025/01/02/ab-photo.jpg"],)
+
+    db = scripted_db()
+    assert appmod.unverified_upload_urls(db.cursor(), ["https://drive.google.com/file/d/abc/view"]) == []
+    assert db.calls == []
+
+
+def test_check_upload_meta_matches_proxy_rules():
+    assert appmod.upload_kind("recap.PDF", "application/octet-stream") == "pdf"
+    assert appmod.upload_kind("a.jpg", "image/jpeg") == "image"
+    assert appmod.check_upload_meta("image", "image/heic", "IMG_1.HEIC", 10) == ("image/heic", 10)
+    for kind, ctype, name, size in (("pdf", "application/pdf", "a.pdf", 0),
+                                    ("pdf", "application/pdf", "a.pdf", appmod.MAX_PDF_BYTES + 1),
+                                    ("image", "text/plain", "a.txt", 10)):
+        try:
+            appmod.check_upload_meta(kind, ctype, name, size)
+        except ValueError:
+            continue
+        raise AssertionError((kind, ctype, name, size))
+
+
+def test_verified_uploads_are_pinned_to_their_generation(monkeypatch, scripted_db):
+    monkeypatch.setattr(appmod, "GCS_BUCKET", "gsp-uploads")
+    ours = "https://storage.googleapis.com/gsp-uploads/uploads/r.pdf"
+    db = scripted_db([("", [("uploads/r.pdf", 17)])])
+    assert appmod.pin_upload_urls(db.cursor(), [ours, "https://example.com/x.jpg"]) == {
+        ours: "https://storage.googleapis.com/gsp-uploads/uploads/r.pdf?generation=17"}
+    assert "status = 'verified'" in db.calls[0][0]
+
+
+def test_upload_url_is_create_only_and_size_capped(monkeypatch, scripted_db):
+    signed = {}
+
+    class Blob:
+        def generate_signed_url(self, **kwargs):
+            signed.update(kwargs)
+            return "https://signed"
+
+    class Storage:
+        def bucket(self, name):
+            return type("B", (), {"blob": lambda self, key: Blob()})()
+
+    scripted_db([("", [(5, None)])])
+    monkeypatch.setattr(appmod, "GCS_BUCKET", "gsp-uploads")
+    monkeypatch.setattr(appmod, "storage_client", Storage())
+    monkeypatch.setattr(appmod, "_signing_kwargs", lambda: {})
+    monkeypatch.setattr(appmod, "require_auth", lambda required_roles=None: None)
+    res = appmod.app.test_client().post("/uploads", json={
+        "fileName": "a.jpg", "contentType": "image/jpeg", "size": 10})
+    assert res.status_code == 200, res.get_json()
+    assert signed["headers"]["x-goog-if-generation-match"] == "0"
+    assert signed["headers"]["x-goog-content-length-range"] == f"0,{appmod.MAX_IMG_BYTES}"
+    assert res.get_json()["headers"]["x-goog-if-generation-match"] == "0"
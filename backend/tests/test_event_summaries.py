@@ -0,0 +1,87 @@
+from datetime import date
+
+import backend.app as appmod
+
+EVENT_ROW = [(5, date(2025, 10, 5), None, None, None, "posted", None, "gsp",
+              "Host", "Tap Room", "Sunday", "7pm")]
+
+
+def test_replacing_participation_refreshes_summary_in_same_transaction(monkeypatch, scripted_db):
+    db = scripted_db([("FROM events e", EVENT_ROW)])
+    monkeypatch.setattr(appmod, "require_auth", lambda required_roles=None: None)
+    monkeypatch.setattr(appmod, "format_ai_recap", lambda *a: "recap")
+
+    res = appmod.app.test_client().put("/admin/events/5/participation", json={"teams": [
+        {"team_name": "Alpha", "position": 1, "num_players": 4},
+        {"team_name": "Beta", "position": 2, "num_players": 3},
+    ]})
+    assert res.status_code == 200
+    sqls = [c[0] for c in db.calls]
+    # delete + multi-row insert + totals are a single statement, whatever the team count
+    writes = [i for i, sql in enumerate(sqls) if "INSERT INTO event_participation" in sql]
+    assert len(writes) == 1
+    assert "unnest(" in sqls[writes[0]] and "DELETE FROM event_participation" in sqls[writes[0]]
+    assert db.calls[writes[0]][1] == (5, 5, ["Alpha", "Beta"], [None, None], [1, 2], [4, 3],
+                                      [False, False], [False, False], 5)
+    assert sum("UPDATE events" in sql for sql in sqls if "total_teams" in sql) == 1
+    refresh = [i for i, sql in enumerate(sqls) if "INSERT INTO event_summaries" in sql]
+    assert len(refresh) == 1 and refresh[0] > writes[0]
+    assert db.calls[refresh[0]][1] == (appmod.EVENT_SUMMARY_TOP_POSITION, [5])
+    assert db.events[-1] == "commit"
+
+
+WEEK_AND_EVENT = [("FROM tournament_weeks", [(4,)]), ("FROM events", [(5,)])]
+
+
+def test_validate_tournament_scores_resolves_and_inserts_in_bulk(monkeypatch, scripted_db):
+    db = scripted_db([("lower(name), id FROM tournament_teams", [("alpha", 11), ("beta", 12)]),
+                      *WEEK_AND_EVENT])
+    monkeypatch.setattr(appmod, "require_auth", lambda required_roles=None: None)
+
+    teams = [{"team_name": "Alpha", "score": 90, "num_players": 4},
+             {"team_name": "BETA", "score": 80},
+             {"team_id": 13, "score": 70, "num_players": 2}]
+    res = appmod.app.test_client().put("/admin/tournament/scores/3/2025-10-12/validate", json={"teams": teams})
+    assert res.status_code == 200, res.get_json()
+    assert res.get_json()["inserted_count"] == 3
+    lookups = [c for c in db.calls if "lower(name), id FROM tournament_teams" in c[0]]
+    assert [c[1] for c in lookups] == [(["alpha", "beta"],)]
+    inserts = [c for c in db.calls if "INSERT INTO tournament_team_scores" in c[0]]
+    assert len(inserts) == 1
+    assert inserts[0][1][3:] == ([11, 12, 13], [90, 80, 70], [4, None, 2])
+
+
+def test_validate_tournament_scores_unknown_team_is_404(monkeypatch, scripted_db):
+    db = scripted_db([("lower(name), id FROM tournament_teams", [("alpha", 11)]), *WEEK_AND_EVENT])
+    monkeypatch.setattr(appmod, "require_auth", lambda required_roles=None: None)
+    res = appmod.app.test_client().put("/admin/tournament/scores/3/2025-10-12/validate",
+                                       json={"teams": [{"team_name": "Alpha"}, {"team_name": "Gamma"}]})
+    assert res.status_code == 404
+    assert "Gamma" in res.get_json()["error"]
+    assert not [c for c in db.calls if "INSERT INTO tournament_team_scores" in c[0]]
+
+
+def test_checker_reports_missing_and_stale_summaries(scripted_db):
+    top = [{"team_name": "Alpha", "position": 1}]
+    db = scripted_db([("LEFT JOIN event_summaries", [
+        (1, top, 5, 20, True, top, 5, 20),
+        (2, top, 5, 20, False, None, None, None),
+        (3, top, 6, 24, True, top, 5, 20),
+    ])])
+    checked, problems = appmod.find_stale_event_summaries(db.cursor(), after_id=0, limit=3)
+    assert checked == [1, 2, 3]
+    assert [(p["event_id"], p["problem"]) for p in problems] == [(2, "missing"), (3, "stale")]
+    assert problems[1]["expected"]["total_teams"] == 6
+    assert problems[1]["stored"]["total_teams"] == 5
+
+
+def test_backfill_walks_events_in_batches(monkeypatch, scripted_db):
+    db = scripted_db()
+    monkeypatch.setattr(appmod, "require_auth", lambda required_roles=None: None)
+    monkeypatch.setattr(appmod, "EVENT_SUMMARY_BATCH", 2)
+
+    res = appmod.app.test_client().post("/admin/event-summaries/backfill", json={"eventIds": [3, 1, 2]})
+    assert res.get_json() == {"status": "ok", "written": 3}
+    refreshes = [c[1] for c in db.calls if "INSERT INTO event_summaries" in c[0]]
+    assert refreshes == [(3, [1, 3]), (3, [2])]
+    assert db.events.count("commit") == 2
@@ -0,0 +1,104 @@
+from datetime import date
+
+import backend.app as appmod
+
+
+def _client(monkeypatch, scripted_db, rows):
+    db = scripted_db([("", rows)])
+    monkeypatch.setattr(appmod, "require_auth", lambda required_roles=None: None)
+    return db, appmod.app.test_client()
+
+
+def test_events_keyset_page_and_cursor(monkeypatch, scripted_db):
+    rows = [(3, date(2025, 10, 19), date(2025, 10, 19), 3),
+            (2, date(2025, 10, 12), date(2025, 10, 12), 2),
+            (1, date(2025, 10, 5), date(2025, 10, 5), 1)]
+    db, client = _client(monkeypatch, scripted_db, rows)
+
+    res = client.get("/events?limit=2&fields=id,date&venue_id=7&date_from=2025-01-01")
+    assert res.status_code == 200
+    assert res.get_json() == [{"id": 3, "date": "2025-10-19"}, {"id": 2, "date": "2025-10-12"}]
+    sql, params = db.calls[-1]
+    assert "JOIN" not in sql and "LIMIT %s" in sql
+    assert params == (7, date(2025, 1, 1), 3)
+
+    cursor = res.headers["X-Next-Cursor"]
+    assert appmod.decode_cursor(cursor, date.fromisoformat, appmod.cursor_int) == (date(2025, 10, 12), 2)
+    db.answers = [("", rows[2:])]
+    res = client.get(f"/events?limit=2&fields=id&cursor={cursor}")
+    sql, params = db.calls[-1]
+    assert "(e.event_date, e.id) < (%s::date, %s)" in sql
+    assert params == (date(2025, 10, 12), 2, 3)
+    assert "X-Next-Cursor" not in res.headers
+
+
+def test_events_legacy_call_is_unpaged_with_default_fields(monkeypatch, scripted_db):
+    db, client = _client(monkeypatch, scripted_db, [(1, date(2025, 10, 5), "unposted", "Host", "Venue", False,
+                                                     date(2025, 10, 5), 1)])
+    res = client.get("/events?status=unposted")
+    assert res.get_json() == [{"id": 1, "date": "2025-10-05", "status": "unposted",
+                               "host": "Host", "venue": "Venue", "is_validated": False}]
+    assert "LIMIT" not in db.calls[-1][0]
+
+
+def test_events_rejects_bad_cursor_and_fields(monkeypatch, scripted_db):
+    _, client = _client(monkeypatch, scripted_db, [])
+    assert client.get("/events?cursor=not-a-cursor").status_code == 400
+    for values in (["x", "y"], ["2025-10-12", "2"], ["2025-10-12", 2.5], [7, 2], ["2025-10-12", 2, 3]):
+        res = client.get(f"/events?cursor={appmod.encode_cursor(*values)}")
+        assert (res.status_code, res.get_json()) == (400, {"error": "invalid cursor"})
+    assert client.get("/events?fields=id,password").status_code == 400
+
+
+def _public_client(monkeypatch, scripted_db, events, teams):
+    db = scripted_db([("FROM data_version", []), ("FROM event_participation", teams), ("", events)])
+    monkeypatch.setattr(appmod, "_data_versions", appmod.DataVersions(ttl=60))
+    monkeypatch.setattr(appmod, "_response_cache", appmod.ResponseCache(max_entries=8))
+    return db, appmod.app.test_client()
+
+
+def test_public_events_keyset_with_batched_top_teams(monkeypatch, scripted_db):
+    events = [(9, date(2025, 10, 19), "recap", "fb/9", "Tap Room", None),
+              (8, date(2025, 10, 12), None, "fb/8", "Tap Room", None),
+              (7, date(2025, 10, 5), None, "fb/7", "Tap Room", None)]
+    teams = [(9, "Alpha", 1), (9, "Beta", 2), (8, "Gamma", 1)]
+    db, client = _public_client(monkeypatch, scripted_db, events, teams)
+
+    res = client.get("/public/events?limit=2")
+    body = res.get_json()
+    assert [e["id"] for e in body] == [9, 8]
+    assert body[0]["top_teams"] == [{"team_name": "Alpha", "position": 1}, {"team_name": "Beta", "position": 2}]
+    assert body[1]["date_display"] == "October 12, 2025"
+    team_queries = [c for c in db.calls if "FROM event_participation" in c[0]]
+    assert team_queries == [(team_queries[0][0], ([9, 8], 3))]
+    page_sql = [c for c in db.calls if "FROM events e" in c[0]][0][0]
+    assert "OFFSET" not in page_sql
+
+    cursor = res.headers["X-Next-Cursor"]
+    assert appmod.decode_cursor(cursor, date.fromisoformat, appmod.cursor_int) == (date(2025, 10, 12), 8)
+    # the cursor header survives the in-memory response cache
+    assert client.get("/public/events?limit=2").headers["X-Next-Cursor"] == cursor
+    bad = client.get(f"/public/events?cursor={appmod.encode_cursor('x', 'y')}")
+    assert (bad.status_code, bad.get_json()) == (400, {"error": "invalid cursor"})
+
+
+def test_public_events_legacy_offset_still_supported(monkeypatch, scripted_db):
+    db, client = _public_client(monkeypatch, scripted_db,
+                                [(7, date(2025, 10, 5), None, "fb/7", "Tap Room", None)], [])
+    res = client.get("/public/events?limit=2&offset=4")
+    assert res.get_json()[0]["top_teams"] == []
+    sql, params = [c for c in db.calls if "FROM events e" in c[0]][0]
+    assert "OFFSET %s" in sql and params == (3, 4)
+    assert "X-Next-Cursor" not in res.headers
+
+
+def test_public_events_read_top_teams_from_summaries(monkeypatch, scripted_db):
+    summary = [{"team_name": "Alpha", "position": 1}]
+    events = [(9, date(2025, 10, 19), None, "fb/9", "Tap Room", summary),
+              (8, date(2025, 10, 12), None, "fb/8", "Tap Room", [])]
+    db, client = _public_client(monkeypatch, scripted_db, events, [])
+
+    body = client.get("/public/events").get_json()
+    assert [e["top_teams"] for e in body] == [summary, []]
+    assert not [c for c in db.calls if "FROM event_participation" in c[0]]
+    assert "LEFT JOIN event_summaries" in [c for c in db.calls if "FROM events e" in c[0]][0][0]
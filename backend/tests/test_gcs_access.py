@@ -0,0 +1,83 @@
+import io
+
+import backend.app as appmod
+
+
+class FakeBlob:
+    def __init__(self, data, generation=7):
+        self._data = data
+        self.size = len(data)
+        self.generation = generation
+        self.calls = []
+
+    def download_as_bytes(self, **kwargs):
+        self.calls.append(("download", kwargs))
+        return self._data
+
+    def open(self, mode, chunk_size=None, **kwargs):
+        self.calls.append(("open", kwargs))
+        return io.BytesIO(self._data)
+
+
+class FakeBucket:
+    def __init__(self, blobs):
+        self._blobs = blobs
+
+    def get_blob(self, key, generation=None):
+        blob = self._blobs.get(key)
+        if blob is not None and generation is not None and blob.generation != generation:
+            return None
+        return blob
+
+
+class FakeStorage:
+    def __init__(self, blobs):
+        self._blobs = blobs
+
+    def bucket(self, name):
+        return FakeBucket(self._blobs)
+
+
+def test_gcs_object_for_url_only_matches_our_bucket(monkeypatch):
+    monkeypatch.setattr(appmod, "GCS_BUCKET", "gsp-uploads")
+    assert appmod.gcs_object_for_url(
+        "https://storage.googleapis.com/gsp-uploads/uploads/2025/01/02/ab-recap%20v2.pdf"
+    ) == ("gsp-uploads", "uploads/2025/01/02/ab-recap v2.pdf")
+    assert appmod.gcs_object_for_url("https://gsp-uploads.storage.googleapis.com/a/b.jpg?x=1") == ("gsp-uploads", "a/b.jpg")
+    assert appmod.gcs_object_for_url("gs://gsp-uploads/a.pdf") == ("gsp-uploads", "a.pdf")
+    assert appmod.gcs_object_for_url("https://storage.googleapis.com/someone-else/a.pdf") is None
+    assert appmod.gcs_object_for_url("https://drive.google.com/file/d/abc/view") is None
+
+
+def test_fetch_pdf_bytes_reads_our_objects_through_storage_client(monkeypatch):
+    blob = FakeBlob(b"%PDF-1.4 small")
+    monkeypatch.setattr(appmod, "GCS_BUCKET", "gsp-uploads")
+    monkeypatch.setattr(appmod, "storage_client", FakeStorage({"uploads/r.pdf": blob}))
+
+    def no_http(*a, **k):
+        raise AssertionError("HTTP must not be used for our bucket")
+    monkeypatch.setattr(appmod, "fetch_with_retry", no_http)
+
+    assert appmod.fetch_pdf_bytes("https://storage.googleapis.com/gsp-uploads/uploads/r.pdf") == b"%PDF-1.4 small"
+    assert blob.calls == [("download", {"if_generation_match": 7})]
+
+
+def test_large_objects_are_read_in_generation_pinned_chunks(monkeypatch):
+    data = b"p" * (appmod.GCS_READ_CHUNK_BYTES * 2 + 10)
+    blob = FakeBlob(data, generation=42)
+    monkeypatch.setattr(appmod, "GCS_BUCKET", "gsp-uploads")
+    monkeypatch.setattr(appmod, "storage_client", FakeStorage({"big.jpg": blob}))
+
+    parts = list(appmod.iter_gcs_blob(appmod.gcs_get_blob("gs://gsp-uploads/big.jpg")))
+    assert b"".join(parts) == data
+    assert len(parts) == 3
+    assert blob.calls == [("open", {"if_generation_match": 42})]
+
+
+def test_pinned_urls_only_resolve_to_their_generation(monkeypatch):
+    blob = FakeBlob(b"jpeg", generation=42)
+    monkeypatch.setattr(appmod, "GCS_BUCKET", "gsp-uploads")
+    monkeypatch.setattr(appmod, "storage_client", FakeStorage({"a.jpg": blob}))
+    assert appmod.gcs_get_blob("https://storage.googleapis.com/gsp-uploads/a.jpg?generation=42") is blob
+    # the key was overwritten after verification: the pinned URL no longer resolves
+    assert appmod.gcs_get_blob("https://storage.googleapis.com/gsp-uploads/a.jpg?generation=41") is None
@@ -0,0 +1,49 @@
+import time
+
+import backend.app as appmod
+
+
+def _queue(handler, lock_timeout=None):
+    queue = appmod.JobQueue(workers=0, poll_seconds=1, lock_timeout=30, retry_base=1, retry_max=10)
+    if lock_timeout is not None:
+        queue.lock_timeout = lock_timeout  # below the 30s floor, to see heartbeats in a test
+    queue.register("demo", handler)
+    return queue
+
+
+CLAIMED = ("RETURNING id, kind, payload, attempts, max_attempts", [(7, "demo", "{}", 2, 3)])
+GUARD = "WHERE id=%s AND locked_by=%s AND attempts=%s AND status='running'"
+
+
+def test_long_job_heartbeats_and_finishes_under_its_claim(scripted_db):
+    db = scripted_db([CLAIMED], rowcount=1)
+    queue = _queue(lambda payload: time.sleep(0.1) or {"ok": True}, lock_timeout=0.03)
+
+    assert queue._run_one("w1")
+    beats = db.sql("SET locked_at=now(), updated_at=now()")
+    assert beats and all(params == (7, "w1", 2) for _, params in beats)
+    done = db.sql("SET status='done'")
+    assert len(done) == 1 and GUARD in done[0][0]
+    assert done[0][1] == ('{"ok": true}', 7, "w1", 2)
+    assert db.index("SET status='done'")[0] > db.index("SET locked_at=now()")[-1]
+    assert queue.stats()["succeeded"] == 1
+
+
+def test_stale_worker_cannot_overwrite_a_reclaimed_job(scripted_db):
+    db = scripted_db([CLAIMED], rowcount=0)  # the guarded UPDATE matches nothing
+
+    def fail(payload):
+        raise RuntimeError("boom")
+    queue = _queue(fail)
+
+    assert queue._run_one("w1")
+    retry = db.sql("THEN 'superseded' ELSE 'queued' END")
+    assert len(retry) == 1 and GUARD in retry[0][0]
+    assert retry[0][1][2:] == (7, "w1", 2)
+    stats = queue.stats()
+    assert (stats["retried"], stats["lost_claims"]) == (0, 1)
+
+
+def test_worker_names_are_unique_per_process():
+    a, b = _queue(None), _queue(None)
+    assert a._instance != b._instance
@@ -0,0 +1,57 @@
+import backend.app as appmod
+
+
+def test_normalize_name():
+    assert appmod.normalize_name("  The Tap-Room!  Bar ") == "the taproom bar"
+    assert appmod.normalize_name(None) == ""
+
+
+def test_trigram_candidates_rank_exact_first(monkeypatch, scripted_db):
+    monkeypatch.setitem(appmod._trgm_state, "available", True)
+    db = scripted_db([("", [(4, "Tap Room Annex", 0.62), (2, "The Tap Room", 0.58), (1, "Tap Room!", 0.55)])])
+    cur = db.cursor()
+    out = appmod.name_candidates(cur, "venues", "tap room", limit=2,
+                                 where="lower(COALESCE(default_day, '')) = %s", params=("tuesday",))
+    assert [(c["id"], c["exact"]) for c in out] == [(1, True), (4, False)]
+    sql, params = db.calls[0]
+    assert "lower(name) %% %s" in sql and "similarity(" in sql
+    assert params == ("tap room", "tap room", "tuesday", "tap room", appmod.NAME_MATCH_MIN_SCORE, 4)
+
+
+def test_difflib_fallback_without_pg_trgm(monkeypatch, scripted_db):
+    monkeypatch.setitem(appmod._trgm_state, "available", False)
+    db = scripted_db([("", [(1, "Corner Pub"), (2, "Blue Moose")])])
+    out = appmod.name_candidates(db.cursor(), "venues", "Corner Pubb")
+    assert [c["id"] for c in out] == [1]
+    assert "similarity(" not in db.calls[0][0]
+
+
+def test_pick_name_match_needs_score_and_margin():
+    def c(i, score, exact=False):
+        return {"id": i, "name": f"v{i}", "score": score, "exact": exact}
+    assert appmod.pick_name_match([c(1, 0.4, exact=True), c(2, 0.9)])[0]["id"] == 1
+    assert appmod.pick_name_match([c(1, 0.8), c(2, 0.5)])[0]["id"] == 1
+    assert appmod.pick_name_match([c(1, 0.4)]) == (None, [])
+    best, ambiguous = appmod.pick_name_match([c(1, 0.8), c(2, 0.75), c(3, 0.6)])
+    assert best is None and [a["id"] for a in ambiguous] == [1, 2]
+
+
+def test_unknown_table_is_rejected(scripted_db):
+    try:
+        appmod.name_id(scripted_db().cursor(), "users", "x")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_resolve_endpoint(monkeypatch, scripted_db):
+    monkeypatch.setattr(appmod, "require_auth", lambda required_roles=None: None)
+    monkeypatch.setitem(appmod._trgm_state, "available", True)
+    db = scripted_db([("", [(7, "Quizzly Bears", 0.71)])])
+    client = appmod.app.test_client()
+
+    body = client.get("/names/resolve?type=teams&q=quizly bears").get_json()
+    assert body["match"]["id"] == 7 and body["ambiguous"] is False
+    assert "FROM tournament_teams" in db.calls[0][0]
+    assert client.get("/names/resolve?type=users&q=x").status_code == 400
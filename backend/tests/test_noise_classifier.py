@@ -0,0 +1,135 @@
+import glob
+import os
+import random
+import re
+import string
+
+import backend.app as appmod
+
+
+# Verbatim copy of likely_noise_line() before it was precompiled; the new classifier
+# must agree with it on every line.
+def reference_likely_noise_line(line: str) -> bool:
+    s = line.strip()
+    if not s:
+        return True
+    if re.search(r"\(\s*[\d\sA-Za-z]+\s*\)", s):
+        return False
+    if re.fullmatch(r"\d{1,2}", s):
+        return False
+    upper = s.upper()
+    for kw in appmod.HEADER_KEYWORDS:
+        if kw == upper:
+            return True
+        if kw in ["RANK", "SCORE", "KEYPAD", "TIME (S)", "POINTS", "PLAYERS"]:
+            if re.fullmatch(r"\b" + re.escape(kw) + r"\b", upper):
+                return True
+        elif kw in upper:
+            return True
+    if re.fullmatch(r"[\W_]+", s) or re.fullmatch(r"^\d$", s) or re.fullmatch(r"^[A-Z]$", s):
+        return True
+    if re.fullmatch(r"^\d{2}$", s):
+        return True
+    if "KEYPAD" in upper and "TIME" in upper:
+        return True
+    return False
+
+
+SAMPLE_TEXT = """QuizXpress Analyzer
+Print date: 10/14/2025 9:41 PM
+Quiz date: 10/14/2025
+Quiz file: GSP Fall 2025 Week 6.qxp
+Rank Team Keypad Time (s) Score
+Rank
+Score
+Keypad
+Time (s)
+TIME (S)
+Points
+Players
+1 Jeneral Knowledge (6T) 4 174.37 1967
+2 Multiple Scoregasms (5) 12 201.55 1803
+3 Quizzie Rascals (4 TV) 7 188.10 1720
+Team Rankings
+Fall Tournament Leader Board
+Week Ending 10/19/2025
+Total
+Venue: The Tap Room
+Game Show Palooza Quizzes
+Page 1
+Page 1 of 2
+Keypad Time
+-----
+***
+_
+A
+a
+7
+42
+123
+٣
+Ranked Choice
+Scoreboard Heroes
+Total Recall (3)
+The Players Club
+Pointless Pursuit
+Event Details
+GSP
+gsp
+
+"""
+
+TOKENS = [kw for kw in appmod.HEADER_KEYWORDS] + [
+    "Team", "Quiz", "(", ")", "(6T)", "(4 V)", "1", "12", "999", "-", "_", "*", ":",
+    "Rank", "Score", "keypad", "time", "Tournament", "Venue", "ß", "İ", "\t", " ",
+]
+
+
+def _corpus_lines():
+    lines = SAMPLE_TEXT.split("\n")
+    # Exported parse-log texts (see parser_bench.py export), if present.
+    here = os.path.dirname(__file__)
+    for path in sorted(glob.glob(os.path.join(here, "fixtures", "parse_corpus", "*.txt"))):
+        with open(path, encoding="utf-8") as f:
+            lines.extend(f.read().replace("\r\n", "\n").split("\n"))
+    return lines
+
+
+def _fuzz_lines(n=5000, seed=1234):
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + string.punctuation + " \t"
+    out = []
+    for _ in range(n):
+        if rng.random() < 0.6:
+            out.append(" ".join(rng.choice(TOKENS) for _ in range(rng.randint(1, 5))))
+        else:
+            out.append("".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12))))
+    return out
+
+
+def test_noise_classifier_matches_reference_on_corpus():
+    for line in _corpus_lines():
+        assert appmod.likely_noise_line(line) == reference_likely_noise_line(line), repr(line)
+
+
+def test_noise_classifier_matches_reference_on_fuzz():
+    for line in _fuzz_lines():
+        assert appmod.likely_noise_line(line) == reference_likely_noise_line(line), repr(line)
+
+
+def test_noise_classifier_known_cases():
+    assert appmod.likely_noise_line("Print date: 10/14/2025")
+    assert appmod.likely_noise_line("RANK")
+    assert not appmod.likely_noise_line("Multiple Scoregasms")
+    assert not appmod.likely_noise_line("1 Jeneral Knowledge (6T) 4 174.37 1967")
+    assert not appmod.likely_noise_line("12")
+
+
+if __name__ == "__main__":
+    # Microbenchmark: python -m backend.tests.test_noise_classifier (from the repo root)
+    import timeit
+
+    lines = _corpus_lines() + _fuzz_lines(20000)
+    for label, fn in (("reference", reference_likely_noise_line), ("precompiled", appmod.likely_noise_line)):
+        t = min(timeit.repeat(lambda: [fn(ln) for ln in lines], number=1, repeat=5))
+        print(f"{label:12s} {len(lines) / t:12,.0f} lines/s  ({t * 1000:.1f} ms for {len(lines)} lines)")
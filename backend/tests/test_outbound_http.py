@@ -0,0 +1,69 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import backend.app as appmod
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = {}
+
+    def do_GET(self):
+        n = _Handler.hits[self.path] = _Handler.hits.get(self.path, 0) + 1
+        if self.path == "/flaky" and n < 3:
+            status, body = 503, b"busy"
+        else:
+            status, body = 200, b"ok:" + self.path.encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv, f"http://127.0.0.1:{srv.server_address[1]}"
+
+
+def test_outbound_reuses_connections_and_records_stats():
+    srv, base = _serve()
+    try:
+        client = appmod.OutboundHTTP(pool_maxsize=4, host_concurrency=2)
+        for i in range(5):
+            assert client.get(f"{base}/a{i}", timeout=5).text == f"ok:/a{i}"
+        host = client.stats()["hosts"][base.split("//")[1]]
+        assert host["requests"] == 5 and host["errors"] == 0
+        assert host["pool_new_connections"] == 1
+        assert host["pool_hit_rate"] == 0.8
+        assert sum(host["latency_histogram"].values()) == 5
+    finally:
+        srv.shutdown()
+
+
+def test_outbound_retries_idempotent_get_on_5xx(monkeypatch):
+    monkeypatch.setattr(appmod, "OUTBOUND_RETRY_BACKOFF", 0.0)
+    srv, base = _serve()
+    try:
+        client = appmod.OutboundHTTP(pool_maxsize=2, host_concurrency=2)
+        assert client.get(f"{base}/flaky", attempts=3, timeout=5).status_code == 200
+        assert _Handler.hits["/flaky"] == 3
+    finally:
+        srv.shutdown()
+
+
+def test_outbound_stream_holds_host_slot_until_closed():
+    srv, base = _serve()
+    try:
+        client = appmod.OutboundHTTP(pool_maxsize=2, host_concurrency=1)
+        r = client.get(f"{base}/s", stream=True, timeout=5)
+        sem = client._host_slots[base.split("//")[1]]
+        assert not sem.acquire(blocking=False)
+        r.close()
+        assert sem.acquire(blocking=False)
+        sem.release()
+    finally:
+        srv.shutdown()
@@ -0,0 +1,32 @@
+import pytest
+
+import backend.app as appmod
+from backend import parser_bench
+
+
+DOCS = parser_bench.load_corpus(parser_bench.DEFAULT_CORPUS)
+
+
+@pytest.mark.parametrize("name,raw,golden", DOCS, ids=[d[0] for d in DOCS])
+def test_parse_matches_golden(name, raw, golden):
+    assert golden is not None, f"{name} has no golden file"
+    parsed = appmod.parse_raw_text(raw)
+    assert parser_bench.diff_teams(golden, parsed["teams"]) == []
+
+
+def test_bench_reports_throughput_and_accuracy():
+    report = parser_bench.bench_engine("auto", DOCS, repeat=1)
+    assert report["docs"] == len(DOCS)
+    assert report["accuracy"] == 1.0
+    assert report["docs_per_sec"] > 0
+    assert report["p50_ms"] <= report["p99_ms"] <= report["max_ms"]
+
+
+def test_diff_teams_reports_mismatches():
+    golden = [{"position": 1, "name": "Alpha", "score": 10, "playerCount": 4}]
+    parsed = [{"position": 1, "name": "alpha ", "score": 12, "playerCount": 4},
+              {"position": 2, "name": "Beta", "score": 5, "playerCount": 2}]
+    assert parser_bench.diff_teams(golden, parsed) == [
+        "alpha: score expected 10 got 12",
+        "extra: beta",
+    ]
@@ -0,0 +1,76 @@
+import backend.app as appmod
+
+
+TABULAR = """QuizXpress Analyzer
+Print date: 10/14/2025
+Rank Team Keypad Time (s) Score
+1 Jeneral Knowledge (6T) 4 174.37 1967
+2 Multiple Scoregasms (5) 12 201.55 1803
+3 Quizzie Rascals (4 TV) 7 188.10 1720
+"""
+
+SPLIT = """QuizXpress Analyzer
+Print date: 10/14/2025
+Rank
+Team
+Keypad
+Time (s)
+
+1 Jeneral Knowledge (6T)
+2 Multiple Scoregasms (5)
+3 Quizzie Rascals (4 TV)
+
+Score
+1967
+1803
+1720
+"""
+
+LEGACY = """GSP Leader Board
+1. Alpha (4) 900
+2. Beta (3T) 850
+Gamma (5V) 700
+"""
+
+EXPECTED = [
+    ("Jeneral Knowledge", 1967, 6, True, False),
+    ("Multiple Scoregasms", 1803, 5, False, False),
+    ("Quizzie Rascals", 1720, 4, True, True),
+]
+
+
+def _summary(parsed):
+    return [(t["name"], t["score"], t["playerCount"], t["isTournament"], t["isVisiting"]) for t in parsed["teams"]]
+
+
+def test_detects_quizxpress_tabular():
+    parsed = appmod.parse_raw_text(TABULAR)
+    assert parsed["engine"] == "quizxpress_tabular"
+    assert _summary(parsed) == EXPECTED
+    assert [t["position"] for t in parsed["teams"]] == [1, 2, 3]
+    assert parsed["playerCount"] == 15
+
+
+def test_detects_split_columns_and_returns_aligned_scores():
+    parsed = appmod.parse_raw_text(SPLIT)
+    assert parsed["engine"] == "split_columns"
+    assert _summary(parsed) == EXPECTED
+
+
+def test_legacy_is_default():
+    parsed = appmod.parse_raw_text(LEGACY)
+    assert parsed["engine"] == "legacy"
+    assert [(t["name"], t["score"], t["position"]) for t in parsed["teams"]] == [
+        ("Alpha", 900, 1), ("Beta", 850, 2), ("Gamma", 700, 3),
+    ]
+
+
+def test_engine_without_teams_falls_back_to_legacy(monkeypatch):
+    monkeypatch.setitem(appmod.PARSER_ENGINES, "quizxpress_tabular", lambda lines: [])
+    parsed = appmod.parse_raw_text(TABULAR)
+    assert parsed["engine"] == "legacy"
+    assert _summary(parsed) == EXPECTED
+
+
+def test_empty_text():
+    assert appmod.parse_raw_text("") == {"teams": [], "teamCount": 0, "playerCount": 0, "engine": None}
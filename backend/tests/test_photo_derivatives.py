@@ -0,0 +1,97 @@
+import io
+
+import pytest
+
+import backend.app as appmod
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _jpeg(size, orientation=None):
+    img = Image.new("RGB", size, (200, 30, 30))
+    buf = io.BytesIO()
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    img.save(buf, "JPEG", quality=95, exif=exif.tobytes())
+    return buf.getvalue()
+
+
+def test_make_derivatives_applies_orientation_and_sizes():
+    data = _jpeg((4000, 3000), orientation=6)  # stored landscape, displayed portrait
+    out = appmod.photo_derivs.make_derivatives(data)
+    assert (out["width"], out["height"]) == (3000, 4000)
+    web, thumb = out["variants"]["web"], out["variants"]["thumb"]
+    assert (web["width"], web["height"]) == (1200, 1600)
+    assert (thumb["width"], thumb["height"]) == (240, 320)
+    assert len(thumb["bytes"]) < len(data) // 20
+    decoded = Image.open(io.BytesIO(thumb["bytes"]))
+    assert decoded.size == (240, 320)
+    assert thumb["content_type"] == "image/" + {"jpg": "jpeg"}.get(thumb["ext"], thumb["ext"])
+
+
+def test_make_derivatives_never_upscales_and_rejects_garbage():
+    out = appmod.photo_derivs.make_derivatives(_jpeg((200, 100)))
+    assert (out["variants"]["web"]["width"], out["variants"]["web"]["height"]) == (200, 100)
+    with pytest.raises(ValueError):
+        appmod.photo_derivs.make_derivatives(b"<html>not an image</html>")
+
+
+def test_derivative_key_sits_next_to_our_originals(monkeypatch):
+    monkeypatch.setattr(appmod, "GCS_BUCKET", "gsp-uploads")
+    url = "https://storage.googleapis.com/gsp-uploads/uploads/2025/01/02/ab-IMG_1.HEIC"
+    assert appmod.derivative_key(5, url, "thumb", "webp") == "uploads/2025/01/02/ab-IMG_1.thumb.webp"
+    assert appmod.derivative_key(5, "https://drive.google.com/uc?id=x", "web", "webp") == "derived/photos/5.web.webp"
+
+
+def test_job_downloads_resizes_uploads_and_records_variants(monkeypatch, scripted_db):
+    data = _jpeg((1600, 1200))
+    photo_url = "https://example.com/p/IMG_1.jpg"
+
+    class Response:
+        headers = {"Content-Length": str(len(data))}
+
+        def raise_for_status(self):
+            pass
+
+        def iter_content(self, size):
+            return (data[i:i + size] for i in range(0, len(data), size))
+
+        def close(self):
+            pass
+
+    uploaded = {}
+
+    class Blob:
+        def __init__(self, key):
+            self.key = key
+
+        def upload_from_string(self, body, content_type=None):
+            uploaded[self.key] = (len(body), content_type)
+
+    class Storage:
+        def bucket(self, name):
+            return type("B", (), {"blob": lambda self, key: Blob(key)})()
+
+    db = scripted_db([("FROM event_photos", [(photo_url,)])])
+    monkeypatch.setattr(appmod, "GCS_BUCKET", "gsp-uploads")
+    monkeypatch.setattr(appmod, "storage_client", Storage())
+    monkeypatch.setattr(appmod, "httpx", type("X", (), {"get": lambda url, stream=True, timeout=20: Response()}))
+
+    out = appmod._job_photo_derivatives({"photo_id": 5})
+    keys = [out[f"{name}_url"].split("/gsp-uploads/", 1)[1] for name in ("thumb", "web")]
+    assert sorted(uploaded) == keys and keys[0].startswith("derived/photos/5.thumb.")
+    update = db.sql("UPDATE event_photos")[0][1]
+    assert update[2:] == (1600, 1200, 5, photo_url)
+    assert db.events[-1] == "commit"
+
+
+def test_job_fails_retryably_when_the_download_fails(monkeypatch, scripted_db):
+    scripted_db([("FROM event_photos", [("https://example.com/p/IMG_1.jpg",)])])
+
+    def fail(url, stream=True, timeout=20):
+        raise OSError("connection reset")
+    monkeypatch.setattr(appmod, "httpx", type("X", (), {"get": fail}))
+    with pytest.raises(appmod.JobFailed, match="could not download") as exc:
+        appmod._job_photo_derivatives({"photo_id": 5})
+    assert exc.value.retryable
@@ -0,0 +1,87 @@
+import backend.app as appmod
+
+
+def _setup(monkeypatch, scripted_db):
+    db = scripted_db([
+        ("FROM data_version", lambda _: [("venues", db.version, None), ("events", 9, None)]),
+        ("", lambda _: [(1, f"Tap Room v{db.version}")]),
+    ])
+    db.version = 1
+    monkeypatch.setattr(appmod, "_data_versions", appmod.DataVersions(ttl=60))
+    monkeypatch.setattr(appmod, "_response_cache", appmod.ResponseCache(max_entries=8))
+    return db, appmod.app.test_client()
+
+
+def _venue_queries(db):
+    return db.sql("FROM venues")
+
+
+def test_public_cached_serves_304_and_memory_hits_without_queries(monkeypatch, scripted_db):
+    db, client = _setup(monkeypatch, scripted_db)
+
+    first = client.get("/public/venues/search?q=tap")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert "stale-while-revalidate" in first.headers["Cache-Control"]
+    assert len(_venue_queries(db)) == 1
+
+    revalidate = client.get("/public/venues/search?q=tap", headers={"If-None-Match": etag})
+    assert revalidate.status_code == 304
+    assert revalidate.headers["ETag"] == etag
+
+    again = client.get("/public/venues/search?q=tap")
+    assert again.status_code == 200 and again.get_json() == first.get_json()
+    assert len(_venue_queries(db)) == 1
+    assert len(db.calls) == 2  # one data_version read + one venue query in total
+
+    other = client.get("/public/venues/search?q=room")
+    assert other.headers["ETag"] != etag
+
+
+def test_public_cached_changes_etag_when_table_version_moves(monkeypatch, scripted_db):
+    db, client = _setup(monkeypatch, scripted_db)
+    etag = client.get("/public/venues/search?q=tap").headers["ETag"]
+
+    db.version = 2
+    appmod._data_versions.invalidate()
+    res = client.get("/public/venues/search?q=tap", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+    assert res.get_json() == [{"id": 1, "name": "Tap Room v2"}]
+
+
+class StubVersions:
+    def __init__(self):
+        self.versions = {"hosts": 1, "venues": 1}
+        self.invalidated = 0
+
+    def get(self, scopes):
+        return tuple((self.versions.get(s, 0), None) for s in scopes)
+
+    def invalidate(self):
+        self.invalidated += 1
+
+
+def test_ref_cache_reuses_until_version_moves_or_invalidated(monkeypatch):
+    versions = StubVersions()
+    monkeypatch.setattr(appmod, "_data_versions", versions)
+    cache = appmod.RefCache(max_age=60)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return [(len(loads), "Host")]
+
+    assert cache.get("hosts", ("hosts",), loader) == [(1, "Host")]
+    assert cache.get("hosts", ("hosts",), loader) == [(1, "Host")]
+    assert len(loads) == 1
+
+    versions.versions["hosts"] = 2  # another instance wrote to hosts
+    assert cache.get("hosts", ("hosts",), loader) == [(2, "Host")]
+
+    cache.invalidate("venues")  # unrelated scope keeps the entry
+    assert cache.get("hosts", ("hosts",), loader) == [(2, "Host")]
+    cache.invalidate("hosts")
+    assert cache.get("hosts", ("hosts",), loader) == [(3, "Host")]
+    assert versions.invalidated == 2
+    assert cache.stats()["hits"] == 2
@@ -91,3 +91,69 @@ def test_recent_photos_zip_stops_on_total_cap(monkeypatch):
     # Ensure we didn't exceed MAX_ZIP_BYTES
     total_sz = sum(z.getinfo(n).file_size for n in names)
     assert total_sz <= 500
+
+
+def test_recent_photos_zip_part_streams_entries(monkeypatch):
+    photos = [
+        "http://example.com/a.jpg",
+        "http://example.com/b.jpg",
+        "http://example.com/notes.txt",
+        "http://example.com/big.jpg",
+    ]
+    monkeypatch.setattr(appmod, "getconn", lambda: DummyConn(photos))
+    monkeypatch.setattr(appmod, "require_auth", lambda required_roles=None: None)
+    monkeypatch.setenv("MAX_ZIP_BYTES", str(10_000))
+    monkeypatch.setenv("MAX_FILE_BYTES", str(1_000))
+
+    def fake_get(url, stream=True, timeout=30):
+        if "big" in url:
+            # exceeds MAX_FILE_BYTES across chunks; must be dropped mid-stream
+            return DummyResponse([b"q" * 600, b"q" * 600])
+        if "notes" in url:
+            return DummyResponse([b"hello " * 50])
+        return DummyResponse([url[-5:].encode() * 10, b"!" * 100])
+
+    monkeypatch.setattr(appmod, "httpx", type("X", (), {"get": fake_get}))
+
+    client = appmod.app.test_client()
+    res = client.get("/venues/123/recent-photos-zip?part=1")
+
+    assert res.status_code == 200
+    z = zipfile.ZipFile(io.BytesIO(res.data))
+    assert sorted(z.namelist()) == ["a.jpg", "b.jpg", "notes.txt"]
+    assert z.read("a.jpg") == b"a.jpg" * 10 + b"!" * 100
+    assert z.getinfo("a.jpg").compress_type == zipfile.ZIP_STORED
+    assert z.getinfo("notes.txt").compress_type == zipfile.ZIP_DEFLATED
+    # written in streaming mode (sizes follow the data in a data descriptor)
+    assert z.getinfo("a.jpg").flag_bits & 0x08
+    assert z.testzip() is None
+
+
+def test_recent_photos_zip_part_all_downloads_fail(monkeypatch):
+    monkeypatch.setattr(appmod, "getconn", lambda: DummyConn(["http://example.com/a.jpg"]))
+    monkeypatch.setattr(appmod, "require_auth", lambda required_roles=None: None)
+    monkeypatch.setattr(appmod, "httpx", type("X", (), {"get": lambda url, stream=True, timeout=30: DummyResponse([], status_code=404)}))
+
+    res = appmod.app.test_client().get("/venues/123/recent-photos-zip?part=1")
+    assert res.status_code == 413
+
+
+def test_prefetch_is_bounded_by_buffered_bytes(monkeypatch):
+    sizes = {f"http://example.com/{i}.jpg": 400 for i in range(6)}
+    peak = {"used": 0}
+    real_acquire = appmod._ByteBudget.acquire
+
+    def acquire(self, n):
+        ok = real_acquire(self, n)
+        peak["used"] = max(peak["used"], self.used)
+        return ok
+    monkeypatch.setattr(appmod._ByteBudget, "acquire", acquire)
+
+    def fake_get(url, stream=True, timeout=30):
+        return DummyResponse([b"p" * sizes[url]], headers={"Content-Length": str(sizes[url])})
+    monkeypatch.setattr(appmod, "httpx", type("X", (), {"get": fake_get}))
+
+    got = list(appmod.stream_photo_downloads(list(sizes), 1_000, 10_000, prefetch=4, prefetch_bytes=1_000))
+    assert len(got) == 6
+    # four downloads may be in flight, but only two 400-byte photos fit in 1000 bytes
+    assert peak["used"] <= 1_000
@@ -0,0 +1,47 @@
+import backend.app as appmod
+
+
+def _client(monkeypatch, scripted_db, rows=()):
+    db = scripted_db([("FROM data_version", []), ("", list(rows))])
+    monkeypatch.setattr(appmod, "require_auth", lambda required_roles=None: None)
+    monkeypatch.setattr(appmod, "_data_versions", appmod.DataVersions(ttl=60))
+    monkeypatch.setattr(appmod, "_response_cache", appmod.ResponseCache(max_entries=8))
+    return db, appmod.app.test_client()
+
+
+def test_search_patterns_escape_like_wildcards():
+    assert appmod.like_escape(r"100%_a\b") == r"100\%\_a\\b"
+    assert appmod.search_patterns("  Tap_Room ") == ("tap_room", r"tap\_room%", r"%tap\_room%")
+
+
+def test_admin_host_search_is_prefix_ranked_and_clamped(monkeypatch, scripted_db):
+    db, client = _client(monkeypatch, scripted_db, [(1, "Taylor", None, "t@x.com")])
+    res = client.get("/admin/search/hosts?q=Tay&limit=5000")
+    assert res.get_json() == [{"id": 1, "name": "Taylor", "phone": None, "email": "t@x.com"}]
+    sql, params = db.calls[-1]
+    assert "ORDER BY (lower(name) = %s) DESC, (lower(name) LIKE %s) DESC, name" in sql
+    assert params == ("%tay%", "%tay%", "tay", "tay%", 200)
+
+
+def test_bad_limit_falls_back_to_default(monkeypatch, scripted_db):
+    db, client = _client(monkeypatch, scripted_db)
+    assert client.get("/admin/search/teams?q=a&limit=abc").status_code == 200
+    assert db.calls[-1][1][-1] == 25
+    assert client.get("/admin/search/venues?limit=0").status_code == 200
+    assert db.calls[-1][1] == (1,)
+
+
+def test_admin_events_search_goes_through_host_and_venue_ids(monkeypatch, scripted_db):
+    db, client = _client(monkeypatch, scripted_db)
+    client.get("/admin/events?q=50%25&status=posted")
+    sql, params = db.calls[-1]
+    assert "e.host_id IN (SELECT id FROM hosts WHERE lower(name) LIKE %s)" in sql
+    assert params == (r"%50\%%", r"%50\%%", "posted")
+
+
+def test_public_venue_search(monkeypatch, scripted_db):
+    db, client = _client(monkeypatch, scripted_db, [(3, "Tap Room")])
+    assert client.get("/public/venues/search?q=tap").get_json() == [{"id": 3, "name": "Tap Room"}]
+    sql, params = [c for c in db.calls if "FROM venues" in c[0]][-1]
+    assert "lower(name) LIKE %s" in sql and "ILIKE" not in sql
+    assert params == ("%tap%", "tap", "tap%", 10)
@@ -0,0 +1,176 @@
+import sqlite3
+from datetime import date
+
+import backend.app as appmod
+
+
+def _client(monkeypatch):
+    monkeypatch.setattr(appmod, "require_auth", lambda required_roles=None: None)
+    return appmod.app.test_client()
+
+
+def test_refresh_recomputes_only_the_given_venues_under_per_venue_locks(scripted_db):
+    db = scripted_db(rowcount=7)
+    cur = db.cursor()
+    assert appmod.refresh_tournament_standings(cur, [3, None, "2", 3]) == 7
+    key = appmod.TOURNAMENT_STANDINGS_LOCK
+    assert db.calls[0] == ("SELECT pg_advisory_xact_lock_shared(%s);", (key,))
+    assert "pg_advisory_xact_lock(%s, v)" in db.calls[1][0] and db.calls[1][1] == (key, [2, 3])
+    assert db.calls[2] == ("DELETE FROM tournament_standings WHERE venue_id = ANY(%s);", ([2, 3],))
+    assert "INSERT INTO tournament_standings" in db.calls[3][0] and db.calls[3][1] == ([2, 3],)
+
+    db.calls.clear()
+    assert appmod.refresh_tournament_standings(cur, []) == 0
+    assert db.calls == []
+
+
+def test_weekly_scores_upsert_once_and_refresh_standings_before_commit(monkeypatch, scripted_db):
+    db = scripted_db([
+        ("FROM tournament_weeks", [(date(2025, 9, 7), 41), (date(2025, 9, 14), 42)]),
+        ("UNION", [(3,)]),
+    ])
+    res = _client(monkeypatch).put("/admin/teams/11/weekly-scores", json={"venue_id": 5, "scores": [
+        {"week_ending": "2025-09-07", "points": 10, "num_players": 4},
+        {"week_ending": "2025-09-14", "points": "", "num_players": ""},
+        {"week_ending": "2025-09-07", "points": 12, "num_players": 5},
+    ]})
+    assert res.status_code == 200, res.get_json()
+    upserts = db.index("INSERT INTO tournament_team_scores")
+    assert len(upserts) == 1
+    sql, params = db.calls[upserts[0]]
+    assert "ON CONFLICT (tournament_team_id, venue_id, week_id)" in sql
+    assert params == (11, 5, [41, 42], [12, None], [5, None])
+    refresh = db.index("INSERT INTO tournament_standings")
+    assert refresh and refresh[0] > upserts[0]
+    assert db.calls[refresh[0]][1] == ([3],)
+    assert db.events[-1] == "commit"
+
+
+def test_weekly_scores_unknown_week_is_404(monkeypatch, scripted_db):
+    db = scripted_db([("FROM tournament_weeks", [(date(2025, 9, 7), 41)])])
+    res = _client(monkeypatch).put("/admin/teams/11/weekly-scores", json={"venue_id": 5, "scores": [
+        {"week_ending": "2025-09-07", "points": 10}, {"week_ending": "2025-09-21", "points": 3},
+    ]})
+    assert res.status_code == 404
+    assert "2025-09-21" in res.get_json()["error"]
+    assert not db.index("INSERT INTO tournament_team_scores")
+
+
+def test_put_scores_maps_names_and_refreshes_old_and_new_teams(monkeypatch, scripted_db):
+    db = scripted_db([
+        ("FROM tournament_weeks", [(42,)]),
+        ("lower(name), id FROM tournament_teams", [("alpha", 11), ("beta", 12)]),
+        ("DELETE FROM tournament_team_scores", [(13,)]),
+    ])
+    res = _client(monkeypatch).put("/admin/tournament/scores", json={
+        "venue_id": 5, "week_ending": "2025-09-14",
+        "rows": [{"team_name": "Alpha", "points": 20}, {"team_name": " "}, {"team_name": "BETA", "points": 15}],
+    })
+    assert res.status_code == 200, res.get_json()
+    assert res.get_json()["count"] == 2
+    insert = db.calls[db.index("INSERT INTO tournament_team_scores")[0]]
+    assert insert[1] == (5, 42, [11, 12], [20, 15], [None, None])
+    venues = db.calls[db.index("UNION")[0]]
+    assert venues[1] == ([11, 12, 13], [11, 12, 13])
+
+
+def test_put_scores_unknown_team_is_404(monkeypatch, scripted_db):
+    db = scripted_db([
+        ("FROM tournament_weeks", [(42,)]),
+        ("lower(name), id FROM tournament_teams", [("alpha", 11)]),
+    ])
+    res = _client(monkeypatch).put("/admin/tournament/scores", json={
+        "venue_id": 5, "week_ending": "2025-09-14", "rows": [{"team_name": "Alpha"}, {"team_name": "Gamma"}],
+    })
+    assert res.status_code == 404
+    assert "Gamma" in res.get_json()["error"]
+    assert not db.index("DELETE FROM tournament_team_scores")
+
+
+def test_public_standings_read_latest_week_with_rank_change(monkeypatch, scripted_db):
+    week = date(2025, 9, 14)
+    db = scripted_db([("FROM tournament_standings s", [
+        (11, "Alpha", 40, 20, 1, 2, week),
+        (12, "Beta", 35, 0, 2, 1, week),
+        (13, "Gamma", 15, 15, 3, None, week),
+    ])])
+    monkeypatch.setattr(appmod._data_versions, "get", lambda scopes: None)
+    res = appmod.app.test_client().get("/pub/tournament-standings?venue_id=5")
+    body = res.get_json()
+    assert [(r["team_name"], r["rank"], r["rank_change"]) for r in body] == [
+        ("Alpha", 1, 1), ("Beta", 2, -1), ("Gamma", 3, None)]
+    assert body[0]["total_points"] == 40 and body[0]["week_ending"] == "2025-09-14"
+    assert "points_gained" not in db.calls[0][0]
+
+
+def test_rebuild_without_venues_rewrites_everything(monkeypatch, scripted_db):
+    db = scripted_db(rowcount=120)
+    res = _client(monkeypatch).post("/admin/tournament/standings/rebuild", json={})
+    assert res.get_json() == {"status": "ok", "written": 120}
+    assert db.calls[0] == ("SELECT pg_advisory_xact_lock(%s);", (appmod.TOURNAMENT_STANDINGS_LOCK,))
+    assert db.calls[1][0] == "DELETE FROM tournament_standings;"
+    assert "home_venue_id IS NOT NULL" in db.calls[2][0]
+    assert db.events[-1] == "commit"
+
+
+# (team_id, home_venue_id) and (team_id, venue_id, week_id, points, is_validated)
+TEAMS = [(1, 1), (2, 1), (3, 1), (4, 2), (5, None)]
+WEEKS = [(1, "2025-09-07"), (2, "2025-09-14"), (3, "2025-09-21")]
+SCORES = [
+    (1, 1, 1, 10, 1), (2, 1, 1, 20, 1), (4, 2, 1, 7, 1), (5, 1, 1, 50, 1),
+    (1, 1, 2, 15, 1), (1, 2, 2, 5, 1), (3, 1, 2, 8, 1), (2, 1, 2, 100, 0),
+    (2, 1, 3, 10, 1), (3, 1, 3, 30, 1), (3, 2, 3, None, 1),
+]
+
+
+def _expected_standings():
+    """Reference semantics: running totals per team, competition rank per venue/week."""
+    home = dict(TEAMS)
+    points = {}
+    for team, _, week, pts, validated in SCORES:
+        if validated and home[team] is not None:
+            points[(team, week)] = points.get((team, week), 0) + (pts or 0)
+    rows = set()
+    for venue in {v for v in home.values() if v is not None}:
+        teams = [t for t, v in home.items() if v == venue]
+        weeks = sorted({w for (t, w) in points if t in teams})
+        totals, prev = {}, {}
+        for week in weeks:
+            for t in teams:
+                if (t, week) in points:
+                    totals[t] = totals.get(t, 0) + points[(t, week)]
+            for t, total in totals.items():
+                rank = 1 + sum(other > total for other in totals.values())
+                rows.add((venue, week, t, points.get((t, week), 0), total, rank, prev.get(t)))
+                prev[t] = rank
+    return rows
+
+
+def test_standings_sql_matches_reference_ranks_and_rank_changes():
+    db = sqlite3.connect(":memory:")
+    db.create_function("NOW", 0, lambda: "now")
+    db.executescript("""
+        CREATE TABLE tournament_teams (id INTEGER, home_venue_id INTEGER);
+        CREATE TABLE tournament_weeks (id INTEGER, week_ending TEXT);
+        CREATE TABLE tournament_team_scores (tournament_team_id INTEGER, venue_id INTEGER,
+            week_id INTEGER, points INTEGER, is_validated BOOLEAN);
+        CREATE TABLE tournament_standings (venue_id INTEGER, week_id INTEGER, tournament_team_id INTEGER,
+            week_ending TEXT, week_points INTEGER, total_points INTEGER, rank INTEGER, prev_rank INTEGER,
+            updated_at TEXT);
+    """)
+    db.executemany("INSERT INTO tournament_teams VALUES (?, ?)", TEAMS)
+    db.executemany("INSERT INTO tournament_weeks VALUES (?, ?)", WEEKS)
+    db.executemany("INSERT INTO tournament_team_scores VALUES (?, ?, ?, ?, ?)", SCORES)
+
+    db.execute(appmod._tournament_standings_insert("home_venue_id IS NOT NULL"))
+    got = set(db.execute("""
+        SELECT venue_id, week_id, tournament_team_id, week_points, total_points, rank, prev_rank
+        FROM tournament_standings
+    """))
+    assert got == _expected_standings()
+    # spot checks: B leads week 1, A overtakes B in week 2 (15+5 counted, B's unvalidated
+    # 100 isn't), C jumps to first in week 3; D's venue ranks on its own
+    assert (1, 1, 2, 20, 20, 1, None) in got
+    assert (1, 2, 1, 20, 30, 1, 2) in got and (1, 2, 2, 0, 20, 2, 1) in got
+    assert (1, 3, 3, 30, 38, 1, 3) in got and (1, 3, 1, 0, 30, 2, 1) in got
+    assert (2, 1, 4, 7, 7, 1, None) in got
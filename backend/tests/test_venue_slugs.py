@@ -0,0 +1,62 @@
+import backend.app as appmod
+
+
+def _slug_db(scripted_db, slugs):
+    """Scripted venues table {id: slug}; UPDATEs write through to `slugs`."""
+    def taken(params):
+        slug, vid = params
+        return [(1,)] if any(s == slug and i != vid for i, s in slugs.items()) else []
+
+    def update(params):
+        slug, vid, _ = params
+        slugs[vid] = slug
+        return []
+
+    def lookup(params):
+        return [(i, f"Venue {i}") for i, s in slugs.items() if s == params[0]]
+    return scripted_db([
+        ("SELECT 1 FROM venues WHERE slug=%s AND id<>%s", taken),
+        ("UPDATE venues SET slug=%s", update),
+        ("SELECT id, name FROM venues WHERE slug=%s", lookup),
+    ])
+
+
+def test_venue_slug_matches_legacy_url_scheme():
+    assert appmod.venue_slug("The Tap Room #2") == "the-tap-room-2"
+    assert appmod.venue_slug("  O'Malley's  Pub ") == "o-malley-s-pub"
+    assert appmod.venue_slug(None) == ""
+
+
+def test_assign_venue_slug_suffixes_collisions(scripted_db):
+    slugs = {1: "tap-room"}
+    cur = _slug_db(scripted_db, slugs).cursor()
+    assert appmod.assign_venue_slug(cur, 2, "Tap Room!") == "tap-room-2"
+    assert appmod.assign_venue_slug(cur, 1, "Tap Room") == "tap-room"
+    assert appmod.assign_venue_slug(cur, 3, "???") == "venue-3"
+    assert slugs == {1: "tap-room", 2: "tap-room-2", 3: "venue-3"}
+
+
+def test_assign_venue_slug_keeps_suffixing_while_taken(scripted_db):
+    # "Tap Room 2" already owns tap-room-2, and so does its own suffixed form
+    slugs = {1: "tap-room", 5: "tap-room-2", 6: "tap-room-2-2"}
+    cur = _slug_db(scripted_db, slugs).cursor()
+    assert appmod.assign_venue_slug(cur, 2, "Tap Room") == "tap-room-2-3"
+    assert appmod.assign_venue_slug(cur, 7, "Tap Room 2") == "tap-room-2-7"
+    assert len(set(slugs.values())) == len(slugs)
+
+
+def test_access_key_matches_is_exact():
+    assert appmod.access_key_matches("abc123", "abc123")
+    assert not appmod.access_key_matches("abc124", "abc123")
+    assert not appmod.access_key_matches("", "")
+    assert not appmod.access_key_matches("abc", None)
+
+
+def test_pub_venue_week_uses_slug_point_lookup(monkeypatch, scripted_db):
+    db = _slug_db(scripted_db, {7: "tap-room"})
+    monkeypatch.setattr(appmod, "_data_versions", appmod.DataVersions(ttl=60))
+    res = appmod.app.test_client().get("/pub/tournament/venue/tap-room/2025-10-19")
+    assert res.status_code == 200
+    assert res.get_json()["venue"] == {"id": 7, "name": "Venue 7", "slug": "tap-room"}
+    assert "SELECT id, name FROM venues WHERE slug=%s;" in [sql for sql, _ in db.calls]
+    assert appmod.app.test_client().get("/pub/tournament/venue/nope/2025-10-19").status_code == 404